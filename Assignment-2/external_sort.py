@@ -0,0 +1,236 @@
+"""
+External (out-of-core) merge sort for numeric records that do not fit in RAM.
+
+Records are fixed-width numbers stored as raw binary (an `array` typecode such
+as 'q' for int64 or 'd' for float64). The input, a file or any iterable, is
+read in chunks sized from the memory budget. Each chunk is sorted with
+merge_sort (NumPy and multi-process paths included) and spilled to a
+temporary run file in the same raw binary format. The runs are then combined
+with a streaming k-way min-heap merge (heapq.merge) that holds one read
+buffer per run. If there are more runs than MAX_FANIN, they are merged in
+several passes.
+
+Usage:
+    python external_sort.py generate data.bin 500000000      # ~4 GB of int64
+    python external_sort.py sort data.bin sorted.bin --memory-mb 256 --workers 4
+    python external_sort.py verify sorted.bin
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import tempfile
+import time
+from array import array
+
+from sorting_algorithms import merge_sort
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Sorting a chunk needs the chunk itself, a sorted copy and a merge buffer
+# (more for plain Python lists), so only part of the budget holds raw records.
+CHUNK_OVERHEAD = 4
+# Upper bound on runs merged at once; more runs trigger intermediate passes
+MAX_FANIN = 64
+
+
+def _read_chunks(source, typecode, chunk_items):
+    """Yield array(typecode) chunks of at most chunk_items records from a path or iterable."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            while True:
+                chunk = array(typecode)
+                try:
+                    chunk.fromfile(f, chunk_items)
+                except EOFError:
+                    pass  # a short final chunk keeps whatever was read
+                if not chunk:
+                    return
+                yield chunk
+    else:
+        it = iter(source)
+        while True:
+            chunk = array(typecode, itertools.islice(it, chunk_items))
+            if not chunk:
+                return
+            yield chunk
+
+
+def _write_run(values, typecode, tmp_dir):
+    """Spill an already sorted sequence to a new temporary run file and return its path."""
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        if not isinstance(values, array):
+            values = array(typecode, values)
+        values.tofile(f)
+    return path
+
+
+def _iter_run(path, typecode, buffer_items):
+    """Stream the records of a run file, reading buffer_items at a time."""
+    with open(path, 'rb') as f:
+        while True:
+            buf = array(typecode)
+            try:
+                buf.fromfile(f, buffer_items)
+            except EOFError:
+                pass
+            if not buf:
+                return
+            yield from buf
+
+
+def _merge_runs(paths, typecode, buffer_items):
+    """k-way merge of sorted run files through a min-heap."""
+    return heapq.merge(*(_iter_run(p, typecode, buffer_items) for p in paths))
+
+
+def _write_stream(values, f, typecode, block_items):
+    """Write an iterator of records to an open binary file in blocks."""
+    while True:
+        block = array(typecode, itertools.islice(values, block_items))
+        if not block:
+            return
+        block.tofile(f)
+
+
+def iter_external_sort(source, typecode='q', memory_budget=DEFAULT_MEMORY_BUDGET,
+                       workers=None, tmp_dir=None):
+    """
+    Yield the records of `source` in ascending order using bounded memory.
+
+    Args:
+        source: Path to a raw binary file of `typecode` records, or any iterable of numbers
+        typecode: array typecode of the records ('q' int64, 'd' float64, ...)
+        memory_budget: Approximate bytes available for chunk sorting and merge buffers
+        workers: If > 1, each chunk is sorted with merge_sort(workers=...)
+        tmp_dir: Directory for the temporary run files (default: system temp dir)
+    """
+    itemsize = array(typecode).itemsize
+    chunk_items = max(1, memory_budget // (itemsize * CHUNK_OVERHEAD))
+
+    runs = []
+    merged = []     # outputs of the current merge pass, cleaned up on failure too
+    try:
+        # Phase 1: sort memory-sized chunks and spill them as runs
+        for chunk in _read_chunks(source, typecode, chunk_items):
+            if workers is not None and workers > 1:
+                ordered = merge_sort(chunk, workers=workers, parallel_threshold=0)
+            else:
+                ordered = merge_sort(chunk)
+            runs.append(_write_run(ordered, typecode, tmp_dir))
+            del chunk, ordered
+
+        # Phase 2: merge passes until at most MAX_FANIN runs remain
+        while len(runs) > MAX_FANIN:
+            buffer_items = max(1, memory_budget // (itemsize * (MAX_FANIN + 1)))
+            merged = []
+            for i in range(0, len(runs), MAX_FANIN):
+                group = runs[i:i + MAX_FANIN]
+                fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+                merged.append(path)
+                with os.fdopen(fd, 'wb') as f:
+                    _write_stream(_merge_runs(group, typecode, buffer_items), f, typecode, buffer_items)
+                for p in group:
+                    os.remove(p)
+            runs, merged = merged, []
+
+        # Phase 3: final streaming merge
+        buffer_items = max(1, memory_budget // (itemsize * (len(runs) + 1)))
+        yield from _merge_runs(runs, typecode, buffer_items)
+    finally:
+        for p in runs + merged:
+            if os.path.exists(p):
+                os.remove(p)
+
+
+def external_sort(source, dest, typecode='q', memory_budget=DEFAULT_MEMORY_BUDGET,
+                  workers=None, tmp_dir=None):
+    """
+    Sort `source` into the raw binary file `dest` using bounded memory.
+
+    Takes the same arguments as iter_external_sort. Returns the number of
+    records written.
+    """
+    itemsize = array(typecode).itemsize
+    block_items = max(1, memory_budget // (itemsize * CHUNK_OVERHEAD))
+    count = 0
+    with open(dest, 'wb') as f:
+        values = iter_external_sort(source, typecode, memory_budget, workers, tmp_dir)
+        while True:
+            block = array(typecode, itertools.islice(values, block_items))
+            if not block:
+                break
+            block.tofile(f)
+            count += len(block)
+    return count
+
+
+def generate_input(path, n, typecode='q', seed=None, block_items=1 << 20):
+    """Write n random records to `path` in blocks (use a large n for multi-GB inputs)."""
+    rng = random.Random(seed)
+    with open(path, 'wb') as f:
+        remaining = n
+        while remaining > 0:
+            m = min(block_items, remaining)
+            if typecode in 'fd':
+                block = array(typecode, (rng.random() for _ in range(m)))
+            else:
+                hi = (1 << (8 * array(typecode).itemsize - 1)) - 1
+                block = array(typecode, (rng.randint(0, hi) for _ in range(m)))
+            block.tofile(f)
+            remaining -= m
+
+
+def verify_sorted(path, typecode='q', block_items=1 << 20):
+    """Stream `path` and return (record count, whether it is in ascending order)."""
+    count = 0
+    prev = None
+    for x in _iter_run(path, typecode, block_items):
+        if prev is not None and x < prev:
+            return count, False
+        prev = x
+        count += 1
+    return count, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='External merge sort for raw binary numeric files.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help='write random records')
+    gen.add_argument('path')
+    gen.add_argument('n', type=int)
+    gen.add_argument('--typecode', default='q')
+    gen.add_argument('--seed', type=int, default=None)
+
+    srt = sub.add_parser('sort', help='sort a file')
+    srt.add_argument('source')
+    srt.add_argument('dest')
+    srt.add_argument('--typecode', default='q')
+    srt.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024))
+    srt.add_argument('--workers', type=int, default=None)
+    srt.add_argument('--tmp-dir', default=None)
+
+    ver = sub.add_parser('verify', help='check a file is sorted')
+    ver.add_argument('path')
+    ver.add_argument('--typecode', default='q')
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.command == 'generate':
+        generate_input(args.path, args.n, args.typecode, args.seed)
+        print(f"Wrote {args.n} records to {args.path}")
+    elif args.command == 'sort':
+        count = external_sort(args.source, args.dest, args.typecode,
+                              args.memory_mb * 1024 * 1024, args.workers, args.tmp_dir)
+        print(f"Sorted {count} records into {args.dest}")
+    else:
+        count, ok = verify_sorted(args.path, args.typecode)
+        print(f"{count} records, sorted={ok}")
+    print(f"Elapsed: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,107 @@
+import heapq
+import os
 import time
 import random
 import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 # Increase recursion depth for deep Quick Sort trees on large sorted datasets
 sys.setrecursionlimit(20000)
 
-def merge_sort(arr):
+# The shared introsort engine lives next to heapsort in Assignment-4.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Assignment-4"))
+from introsort import introsort
+from natural_mergesort import natural_merge_sort
+from vectorized import (as_numeric_array, merge_sorted_runs, restore_list_type, restore_type,
+                        try_vectorized, vectorized_merge_sort, vectorized_quicksort)
+
+# Inputs shorter than this are sorted in-process even when workers are requested
+PARALLEL_THRESHOLD = 1_000_000
+
+def merge_sort(arr, vectorize=True, workers=None, parallel_threshold=PARALLEL_THRESHOLD):
+    """
+    Merge Sort entry point. Homogeneous int/float input (NumPy array,
+    array.array, or a large list) is sorted by the NumPy bottom-up block
+    merge when NumPy is available; anything else uses the bottom-up natural
+    merge sort. Like merge_sort_recursive it leaves `arr` untouched, so it
+    sorts one copy in place, merging runs through a single buffer of n // 2
+    slots: 1.5n list slots in all, against about 2n for the recursive
+    version's slices and merge results.
+    Pass vectorize=False to force the pure-Python path.
+    With workers > 1 and at least parallel_threshold elements, chunks are
+    sorted in a process pool (see parallel_merge_sort).
+    Every path returns the container type of `arr` (list, array.array or
+    NumPy array).
+    Time Complexity: O(n log n), O(n) on sorted or reverse-sorted input
+    Space Complexity: O(n)
+    """
+    if workers is not None and workers > 1 and len(arr) >= parallel_threshold:
+        return parallel_merge_sort(arr, workers, vectorize)
+    if vectorize:
+        result = try_vectorized(vectorized_merge_sort, arr)
+        if result is not None:
+            return result
+    return restore_list_type(natural_merge_sort(list(arr)), arr)
+
+def _sort_shared_chunk(shm_name, dtype, n, lo, hi):
+    """Worker: sort a[lo:hi] of the shared array in place."""
+    import numpy as np
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        a = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+        vectorized_merge_sort(a[lo:hi])
+        del a
+    finally:
+        shm.close()
+
+def _sort_chunk(chunk):
+    """Worker: sort one pickled chunk with the pure-Python merge sort."""
+    return natural_merge_sort(chunk)
+
+def parallel_merge_sort(arr, workers, vectorize=True):
+    """
+    Sort `arr` by splitting it into `workers` chunks sorted in a process pool.
+    Numeric data is placed in shared memory so workers sort their slice in
+    place without pickling, and the parent merges the sorted slices with the
+    NumPy pairwise merge. Other data is pickled chunk by chunk and the parent
+    finishes with a k-way heap merge (heapq.merge).
+    """
+    n = len(arr)
+    bounds = [n * i // workers for i in range(workers + 1)]
+    a = as_numeric_array(arr, min_size=0) if vectorize else None
+
+    if a is None:
+        data = list(arr)
+        chunks = [data[bounds[i]:bounds[i + 1]] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_sort_chunk, chunks))
+        return restore_list_type(list(heapq.merge(*runs)), arr)
+
+    import numpy as np
+    shm = shared_memory.SharedMemory(create=True, size=max(1, a.nbytes))
+    try:
+        shared = np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)
+        shared[:] = a
+        del a
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sort_shared_chunk, shm.name, shared.dtype.str, n,
+                                   bounds[i], bounds[i + 1])
+                       for i in range(workers)]
+            for f in futures:
+                f.result()
+        result = merge_sorted_runs(shared.copy(), bounds)
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+    return restore_type(result, arr)
+
+def merge_sort_recursive(arr):
     """
     Implementation of Merge Sort as described in CLRS Chapter 2.
+    Slices and allocates a new list at every level; kept as the baseline.
     Time Complexity: Theta(n log n)
     Space Complexity: O(n)
     """
@@ -15,8 +109,8 @@ def merge_sort(arr):
         return arr
     
     mid = len(arr) // 2
-    left = merge_sort(arr[:mid])
-    right = merge_sort(arr[mid:])
+    left = merge_sort_recursive(arr[:mid])
+    right = merge_sort_recursive(arr[mid:])
     
     return merge(left, right)
 
@@ -34,9 +128,25 @@ def merge(left, right):
     result.extend(right[j:])
     return result
 
-def quick_sort(arr):
+def quick_sort(arr, vectorize=True):
+    """
+    Quick Sort backed by the shared in-place introsort engine (ninther pivot,
+    insertion-sort cutoff, heapsort fallback). Returns a new sorted list.
+    Homogeneous int/float input takes the NumPy mask-partitioning path
+    unless vectorize=False.
+    Time Complexity: O(n log n) worst case
+    Space Complexity: O(n) for the output copy, O(log n) stack
+    """
+    if vectorize:
+        result = try_vectorized(vectorized_quicksort, arr)
+        if result is not None:
+            return result
+    return introsort(list(arr))
+
+def quick_sort_recursive(arr):
     """
     Implementation of Quick Sort using a middle-element pivot.
+    Builds three new lists per level; kept as the baseline for benchmarks.
     Average Time Complexity: Theta(n log n)
     Worst Case: O(n^2)
     """
@@ -48,7 +158,7 @@ def quick_sort(arr):
     middle = [x for x in arr if x == pivot]
     right = [x for x in arr if x > pivot]
     
-    return quick_sort(left) + middle + quick_sort(right)
+    return quick_sort_recursive(left) + middle + quick_sort_recursive(right)
 
 def benchmark(algorithm, data):
     """Run `algorithm` on a copy of `data` and return elapsed time and result."""
@@ -57,9 +167,18 @@ def benchmark(algorithm, data):
     elapsed = time.perf_counter() - start
     return elapsed, result
 
+def peak_memory(algorithm, data):
+    """Return the peak bytes allocated while running `algorithm` on a copy of `data`."""
+    data = data.copy()
+    tracemalloc.start()
+    algorithm(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
 def run_tests(sizes=[1000, 5000, 10000]):
-    print(f"{'Size':<10} | {'Type':<15} | {'Merge Sort':<12} | {'Quick Sort':<12}")
-    print("-" * 70)
+    print(f"{'Size':<10} | {'Type':<15} | {'Merge Sort':<12} | {'Quick Sort':<12} | {'Merge peak (bottom-up / recursive)':<34}")
+    print("-" * 105)
 
     for n in sizes:
         datasets = {
@@ -77,7 +196,49 @@ def run_tests(sizes=[1000, 5000, 10000]):
             if m_sorted != expected or q_sorted != expected:
                 print(f"[ERROR] Sorting mismatch for n={n}, type={name}")
 
-            print(f"{n:<10} | {name:<15} | {m_time:.5f}s     | {q_time:.5f}s")
+            # Memory high-water mark of the pure-Python merge sorts
+            bu_peak = peak_memory(lambda a: merge_sort(a, vectorize=False), data)
+            rec_peak = peak_memory(merge_sort_recursive, data)
+
+            print(f"{n:<10} | {name:<15} | {m_time:.5f}s     | {q_time:.5f}s     | "
+                  f"{bu_peak / 1024:.1f} KiB / {rec_peak / 1024:.1f} KiB")
+
+def run_vectorized_tests(sizes=[100000, 1000000]):
+    """Compare the pure-Python and NumPy paths of merge_sort and quick_sort."""
+    print(f"{'Size':<10} | {'Input':<10} | {'Merge (py)':<11} | {'Merge (np)':<11} | {'Quick (py)':<11} | {'Quick (np)':<11}")
+    print("-" * 80)
+
+    for n in sizes:
+        datasets = {
+            "int list": [random.randint(0, 10**9) for _ in range(n)],
+            "float list": [random.random() for _ in range(n)],
+        }
+
+        for name, data in datasets.items():
+            row = []
+            for algorithm in (merge_sort, quick_sort):
+                py_time, py_sorted = benchmark(lambda a: algorithm(a, vectorize=False), data)
+                np_time, np_sorted = benchmark(algorithm, data)
+                if py_sorted != np_sorted:
+                    print(f"[ERROR] Path mismatch for n={n}, input={name}")
+                row += [py_time, np_time]
+
+            print(f"{n:<10} | {name:<10} | " + " | ".join(f"{t:.5f}s    " for t in row))
+
+def run_parallel_tests(n=5_000_000, worker_counts=(1, 2, 4, 8)):
+    """Report merge_sort speedup versus worker count on random int data."""
+    data = [random.randint(0, 10**9) for _ in range(n)]
+    print(f"{'Workers':<8} | {'Time':<10} | {'Speedup':<8}")
+    print("-" * 32)
+
+    base = None
+    for w in worker_counts:
+        elapsed, result = benchmark(lambda a: merge_sort(a, workers=w, parallel_threshold=0), data)
+        base = base or elapsed
+        print(f"{w:<8} | {elapsed:.4f}s   | {base / elapsed:.2f}x")
 
 if __name__ == "__main__":
-    run_tests()
\ No newline at end of file
+    if "--parallel" in sys.argv:
+        run_parallel_tests()
+    else:
+        run_tests()
\ No newline at end of file
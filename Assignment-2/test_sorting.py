@@ -1,4 +1,7 @@
+import os
 import random
+import tempfile
+import external_sort as es
 import sorting_algorithms as sa
 
 
@@ -17,8 +20,62 @@ def run_unit_tests():
         expected = sorted(t)
         m_time, m_sorted = sa.benchmark(sa.merge_sort, t)
         q_time, q_sorted = sa.benchmark(sa.quick_sort, t)
+        r_time, r_sorted = sa.benchmark(sa.quick_sort_recursive, t)
+        b_time, b_sorted = sa.benchmark(sa.merge_sort_recursive, t)
+        assert b_sorted == expected, f"merge_sort_recursive failed for {t}"
         assert m_sorted == expected, f"merge_sort failed for {t}"
         assert q_sorted == expected, f"quick_sort failed for {t}"
+        assert r_sorted == expected, f"quick_sort_recursive failed for {t}"
+
+    # Sorted input far deeper than the default recursion limit
+    data = list(range(50000))
+    assert sa.quick_sort(data) == data, "quick_sort failed on large sorted input"
+
+    # NumPy fast path and pure-Python path must agree; mixed types fall back
+    ints = [random.randint(-1000, 1000) for _ in range(5000)]
+    mixed = [random.choice([1, 2.5, -3]) for _ in range(5000)]
+    for data in (ints, mixed):
+        expected = sorted(data)
+        for algorithm in (sa.merge_sort, sa.quick_sort):
+            assert algorithm(data) == expected, f"{algorithm.__name__} failed on NumPy path"
+            assert algorithm(data, vectorize=False) == expected, f"{algorithm.__name__} failed on Python path"
+
+    # Parallel merge sort: shared-memory (numeric) and pickled (mixed) paths
+    for data in (ints, mixed):
+        assert sa.merge_sort(data, workers=2, parallel_threshold=0) == sorted(data), "parallel merge_sort failed"
+
+    # External sort with a tiny memory budget (many spilled runs)
+    data = [random.randint(-10**12, 10**12) for _ in range(20000)]
+    assert list(es.iter_external_sort(data, 'q', memory_budget=8 * 4 * 500)) == sorted(data), "external sort failed"
+
+    # More runs than MAX_FANIN: exercises the intermediate merge passes
+    data = [random.randint(-10**12, 10**12) for _ in range(40000)]
+    assert len(data) // 500 > es.MAX_FANIN
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result = list(es.iter_external_sort(data, 'q', memory_budget=8 * 4 * 500, tmp_dir=tmp_dir))
+        assert result == sorted(data), "multi-pass external sort failed"
+        assert not [f for f in os.listdir(tmp_dir) if f.endswith('.run')], "external sort left run files behind"
+
+    # A merge pass that fails part-way must not leak the runs it already wrote
+    write_stream, calls = es._write_stream, []
+
+    def failing_write_stream(values, f, typecode, block_items):
+        calls.append(None)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        write_stream(values, f, typecode, block_items)
+
+    es._write_stream = failing_write_stream
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                list(es.iter_external_sort(data, 'q', memory_budget=8 * 4 * 500, tmp_dir=tmp_dir))
+                raise AssertionError("external sort ignored a failed merge pass")
+            except OSError:
+                pass
+            assert not [f for f in os.listdir(tmp_dir) if f.endswith('.run')], "failed merge pass left run files behind"
+    finally:
+        es._write_stream = write_stream
 
     print("All unit tests passed.")
 
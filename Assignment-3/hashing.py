@@ -1,10 +1,26 @@
 import random
+import sys
+import threading
 import time
 import csv
+import gc
 import os
+import tracemalloc
+from array import array
 
 import matplotlib.pyplot as plt
 
+try:
+    import numpy as np
+except ImportError:  # optional: bulk operations fall back to per-key hashing
+    np = None
+
+
+_P61 = (1 << 61) - 1
+_MASK64 = (1 << 64) - 1
+
+HASH_MODES = ('universal', 'mersenne', 'multiply_shift')
+
 
 class HashTable:
     """Hash table with chaining and dynamic resizing.
@@ -12,81 +28,863 @@ class HashTable:
     Uses a simple universal-style map from Python's `hash()` value to a slot:
     h(k) = (a * H(k) + b) mod p mod m
     where p is a large prime, and a in [1,p-1], b in [0,p-1].
+
+    hash_mode selects how the slot is computed:
+     - 'universal': the formula above with two big-int modulo operations;
+     - 'mersenne': same family, but since p = 2^61 - 1 the mod p is done
+       with shifts and masks (x mod p = (x & p) + (x >> 61), folded twice);
+     - 'multiply_shift': m is kept a power of two 2^k and
+       h(k) = ((a * H(k)) mod 2^64) >> (64 - k) with a random odd 64-bit a.
+    Every entry is stored as [key, value, H(key)], so resizing and
+    migration never call hash() again and chains compare the cached
+    hash before the key.
+
+    With incremental=True a resize does not rehash everything at once: the
+    old table is kept alongside the new one and every insert/search/delete
+    migrates up to `migrate_buckets` old buckets (Redis-style), so no single
+    operation pays O(n). Lookups consult both tables until migration ends.
+
+    from_items/insert_many/search_many/delete_many size the table once for
+    the whole batch, hash all keys in one pass (vectorized with NumPy when
+    available) and skip the per-call load-factor checks.
     """
 
-    def __init__(self, size=11, max_load=0.75, min_load=0.2):
-        self._init_size = max(3, int(size))
+    def __init__(self, size=11, max_load=0.75, min_load=0.2, incremental=False, migrate_buckets=4,
+                 hash_mode='universal'):
+        if hash_mode not in HASH_MODES:
+            raise ValueError(f'unknown hash_mode: {hash_mode!r}')
+        self.hash_mode = hash_mode
+        self._index = getattr(self, '_index_' + hash_mode)
+        self._init_size = self._fit_size(max(3, int(size)))
         self.size = self._init_size
-        self.table = [[] for _ in range(self.size)]
+        # empty buckets share one immutable () until their first insert, so
+        # allocating a table does not create a list per bucket
+        self.table = [()] * self.size
         self.count = 0
         self.max_load = max_load
         self.min_load = min_load
+        self.incremental = incremental
+        self.migrate_buckets = max(1, int(migrate_buckets))
+
+        # old table and its hash parameters while an incremental resize is in progress
+        self._old_table = None
+        self._old_size = 0
+        self._old_a = self._old_b = 0
+        self._migrate_idx = 0
 
         # large prime for universal hashing; use a 61-bit Mersenne-like prime
-        self._p = (1 << 61) - 1
+        self._p = _P61
         self._new_hash_params()
 
     def _new_hash_params(self):
-        self._a = random.randrange(1, self._p)
-        self._b = random.randrange(0, self._p)
+        if self.hash_mode == 'multiply_shift':
+            self._a = random.getrandbits(64) | 1
+            self._b = 0
+        else:
+            self._a = random.randrange(1, self._p)
+            self._b = random.randrange(0, self._p)
+
+    def _fit_size(self, n):
+        """Round a table size up to a power of two in multiply-shift mode."""
+        if self.hash_mode == 'multiply_shift':
+            return 1 << (n - 1).bit_length()
+        return n
+
+    def _index_universal(self, H, a, b, m):
+        return ((a * H + b) % self._p) % m
+
+    def _index_mersenne(self, H, a, b, m):
+        x = a * H + b
+        x = (x & _P61) + (x >> 61)
+        x = (x & _P61) + (x >> 61)
+        if x >= _P61:
+            x -= _P61
+        return x % m
+
+    def _index_multiply_shift(self, H, a, b, m):
+        return ((a * H) & _MASK64) >> (65 - m.bit_length())
 
     def _hash(self, key):
-        H = hash(key)
-        if H < 0:
-            H = -H
-        return ((self._a * H + self._b) % self._p) % self.size
+        return self._index(abs(hash(key)), self._a, self._b, self.size)
+
+    def _hash_many(self, keys):
+        """Return (cached hashes, bucket indices) of `keys` under the current parameters."""
+        hashes = [abs(hash(k)) for k in keys]
+        if np is None or len(keys) < 64:
+            a, b, m, index = self._a, self._b, self.size, self._index
+            return hashes, [index(H, a, b, m) for H in hashes]
+        H = np.array(hashes, dtype=np.uint64)
+        if self.hash_mode == 'multiply_shift':
+            idx = (np.uint64(self._a) * H) >> np.uint64(65 - self.size.bit_length())
+        else:
+            idx = _universal_hash_np(H, self._a, self._b, self.size)
+        return hashes, idx.tolist()
+
+    def _old_bucket(self, H):
+        return self._old_table[self._index(H, self._old_a, self._old_b, self._old_size)]
 
     def __len__(self):
         return self.count
 
     def insert(self, key, value):
-        idx = self._hash(key)
+        if self._old_table is not None:
+            self._migrate_step()
+        H = abs(hash(key))
+        idx = self._index(H, self._a, self._b, self.size)
         bucket = self.table[idx]
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i][1] = value
+        for entry in bucket:
+            if entry[2] == H and entry[0] == key:
+                entry[1] = value
                 return
-        bucket.append([key, value])
+        if type(bucket) is tuple:
+            # first insert into the shared empty (); emptied lists are reused
+            bucket = self.table[idx] = []
+        if self._old_table is not None:
+            # a key lives in exactly one table: move it over if it is still in the old one
+            old_bucket = self._old_bucket(H)
+            for i, entry in enumerate(old_bucket):
+                if entry[2] == H and entry[0] == key:
+                    old_bucket.pop(i)
+                    entry[1] = value
+                    bucket.append(entry)
+                    return
+        bucket.append([key, value, H])
         self.count += 1
         if self.load_factor() > self.max_load:
             self._resize(self.size * 2)
 
     def search(self, key):
-        idx = self._hash(key)
-        for k, v in self.table[idx]:
-            if k == key:
+        if self._old_table is not None:
+            self._migrate_step()
+        H = abs(hash(key))
+        for k, v, h in self.table[self._index(H, self._a, self._b, self.size)]:
+            if h == H and k == key:
                 return v
+        if self._old_table is not None:
+            for k, v, h in self._old_bucket(H):
+                if h == H and k == key:
+                    return v
         return None
 
     def delete(self, key):
-        idx = self._hash(key)
-        bucket = self.table[idx]
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket.pop(i)
-                self.count -= 1
-                if self.size > self._init_size and self.load_factor() < self.min_load:
-                    new_size = max(self._init_size, self.size // 2)
-                    self._resize(new_size)
-                return True
+        if self._old_table is not None:
+            self._migrate_step()
+        H = abs(hash(key))
+        buckets = [self.table[self._index(H, self._a, self._b, self.size)]]
+        if self._old_table is not None:
+            buckets.append(self._old_bucket(H))
+        for bucket in buckets:
+            for i, (k, v, h) in enumerate(bucket):
+                if h == H and k == key:
+                    bucket.pop(i)
+                    self.count -= 1
+                    if self.size > self._init_size and self.load_factor() < self.min_load:
+                        new_size = max(self._init_size, self.size // 2)
+                        self._resize(new_size)
+                    return True
         return False
 
+    @classmethod
+    def from_items(cls, items, expected_size=None, **kwargs):
+        """Build a table from (key, value) pairs, sized once for `expected_size` keys."""
+        items = list(items)
+        table = cls(**kwargs)
+        table._reserve(len(items) if expected_size is None else expected_size)
+        table.insert_many(items)
+        return table
+
+    def insert_many(self, items):
+        """Insert or update every (key, value) pair in `items`."""
+        items = list(items)
+        self._reserve(len(items))
+        hashes, idxs = self._hash_many([k for k, _ in items])
+        table = self.table
+        added = 0
+        for (key, value), H, idx in zip(items, hashes, idxs):
+            bucket = table[idx]
+            for entry in bucket:
+                if entry[2] == H and entry[0] == key:
+                    entry[1] = value
+                    break
+            else:
+                if bucket:
+                    bucket.append([key, value, H])
+                else:
+                    table[idx] = [[key, value, H]]
+                added += 1
+        self.count += added
+
+    def search_many(self, keys):
+        """Return the values for `keys` as a list (None for missing keys)."""
+        keys = list(keys)
+        self._finish_migration()
+        table = self.table
+        out = []
+        for key, H, idx in zip(keys, *self._hash_many(keys)):
+            for k, v, h in table[idx]:
+                if h == H and k == key:
+                    out.append(v)
+                    break
+            else:
+                out.append(None)
+        return out
+
+    def delete_many(self, keys):
+        """Delete every key in `keys` and return how many were present."""
+        keys = list(keys)
+        self._finish_migration()
+        table = self.table
+        removed = 0
+        for key, H, idx in zip(keys, *self._hash_many(keys)):
+            bucket = table[idx]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == H and k == key:
+                    bucket.pop(i)
+                    removed += 1
+                    break
+        self.count -= removed
+        # one shrink for the whole batch instead of one check per key
+        new_size = self.size
+        while new_size > self._init_size and self.count / new_size < self.min_load:
+            new_size = max(self._init_size, new_size // 2)
+        if new_size != self.size:
+            self._resize(new_size)
+        return removed
+
     def load_factor(self):
         return self.count / float(self.size)
 
+    def _finish_migration(self):
+        while self._old_table is not None:
+            self._migrate_step(len(self._old_table))
+
+    def _reserve(self, n):
+        """Grow the table (once) so `n` more keys fit under max_load."""
+        self._finish_migration()
+        needed = int((self.count + n) / self.max_load) + 1
+        if needed > self.size:
+            self._rehash(needed)
+
     def _resize(self, new_size):
-        old_items = []
-        for bucket in self.table:
-            for k, v in bucket:
-                old_items.append((k, v))
+        if self.incremental:
+            self._start_migration(new_size)
+        else:
+            self._rehash(new_size)
 
-        self.size = max(self._init_size, int(new_size))
-        self.table = [[] for _ in range(self.size)]
+    def _rehash(self, new_size):
+        old_table = self.table
+        self.size = self._fit_size(max(self._init_size, int(new_size)))
+        self.table = [()] * self.size
         # change hash params to reduce clustering after resize
         self._new_hash_params()
+        # entries carry their hash, so keys are not hashed again
+        table, index, a, b, m = self.table, self._index, self._a, self._b, self.size
+        for bucket in old_table:
+            for entry in bucket:
+                idx = index(entry[2], a, b, m)
+                if table[idx]:
+                    table[idx].append(entry)
+                else:
+                    table[idx] = [entry]
+
+    def _start_migration(self, new_size):
+        # a resize requested mid-migration first finishes the previous one
+        self._finish_migration()
+        self._old_table = self.table
+        self._old_size = self.size
+        self._old_a, self._old_b = self._a, self._b
+        self._migrate_idx = 0
+
+        self.size = self._fit_size(max(self._init_size, int(new_size)))
+        self.table = [()] * self.size
+        self._new_hash_params()
+
+    def _migrate_step(self, n=None):
+        """Move up to `n` non-empty old buckets (visiting at most 10n) into the new table."""
+        if n is None:
+            n = self.migrate_buckets
+        old = self._old_table
+        moved = visited = 0
+        while moved < n and visited < 10 * n and self._migrate_idx < self._old_size:
+            bucket = old[self._migrate_idx]
+            self._migrate_idx += 1
+            visited += 1
+            if bucket:
+                table = self.table
+                for entry in bucket:
+                    idx = self._index(entry[2], self._a, self._b, self.size)
+                    if table[idx]:
+                        table[idx].append(entry)
+                    else:
+                        table[idx] = [entry]
+                old[self._migrate_idx - 1] = ()
+                moved += 1
+        if self._migrate_idx >= self._old_size:
+            self._old_table = None
+
+
+_EMPTY = object()  # marks a free slot in OpenAddressingHashTable
+
+
+def _universal_hash_np(H, a, b, m):
+    """Vectorized ((a * H + b) mod p) mod m for p = 2^61 - 1 on a uint64 array.
+
+    a * H needs up to 122 bits, so both factors are split into 32-bit halves
+    and each partial product is folded with 2^61 = 1 (mod p) before it can
+    overflow 64 bits.
+    """
+    P = np.uint64((1 << 61) - 1)
+    M32 = np.uint64(0xFFFFFFFF)
+    s29, s32, s61 = np.uint64(29), np.uint64(32), np.uint64(61)
+
+    def fold(x):
+        x = (x & P) + (x >> s61)
+        return np.where(x >= P, x - P, x)
+
+    H = H % P
+    a_hi, a_lo = np.uint64(a >> 32), np.uint64(a & 0xFFFFFFFF)
+    h_hi, h_lo = H >> s32, H & M32
+    # a*H = hi*2^64 + mid*2^32 + lo, with 2^64 = 8 (mod p)
+    hi = a_hi * h_hi * np.uint64(8)
+    mid = a_hi * h_lo + a_lo * h_hi
+    # mid*2^32 = (mid >> 29)*2^61 + (mid mod 2^29)*2^32 = (mid >> 29) + ... (mod p)
+    mid = (mid >> s29) + ((mid & np.uint64((1 << 29) - 1)) << s32)
+    lo = fold(a_lo * h_lo)
+    x = fold(fold(hi + fold(mid)) + lo)
+    x = fold(x + np.uint64(b))
+    return x % np.uint64(m)
+
+
+class OpenAddressingHashTable:
+    """Open-addressing hash table with Robin Hood linear probing.
+
+    Same API as HashTable (insert/search/delete/load_factor), but entries live
+    in three parallel flat arrays (keys, values, cached hashes) instead of
+    per-bucket lists. The cached hash is the universal hash
+    (a * H(k) + b) mod p, and the slot is its low bits (capacity is a power of
+    two), so resizing never calls hash() again. Deletion shifts the following
+    cluster back by one slot instead of leaving tombstones.
+    """
+
+    def __init__(self, size=16, max_load=0.75, min_load=0.2):
+        cap = 8
+        while cap < size:
+            cap *= 2
+        self._init_size = cap
+        self.size = cap
         self.count = 0
-        for k, v in old_items:
-            self.insert(k, v)
+        self.max_load = max_load
+        self.min_load = min_load
+        self._alloc(cap)
+
+        self._p = (1 << 61) - 1
+        self._a = random.randrange(1, self._p)
+        self._b = random.randrange(0, self._p)
+
+    def _alloc(self, cap):
+        self._keys = [_EMPTY] * cap
+        self._values = [None] * cap
+        self._hashes = array('q', bytes(8 * cap))
+
+    def _uhash(self, key):
+        H = hash(key)
+        if H < 0:
+            H = -H
+        return (self._a * H + self._b) % self._p
+
+    def __len__(self):
+        return self.count
+
+    def _place(self, key, value, h):
+        # Robin Hood insert of a key known to be absent: an entry that is
+        # closer to its home slot than the one being placed gives up its slot.
+        keys, values, hashes = self._keys, self._values, self._hashes
+        mask = self.size - 1
+        i = h & mask
+        dist = 0
+        while True:
+            if keys[i] is _EMPTY:
+                keys[i] = key
+                values[i] = value
+                hashes[i] = h
+                return
+            d = (i - (hashes[i] & mask)) & mask
+            if d < dist:
+                keys[i], key = key, keys[i]
+                values[i], value = value, values[i]
+                hashes[i], h = h, hashes[i]
+                dist = d
+            i = (i + 1) & mask
+            dist += 1
+
+    def _find(self, key, h):
+        keys, hashes = self._keys, self._hashes
+        mask = self.size - 1
+        i = h & mask
+        dist = 0
+        while True:
+            k = keys[i]
+            if k is _EMPTY:
+                return -1
+            hk = hashes[i]
+            if hk == h and (k is key or k == key):
+                return i
+            # Robin Hood invariant: the key would have been placed before any
+            # entry that sits closer to its own home slot.
+            if (i - (hk & mask)) & mask < dist:
+                return -1
+            i = (i + 1) & mask
+            dist += 1
+
+    def insert(self, key, value):
+        h = self._uhash(key)
+        i = self._find(key, h)
+        if i >= 0:
+            self._values[i] = value
+            return
+        self._place(key, value, h)
+        self.count += 1
+        if self.load_factor() > self.max_load:
+            self._resize(self.size * 2)
+
+    def search(self, key):
+        i = self._find(key, self._uhash(key))
+        return self._values[i] if i >= 0 else None
+
+    def delete(self, key):
+        i = self._find(key, self._uhash(key))
+        if i < 0:
+            return False
+        keys, values, hashes = self._keys, self._values, self._hashes
+        mask = self.size - 1
+        # Backward-shift deletion: pull the rest of the cluster one slot back
+        # until an empty slot or an entry already in its home slot.
+        j = (i + 1) & mask
+        while keys[j] is not _EMPTY and (j - (hashes[j] & mask)) & mask > 0:
+            keys[i] = keys[j]
+            values[i] = values[j]
+            hashes[i] = hashes[j]
+            i = j
+            j = (j + 1) & mask
+        keys[i] = _EMPTY
+        values[i] = None
+        self.count -= 1
+        if self.size > self._init_size and self.load_factor() < self.min_load:
+            self._resize(max(self._init_size, self.size // 2))
+        return True
+
+    def load_factor(self):
+        return self.count / float(self.size)
+
+    def _resize(self, new_size):
+        old_keys, old_values, old_hashes = self._keys, self._values, self._hashes
+        self.size = max(self._init_size, int(new_size))
+        self._alloc(self.size)
+        for i, k in enumerate(old_keys):
+            if k is not _EMPTY:
+                self._place(k, old_values[i], old_hashes[i])
+
+
+_MOVED = object()  # forwarding marker left in a bucket that has been migrated
+
+
+class _Generation:
+    """One bucket array of a ConcurrentHashTable, with its own hash params and lock stripes."""
+
+    __slots__ = ('size', 'buckets', 'a', 'b', 'locks', 'counts', 'stripe_limit',
+                 'next', 'migrate_idx', 'migrated')
+
+    def __init__(self, size, n_locks, max_load):
+        self.size = size
+        self.buckets = [()] * size
+        self.a = random.randrange(1, _P61)
+        self.b = random.randrange(0, _P61)
+        # stripe s guards the bucket range [s*size/n_locks, (s+1)*size/n_locks)
+        self.locks = [threading.Lock() for _ in range(n_locks)]
+        self.counts = [0] * n_locks
+        self.stripe_limit = max_load * size / n_locks
+        self.next = None
+        self.migrate_idx = 0
+        self.migrated = 0
+
+    def index(self, H):
+        return ((self.a * H + self.b) % _P61) % self.size
+
+    def stripe(self, idx):
+        return idx * len(self.locks) // self.size
+
+
+class ConcurrentHashTable:
+    """Thread-safe chained hash table with lock striping and lock-free reads.
+
+    Buckets are immutable tuples of (key, value, H) entries. Writers take
+    the lock of the stripe that owns the bucket range and publish a new
+    tuple, so search() never locks: it reads whatever tuple is in the slot.
+    Each stripe keeps its own entry count, updated under its lock.
+
+    Resizing is cooperative rather than stop-the-world: the thread that
+    pushes a stripe over max_load allocates the next generation, and every
+    insert/delete then migrates `migrate_buckets` buckets before doing its
+    own work. A migrated bucket is replaced by a forwarding marker, so
+    readers and writers that land on it continue in the next generation.
+    The table only grows; delete never triggers a shrink.
+    """
+
+    def __init__(self, size=16, max_load=0.75, n_stripes=16, migrate_buckets=4):
+        self.max_load = max_load
+        self.n_stripes = max(1, int(n_stripes))
+        self.migrate_buckets = max(1, int(migrate_buckets))
+        self._gen = _Generation(max(int(size), self.n_stripes), self.n_stripes, max_load)
+        # serialises starting a resize and claiming migration ranges only
+        self._resize_lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._gen.size
+
+    def __len__(self):
+        # exact when no writer is active, approximate otherwise
+        gen = self._gen
+        total = sum(gen.counts)
+        if gen.next is not None:
+            total += sum(gen.next.counts)
+        return total
+
+    def load_factor(self):
+        return len(self) / float(self.size)
+
+    def search(self, key):
+        H = abs(hash(key))
+        gen = self._gen
+        while True:
+            bucket = gen.buckets[gen.index(H)]
+            if bucket is not _MOVED:
+                for k, v, h in bucket:
+                    if h == H and k == key:
+                        return v
+                return None
+            gen = gen.next
+
+    def insert(self, key, value):
+        H = abs(hash(key))
+        gen = self._gen
+        if gen.next is not None:
+            self._help_migrate(gen)
+        while True:
+            idx = gen.index(H)
+            s = gen.stripe(idx)
+            with gen.locks[s]:
+                bucket = gen.buckets[idx]
+                if bucket is not _MOVED:
+                    for pos, (k, v, h) in enumerate(bucket):
+                        if h == H and k == key:
+                            gen.buckets[idx] = bucket[:pos] + ((key, value, H),) + bucket[pos + 1:]
+                            return
+                    gen.buckets[idx] = bucket + ((key, value, H),)
+                    gen.counts[s] += 1
+                    grow = gen.counts[s] > gen.stripe_limit
+                    break
+            gen = gen.next
+        if grow:
+            self._start_resize(gen)
+
+    def delete(self, key):
+        H = abs(hash(key))
+        gen = self._gen
+        if gen.next is not None:
+            self._help_migrate(gen)
+        while True:
+            idx = gen.index(H)
+            s = gen.stripe(idx)
+            with gen.locks[s]:
+                bucket = gen.buckets[idx]
+                if bucket is not _MOVED:
+                    for pos, (k, v, h) in enumerate(bucket):
+                        if h == H and k == key:
+                            gen.buckets[idx] = bucket[:pos] + bucket[pos + 1:]
+                            gen.counts[s] -= 1
+                            return True
+                    return False
+            gen = gen.next
+
+    def _start_resize(self, gen):
+        with self._resize_lock:
+            # only the published generation grows, and only once at a time
+            if gen is self._gen and gen.next is None:
+                gen.next = _Generation(gen.size * 2, self.n_stripes, self.max_load)
+
+    def _help_migrate(self, gen):
+        with self._resize_lock:
+            start = gen.migrate_idx
+            end = min(gen.size, start + self.migrate_buckets)
+            gen.migrate_idx = end
+        if start >= end:
+            return
+        new = gen.next
+        for i in range(start, end):
+            s = gen.stripe(i)
+            # lock order is always old generation before new, so no cycles
+            with gen.locks[s]:
+                for entry in gen.buckets[i]:
+                    j = new.index(entry[2])
+                    t = new.stripe(j)
+                    with new.locks[t]:
+                        new.buckets[j] = new.buckets[j] + (entry,)
+                        new.counts[t] += 1
+                    gen.counts[s] -= 1
+                gen.buckets[i] = _MOVED
+        with self._resize_lock:
+            gen.migrated += end - start
+            if gen.migrated == gen.size:
+                self._gen = new
+
+
+class _GlobalLockHashTable:
+    """HashTable behind one lock: the baseline for run_concurrency_bench."""
+
+    def __init__(self):
+        self._table = HashTable()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._table)
+
+    def insert(self, key, value):
+        with self._lock:
+            self._table.insert(key, value)
+
+    def search(self, key):
+        with self._lock:
+            return self._table.search(key)
+
+    def delete(self, key):
+        with self._lock:
+            return self._table.delete(key)
+
+
+def run_concurrency_bench(threads=(1, 2, 4, 8), n_keys=50_000, ops_per_thread=50_000,
+                          read_ratio=0.9, out_csv='results_hash_concurrency.csv'):
+    """Multithreaded readers/writers stress test: ConcurrentHashTable vs one global lock.
+
+    Every thread reads random keys and writes (insert/delete) only keys it
+    owns (key % n_threads == thread id), so the final table contents are
+    known and are checked after each run. On a free-threaded build
+    (python3.13t) the threads actually run in parallel.
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    rows = []
+    for n_threads in threads:
+        for cls in (_GlobalLockHashTable, ConcurrentHashTable):
+            table = cls()
+            for k in range(0, n_keys, 2):
+                table.insert(k, k)
+            expected = [{k: k for k in range(tid, n_keys, n_threads) if k % 2 == 0}
+                        for tid in range(n_threads)]
+            barrier = threading.Barrier(n_threads + 1)
+
+            def worker(tid):
+                rng = random.Random(tid)
+                mine = expected[tid]
+                barrier.wait()
+                for _ in range(ops_per_thread):
+                    if rng.random() < read_ratio:
+                        table.search(rng.randrange(n_keys))
+                        continue
+                    k = rng.randrange(tid, n_keys, n_threads)
+                    if rng.random() < 0.5:
+                        table.insert(k, -k)
+                        mine[k] = -k
+                    else:
+                        table.delete(k)
+                        mine.pop(k, None)
+
+            workers = [threading.Thread(target=worker, args=(tid,)) for tid in range(n_threads)]
+            for t in workers:
+                t.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for t in workers:
+                t.join()
+            elapsed = time.perf_counter() - start
+
+            final = {}
+            for mine in expected:
+                final.update(mine)
+            ok = len(table) == len(final) and all(table.search(k) == v for k, v in final.items())
+            row = {
+                'threads': n_threads,
+                'table': cls.__name__.lstrip('_'),
+                'ops_per_sec': n_threads * ops_per_thread / elapsed,
+                'consistent': ok,
+            }
+            print(f"threads={n_threads} {row['table']:<20} {row['ops_per_sec']:.0f} ops/s consistent={ok}")
+            rows.append(row)
+
+    with open(out_csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['threads', 'table', 'ops_per_sec', 'consistent'])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+    return out_csv
+
+
+def _table_footprint(cls, keys, values):
+    """Build a table of `cls` and return (table, bytes allocated by it)."""
+    tracemalloc.start()
+    table = cls()
+    for k, v in zip(keys, values):
+        table.insert(k, v)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table, used
+
+
+def run_table_comparison(sizes=(1_000_000,), out_csv='results_hash_tables.csv'):
+    """Compare HashTable (chaining) and OpenAddressingHashTable at large n.
+
+    Reports memory per key (tracemalloc, keys and values excluded since both
+    tables share the same objects) and insert/search/delete throughput.
+    """
+    rows = []
+    for n in sizes:
+        keys = [f'key{i}' for i in range(n)]
+        values = list(range(n))
+        for cls in (HashTable, OpenAddressingHashTable):
+            _, used = _table_footprint(cls, keys, values)
+
+            ht = cls()
+            start = time.perf_counter()
+            for k, v in zip(keys, values):
+                ht.insert(k, v)
+            t_ins = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for k in keys:
+                ht.search(k)
+            t_search = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for k in keys:
+                ht.delete(k)
+            t_del = time.perf_counter() - start
+
+            row = {
+                'n': n,
+                'table': cls.__name__,
+                'bytes_per_key': used / n,
+                'ins_ops': n / t_ins,
+                'search_ops': n / t_search,
+                'del_ops': n / t_del,
+            }
+            print(f"n={n} {row['table']:<24} bytes/key={row['bytes_per_key']:.1f} "
+                  f"ins={row['ins_ops']:.0f}/s search={row['search_ops']:.0f}/s del={row['del_ops']:.0f}/s")
+            rows.append(row)
+
+    with open(out_csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['n', 'table', 'bytes_per_key', 'ins_ops', 'search_ops', 'del_ops'])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+    return out_csv
+
+
+def _percentile(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+def run_latency_bench(n=200_000, out_csv='results_hash_latency.csv'):
+    """Per-insert latency of HashTable with stop-the-world vs incremental resizing.
+
+    Times every insert with perf_counter_ns, prints p50/p99/max per mode and
+    writes a log2-binned latency histogram (bin = [2^k, 2^(k+1)) ns) to CSV.
+    """
+    keys = [f'key{i}' for i in range(n)]
+    rows = []
+    # collector pauses would otherwise show up as (unrelated) tail latency
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    for incremental in (False, True):
+        mode = 'incremental' if incremental else 'stop_the_world'
+        ht = HashTable(size=5, incremental=incremental)
+        lat = [0] * n
+        clock = time.perf_counter_ns
+        for i, k in enumerate(keys):
+            start = clock()
+            ht.insert(k, i)
+            lat[i] = clock() - start
+        lat.sort()
+        print(f"{mode:<15} p50={_percentile(lat, 0.50)}ns p99={_percentile(lat, 0.99)}ns "
+              f"max={lat[-1]}ns")
+
+        hist = {}
+        for ns in lat:
+            b = max(ns, 1).bit_length() - 1
+            hist[b] = hist.get(b, 0) + 1
+        for b in sorted(hist):
+            rows.append({'mode': mode, 'bin_lo_ns': 1 << b, 'bin_hi_ns': 1 << (b + 1), 'count': hist[b]})
+    if gc_was_enabled:
+        gc.enable()
+
+    with open(out_csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['mode', 'bin_lo_ns', 'bin_hi_ns', 'count'])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+    return out_csv
+
+
+def run_hash_mode_bench(n=200_000, trials=3, out_csv='results_hash_modes.csv'):
+    """Insert/search throughput of each HashTable hash_mode for string and int keys.
+
+    Tables start at the default size, so the insert timings include every
+    resize on the way to n keys. The collector is paused while timing.
+    """
+    key_sets = {
+        'str': [f'key{i}' for i in range(n)],
+        'int': random.sample(range(1 << 40), n),
+    }
+    rows = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    for key_type, keys in key_sets.items():
+        for mode in HASH_MODES:
+            ins_times = []
+            search_times = []
+            for _ in range(trials):
+                ht = HashTable(hash_mode=mode)
+                start = time.perf_counter()
+                for i, k in enumerate(keys):
+                    ht.insert(k, i)
+                ins_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for k in keys:
+                    ht.search(k)
+                search_times.append(time.perf_counter() - start)
+
+            row = {
+                'n': n,
+                'keys': key_type,
+                'hash_mode': mode,
+                'ins_ops': n / min(ins_times),
+                'search_ops': n / min(search_times),
+            }
+            print(f"{key_type:<4} {mode:<15} ins={row['ins_ops']:.0f}/s search={row['search_ops']:.0f}/s")
+            rows.append(row)
+    if gc_was_enabled:
+        gc.enable()
+
+    with open(out_csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['n', 'keys', 'hash_mode', 'ins_ops', 'search_ops'])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+    return out_csv
 
 
 def _demo(n=2000):
@@ -112,32 +910,69 @@ def _demo(n=2000):
 
 
 if __name__ == "__main__":
+    # The shared benchmark results store lives in Assignment-4.
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Assignment-4'))
+    from results_store import ResultsStore, code_hash, input_hash
+
     _demo()
 
-    def run_hash_bench(sizes=(1000, 2000, 5000, 10000), trials=5, out_csv='results_hashing.csv'):
+    def _hash_trial(n, keys, items, del_keys):
+        """One trial of the per-key and bulk workloads; returns the six timings."""
+        ht = HashTable(size=5)
+        # inserts
+        start = time.perf_counter()
+        for i in range(n):
+            ht.insert(f'key{i}', i)
+        t_ins = time.perf_counter() - start
+
+        # searches
+        start = time.perf_counter()
+        _ = all(ht.search(f'key{i}') == i for i in range(n))
+        t_search = time.perf_counter() - start
+
+        # deletes every 10th
+        start = time.perf_counter()
+        for i in range(0, n, 10):
+            ht.delete(f'key{i}')
+        t_del = time.perf_counter() - start
+
+        # same workload through the bulk API
+        start = time.perf_counter()
+        ht = HashTable.from_items(items)
+        t_bulk_ins = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _ = ht.search_many(keys)
+        t_bulk_search = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ht.delete_many(del_keys)
+        t_bulk_del = time.perf_counter() - start
+        return [t_ins, t_search, t_del, t_bulk_ins, t_bulk_search, t_bulk_del]
+
+    def run_hash_bench(sizes=(1000, 2000, 5000, 10000), trials=5, out_csv='results_hashing.csv', store=None):
+        # with a ResultsStore, (n, trial) cells measured with the same code are not re-run
+        code = code_hash(HashTable.__module__)
         rows = []
         for n in sizes:
             ins_times = []
             search_times = []
             del_times = []
+            bulk_ins_times = []
+            bulk_search_times = []
+            bulk_del_times = []
+            keys = [f'key{i}' for i in range(n)]
+            items = list(zip(keys, range(n)))
+            del_keys = keys[::10]
             for t in range(trials):
-                ht = HashTable(size=5)
-                # inserts
-                start = time.perf_counter()
-                for i in range(n):
-                    ht.insert(f'key{i}', i)
-                ins_times.append(time.perf_counter() - start)
-
-                # searches
-                start = time.perf_counter()
-                _ = all(ht.search(f'key{i}') == i for i in range(n))
-                search_times.append(time.perf_counter() - start)
-
-                # deletes every 10th
-                start = time.perf_counter()
-                for i in range(0, n, 10):
-                    ht.delete(f'key{i}')
-                del_times.append(time.perf_counter() - start)
+                run = lambda: _hash_trial(n, keys, items, del_keys)
+                if store is None:
+                    times = run()
+                else:
+                    times = store.measure('hash_table_ops', {'n': n, 'trial': t}, input_hash(keys), code, run)
+                for acc, x in zip((ins_times, search_times, del_times,
+                                   bulk_ins_times, bulk_search_times, bulk_del_times), times):
+                    acc.append(x)
 
             row = {
                 'n': n,
@@ -147,12 +982,19 @@ if __name__ == "__main__":
                 'ins_times': ';'.join(f"{x:.6f}" for x in ins_times),
                 'search_times': ';'.join(f"{x:.6f}" for x in search_times),
                 'del_times': ';'.join(f"{x:.6f}" for x in del_times),
+                'bulk_ins_mean': sum(bulk_ins_times) / len(bulk_ins_times),
+                'bulk_search_mean': sum(bulk_search_times) / len(bulk_search_times),
+                'bulk_del_mean': sum(bulk_del_times) / len(bulk_del_times),
             }
             print(f"n={n} ins={row['ins_mean']:.6f}s search={row['search_mean']:.6f}s del={row['del_mean']:.6f}s")
+            print(f"n={n} bulk speedup: ins x{row['ins_mean'] / row['bulk_ins_mean']:.2f} "
+                  f"search x{row['search_mean'] / row['bulk_search_mean']:.2f} "
+                  f"del x{row['del_mean'] / row['bulk_del_mean']:.2f}")
             rows.append(row)
 
         with open(out_csv, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['n', 'ins_mean', 'search_mean', 'del_mean', 'ins_times', 'search_times', 'del_times'])
+            writer = csv.DictWriter(f, fieldnames=['n', 'ins_mean', 'search_mean', 'del_mean', 'ins_times', 'search_times', 'del_times',
+                                                   'bulk_ins_mean', 'bulk_search_mean', 'bulk_del_mean'])
             writer.writeheader()
             for r in rows:
                 writer.writerow(r)
@@ -206,8 +1048,22 @@ if __name__ == "__main__":
 
     # run benchmark and plotting
     try:
-        csv_path = run_hash_bench()
+        with ResultsStore() as store:
+            csv_path = run_hash_bench(store=store)
         rows = _read_hash_results(csv_path)
         _plot_hash_results(rows)
     except Exception as e:
-        print('Hash benchmark/plotting skipped:', e)
\ No newline at end of file
+        print('Hash benchmark/plotting skipped:', e)
+
+    # chaining vs open addressing at 1M keys: `python hashing.py --compare`
+    if '--compare' in sys.argv:
+        run_table_comparison()
+    # per-insert latency, stop-the-world vs incremental resize: `python hashing.py --latency`
+    if '--latency' in sys.argv:
+        run_latency_bench()
+    # universal vs mersenne vs multiply-shift hashing: `python hashing.py --hash-modes`
+    if '--hash-modes' in sys.argv:
+        run_hash_mode_bench()
+    # lock-striped vs global-lock table under threads: `python hashing.py --concurrency`
+    if '--concurrency' in sys.argv:
+        run_concurrency_bench()
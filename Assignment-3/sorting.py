@@ -9,10 +9,39 @@ import matplotlib.pyplot as plt
 
 sys.setrecursionlimit(1000000)
 
+# The shared introsort engine lives next to heapsort in Assignment-4.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Assignment-4'))
+from introsort import introsort
+from vectorized import try_vectorized, vectorized_quicksort
+from results_store import ResultsStore, code_hash, input_hash
 
-def randomized_quicksort(arr):
+
+def randomized_quicksort(arr, vectorize=True):
     """Randomized quicksort returning a new sorted list.
 
+    Runs the in-place introsort engine with a uniformly random pivot, so it
+    needs no deep recursion and falls back to heapsort on unlucky splits.
+    Homogeneous int/float input uses the NumPy path unless vectorize=False.
+    """
+    if vectorize:
+        result = try_vectorized(vectorized_quicksort, arr, pivot='random')
+        if result is not None:
+            return result
+    return introsort(list(arr), pivot='random')
+
+
+def deterministic_quicksort(arr):
+    """Deterministic quicksort using the first element as pivot.
+
+    Returns a new sorted list; the introsort depth limit keeps sorted input
+    at O(n log n) instead of O(n^2).
+    """
+    return introsort(list(arr), pivot='first')
+
+
+def randomized_quicksort_recursive(arr):
+    """Recursive randomized quicksort returning a new sorted list.
+
     Pivot is chosen uniformly at random from the array slice.
     Handles empty arrays, repeated elements, and already-sorted inputs.
     """
@@ -25,11 +54,11 @@ def randomized_quicksort(arr):
     left = [x for i, x in enumerate(arr) if x < pivot or (x == pivot and i < pivot_idx)]
     right = [x for i, x in enumerate(arr) if x > pivot or (x == pivot and i > pivot_idx)]
 
-    return randomized_quicksort(left) + [pivot] + randomized_quicksort(right)
+    return randomized_quicksort_recursive(left) + [pivot] + randomized_quicksort_recursive(right)
 
 
-def deterministic_quicksort(arr):
-    """Deterministic quicksort using the first element as pivot.
+def deterministic_quicksort_recursive(arr):
+    """Recursive deterministic quicksort using the first element as pivot.
 
     Returns a new sorted list; useful for comparing pivot strategies.
     """
@@ -41,10 +70,15 @@ def deterministic_quicksort(arr):
     equal = [x for x in arr if x == pivot]
     right = [x for x in arr[1:] if x > pivot]
 
-    return deterministic_quicksort(left) + equal + deterministic_quicksort(right)
+    return deterministic_quicksort_recursive(left) + equal + deterministic_quicksort_recursive(right)
 
 
-__all__ = ["randomized_quicksort", "deterministic_quicksort"]
+__all__ = [
+    "randomized_quicksort",
+    "deterministic_quicksort",
+    "randomized_quicksort_recursive",
+    "deterministic_quicksort_recursive",
+]
 
 
 # ---- Benchmarking utilities (run only when executed as a script) ----
@@ -67,18 +101,32 @@ def time_sort(fn, arr):
     return end - start
 
 
-def run_bench(sizes, distributions, trials=3, out_csv='results_sorting.csv'):
+def run_bench(sizes, distributions, trials=3, out_csv='results_sorting.csv', store=None):
+    """Time both quicksorts per (n, distribution, trial) and write out_csv.
+
+    Inputs are seeded per cell so they are reproducible. With a ResultsStore,
+    cells already measured with the same input and code are read from it.
+    """
+    code = {fn: code_hash(fn, time_sort, 'introsort', 'vectorized')
+            for fn in (randomized_quicksort, deterministic_quicksort)}
+
+    def timed(fn, arr, params):
+        run = lambda: time_sort(fn, list(arr))
+        if store is None:
+            return run()
+        return store.measure(fn.__name__, params, input_hash(arr), code[fn], run)
+
     rows = []
     for n in sizes:
         for dist in distributions:
             times_r = []
             times_d = []
             for t in range(trials):
+                random.seed(f'{dist}-{n}-{t}')
                 arr = generate_array(n, dist)
-                a1 = list(arr)
-                a2 = list(arr)
-                t_r = time_sort(randomized_quicksort, a1)
-                t_d = time_sort(deterministic_quicksort, a2)
+                params = {'n': n, 'distribution': dist, 'trial': t}
+                t_r = timed(randomized_quicksort, arr, params)
+                t_d = timed(deterministic_quicksort, arr, params)
                 times_r.append(t_r)
                 times_d.append(t_d)
             row = {
@@ -182,7 +230,8 @@ if __name__ == '__main__':
     sizes = [1000, 2000, 5000, 10000]
     distributions = ['random', 'sorted', 'reversed', 'repeated']
     out_csv = 'results_sorting.csv'
-    run_bench(sizes, distributions, trials=5, out_csv=out_csv)
+    with ResultsStore() as store:
+        run_bench(sizes, distributions, trials=5, out_csv=out_csv, store=store)
     print('Benchmark complete. Results saved to', out_csv)
 
     # generate plots from the produced CSV
@@ -6,25 +6,39 @@ import random
 import time
 import csv
 import sys
-from heapsort import heapsort
+import tracemalloc
+from heapsort import heapsort, heapsort_bottom_up
+from introsort import introsort
+from natural_mergesort import natural_merge_sort
+from vectorized import HAVE_NUMPY
+from priority_queue import Task, SlotTask, TaskStore, MaxHeap, DaryHeap
+from results_store import ResultsStore, code_hash, input_hash
 
 
 def quicksort(arr):
+    return introsort(list(arr))
+
+
+def quicksort_recursive(arr):
     if len(arr) <= 1:
         return arr[:]
     pivot = arr[len(arr) // 2]
     left = [x for x in arr if x < pivot]
     middle = [x for x in arr if x == pivot]
     right = [x for x in arr if x > pivot]
-    return quicksort(left) + middle + quicksort(right)
+    return quicksort_recursive(left) + middle + quicksort_recursive(right)
 
 
 def mergesort(arr):
+    return natural_merge_sort(list(arr))
+
+
+def mergesort_recursive(arr):
     if len(arr) <= 1:
         return arr[:]
     mid = len(arr) // 2
-    left = mergesort(arr[:mid])
-    right = mergesort(arr[mid:])
+    left = mergesort_recursive(arr[:mid])
+    right = mergesort_recursive(arr[mid:])
     res = []
     i = j = 0
     while i < len(left) and j < len(right):
@@ -38,16 +52,259 @@ def mergesort(arr):
 
 def time_fn(fn, data):
     start = time.perf_counter()
-    fn(list(data))
+    fn(data.copy())
+    return time.perf_counter() - start
+
+
+def peak_memory(fn, data):
+    """Return (elapsed seconds, peak bytes allocated) for one call of `fn`."""
+    data = list(data)
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_memory_benchmarks(sizes=(1000, 10000), trials=3):
+    """Compare time and peak memory of the introsort engine and the bottom-up
+    merge sort against the recursive versions they replace. Note that tracemalloc slows
+    every allocation, so times here are only comparable with each other."""
+    algos = {
+        "introsort": quicksort,
+        "quicksort_recursive": quicksort_recursive,
+        "mergesort": mergesort,
+        "mergesort_recursive": mergesort_recursive,
+        "heapsort": heapsort,
+        "py_sorted": sorted,
+    }
+    kinds = ["random", "sorted", "reversed"]
+    rows = []
+    for n in sizes:
+        for kind in kinds:
+            if kind == "random":
+                data = [random.randint(0, n) for _ in range(n)]
+            elif kind == "sorted":
+                data = list(range(n))
+            else:
+                data = list(range(n, 0, -1))
+            for name, fn in algos.items():
+                times = []
+                peaks = []
+                for _ in range(trials):
+                    t, peak = peak_memory(fn, data)
+                    times.append(t)
+                    peaks.append(peak)
+                row = {"n": n, "kind": kind, "algo": name,
+                       "time": sum(times) / trials, "peak_kib": max(peaks) / 1024}
+                print(f"n={n} kind={kind} {name:<20} time={row['time']:.6f}s peak={row['peak_kib']:.1f}KiB")
+                rows.append(row)
+
+    with open("introsort_benchmarks.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["n", "kind", "algo", "time", "peak_kib"])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+
+def run_vectorized_benchmarks(sizes=(100000, 1000000), trials=3):
+    """Compare heapsort on its pure-Python path against the NumPy path for
+    int64 and float64 data given as lists and as NumPy arrays."""
+    if not HAVE_NUMPY:
+        print("NumPy is not installed; only the pure-Python path is available.")
+        return
+    import numpy as np
+
+    rows = []
+    for n in sizes:
+        inputs = {
+            "int_list": [random.randint(0, 10**9) for _ in range(n)],
+            "float_list": [random.random() for _ in range(n)],
+        }
+        inputs["int_ndarray"] = np.array(inputs["int_list"], dtype=np.int64)
+        inputs["float_ndarray"] = np.array(inputs["float_list"], dtype=np.float64)
+        for kind, data in inputs.items():
+            py = [time_fn(lambda a: heapsort(a, vectorize=False), data) for _ in range(trials)]
+            vec = [time_fn(heapsort, data) for _ in range(trials)]
+            row = {"n": n, "kind": kind, "heapsort_py": sum(py) / trials, "heapsort_np": sum(vec) / trials}
+            print(f"n={n} kind={kind} ->", row)
+            rows.append(row)
+
+    with open("vectorized_benchmarks.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["n", "kind", "heapsort_py", "heapsort_np"])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+
+def heap_workload(make_heap, tasks, updates):
+    """Insert every task, apply the priority updates, then drain the heap."""
+    heap = make_heap()
+    start = time.perf_counter()
+    for t in tasks:
+        heap.insert(t)
+    for tid, p in updates:
+        heap.increase_key(tid, p)
+    while not heap.is_empty():
+        heap.extract_max()
     return time.perf_counter() - start
 
 
-def run_benchmarks(sizes=(100, 500), trials=3):
+def run_heap_benchmarks(sizes=(100000, 1000000), trials=3):
+    """Compare the binary MaxHeap against DaryHeap for several arities on
+    insert / increase_key / extract_max over dense task ids."""
+    heaps = {
+        "binary_maxheap": MaxHeap,
+        "dary_2": lambda: DaryHeap(2),
+        "dary_4": lambda: DaryHeap(4),
+        "dary_8": lambda: DaryHeap(8),
+    }
+    rows = []
+    for n in sizes:
+        prios = [random.randint(0, 10**6) for _ in range(n)]
+        updates = [(random.randrange(n), random.randint(0, 10**6)) for _ in range(n // 4)]
+        row = {"n": n}
+        for name, make in heaps.items():
+            times = [heap_workload(make, [Task(i, p) for i, p in enumerate(prios)], updates)
+                     for _ in range(trials)]
+            row[name] = sum(times) / trials
+        print(f"n={n} ->", row)
+        rows.append(row)
+
+    with open("heap_benchmarks.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["n", *heaps])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+
+def queued_task_memory(fill, n):
+    """Return (retained, peak) bytes per task for a heap built by `fill(n)`."""
+    tracemalloc.start()
+    heap = fill(n)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del heap
+    return current / n, peak / n
+
+
+def run_task_memory_benchmark(sizes=(1000000,)):
+    """Measure memory per queued task (tracemalloc) for dataclass Tasks,
+    SlotTasks and a TaskStore whose heap entries are row indices."""
+    def fill_objects(make_heap, cls):
+        def fill(n):
+            heap = make_heap()
+            rng = random.Random(0)
+            heap.insert_many(cls(i, rng.randint(1, 100), i * 0.5, i * 0.5 + 10.0) for i in range(n))
+            return heap
+        return fill
+
+    def fill_store(n):
+        store = TaskStore()
+        heap = DaryHeap(store=store)
+        rng = random.Random(0)
+        heap.insert_many(store.append(i, rng.randint(1, 100), i * 0.5, i * 0.5 + 10.0) for i in range(n))
+        return heap, store
+
+    variants = {
+        "maxheap_task": fill_objects(MaxHeap, Task),
+        "maxheap_slottask": fill_objects(MaxHeap, SlotTask),
+        "daryheap_slottask": fill_objects(DaryHeap, SlotTask),
+        "daryheap_taskstore": fill_store,
+    }
+    rows = []
+    for n in sizes:
+        base = None
+        for name, fill in variants.items():
+            per_task, peak = queued_task_memory(fill, n)
+            base = base or per_task
+            row = {"n": n, "variant": name, "bytes_per_task": per_task,
+                   "peak_bytes_per_task": peak, "reduction": base / per_task}
+            print(f"n={n} {name:<20} {per_task:7.1f} B/task retained, {peak:7.1f} B/task peak, "
+                  f"{row['reduction']:.1f}x smaller")
+            rows.append(row)
+
+    with open("task_memory_benchmarks.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["n", "variant", "bytes_per_task", "peak_bytes_per_task", "reduction"])
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+
+class _Counted:
+    """Wraps a value and counts every comparison made on it."""
+    __slots__ = ("v",)
+    count = 0
+
+    def __init__(self, v):
+        self.v = v
+
+    def __lt__(self, other):
+        _Counted.count += 1
+        return self.v < other.v
+
+    def __gt__(self, other):
+        _Counted.count += 1
+        return self.v > other.v
+
+
+def run_comparison_counts(sizes=(1000, 10000)):
+    """Count element comparisons of the recursive heapsort against the
+    bottom-up heapsort (binary and 4-ary) on random input."""
+    algos = {
+        "heapsort": lambda a: heapsort(a, vectorize=False),
+        "heapsort_bottom_up": heapsort_bottom_up,
+        "heapsort_bottom_up_4ary": lambda a: heapsort_bottom_up(a, d=4),
+    }
+    for n in sizes:
+        data = [_Counted(random.random()) for _ in range(n)]
+        counts = {}
+        for name, fn in algos.items():
+            _Counted.count = 0
+            fn(data)
+            counts[name] = _Counted.count
+        print(f"n={n} comparisons ->", counts)
+
+
+SORTING_ALGOS = {
+    "heapsort": heapsort,
+    "heapsort_bottom_up": heapsort_bottom_up,
+    "quicksort": quicksort,
+    "mergesort": mergesort,
+    "py_sorted": sorted,
+}
+# source each series depends on, for the results-store code hash
+SORTING_CODE = {
+    "heapsort": ("heapsort",),
+    "heapsort_bottom_up": ("heapsort",),
+    "quicksort": (quicksort, "introsort"),
+    "mergesort": (mergesort, "natural_mergesort"),
+    "py_sorted": (sorted,),
+}
+
+
+def sorting_code_hashes():
+    """Current code_hash of every SORTING_CODE series, as run_benchmarks stores it."""
+    return {name: code_hash(time_fn, *deps) for name, deps in SORTING_CODE.items()}
+
+
+def run_benchmarks(sizes=(100, 500), trials=3, store=None):
+    """Time every SORTING_ALGOS series per (n, kind, trial).
+
+    Inputs are seeded per cell so they are reproducible; with a ResultsStore,
+    cells already measured with the same input and code are read from it,
+    so an interrupted sweep resumes and plot_benchmarks.py --store can plot
+    without re-running anything.
+    """
     kinds = ["random", "sorted", "reversed"]
+    code = sorting_code_hashes()
     rows = []
     for n in sizes:
         for kind in kinds:
             for t in range(trials):
+                random.seed(f"{kind}-{n}-{t}")
                 if kind == "random":
                     data = [random.randint(0, n) for _ in range(n)]
                 elif kind == "sorted":
@@ -55,16 +312,20 @@ def run_benchmarks(sizes=(100, 500), trials=3):
                 else:
                     data = list(range(n, 0, -1))
 
-                times = {"n": n, "kind": kind, "trial": t}
-                times["heapsort"] = time_fn(heapsort, data)
-                times["quicksort"] = time_fn(quicksort, data)
-                times["mergesort"] = time_fn(mergesort, data)
-                times["py_sorted"] = time_fn(sorted, data)
+                params = {"n": n, "kind": kind, "trial": t}
+                times = dict(params)
+                inp = input_hash(data) if store is not None else None
+                for name, fn in SORTING_ALGOS.items():
+                    if store is None:
+                        times[name] = time_fn(fn, data)
+                    else:
+                        times[name] = store.measure(name, params, inp, code[name],
+                                                    lambda fn=fn: time_fn(fn, data))
                 print(f"n={n} kind={kind} trial={t} ->", times)
                 rows.append(times)
 
     with open("sorting_benchmarks.csv", "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["n", "kind", "trial", "heapsort", "quicksort", "mergesort", "py_sorted"])
+        writer = csv.DictWriter(f, fieldnames=["n", "kind", "trial", *SORTING_ALGOS])
         writer.writeheader()
         for r in rows:
             writer.writerow(r)
@@ -72,8 +333,26 @@ def run_benchmarks(sizes=(100, 500), trials=3):
 
 if __name__ == "__main__":
     # allow sizes override via CLI: e.g. `python benchmarks.py 100 500`
-    if len(sys.argv) >= 3:
-        sizes = tuple(int(x) for x in sys.argv[1:])
+    # add `--memory` to compare peak memory of introsort/mergesort vs the recursive versions
+    # add `--vectorized` to compare the pure-Python and NumPy heapsort paths
+    # add `--heap` to compare MaxHeap against the indexed d-ary DaryHeap
+    # add `--task-memory` to measure bytes per queued Task / SlotTask / TaskStore row
+    # add `--comparisons` to count comparisons of the recursive vs bottom-up heapsort
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) >= 2:
+        sizes = tuple(int(x) for x in args)
     else:
         sizes = (100, 500)
-    run_benchmarks(sizes=sizes)
+    if "--memory" in sys.argv:
+        run_memory_benchmarks(sizes=sizes)
+    elif "--vectorized" in sys.argv:
+        run_vectorized_benchmarks(sizes=sizes)
+    elif "--heap" in sys.argv:
+        run_heap_benchmarks(sizes=sizes)
+    elif "--comparisons" in sys.argv:
+        run_comparison_counts(sizes=sizes)
+    elif "--task-memory" in sys.argv:
+        run_task_memory_benchmark(sizes=tuple(int(x) for x in args) if args else (1000000,))
+    else:
+        with ResultsStore() as store:
+            run_benchmarks(sizes=sizes, store=store)
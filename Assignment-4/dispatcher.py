@@ -0,0 +1,234 @@
+"""asyncio priority dispatcher built on MaxHeap.
+
+Producers `await submit(task)`; `workers` coroutines repeatedly take the
+highest-priority queued task and await `handler(task)`. Queued tasks can be
+re-prioritized with increase_key or cancelled, tasks whose deadline has
+passed by dispatch time are dropped, and `maxsize` bounds the queue so
+submit() waits when it is full (backpressure).
+
+Usage: `python dispatcher.py [num_tasks] [workers] [maxsize]`
+"""
+import asyncio
+import collections
+import random
+import sys
+import time
+from typing import Awaitable, Callable
+
+from priority_queue import Task, MaxHeap
+
+LATENCY_WINDOW = 100_000    # queue latencies kept for stats(): the most recent dispatches
+
+
+class AsyncPriorityDispatcher:
+    """Dispatch Tasks to async workers in priority order.
+
+    Deadlines are compared with `clock()` (time.monotonic by default) at
+    dispatch time. Must be used from a single event loop; heap operations
+    never await, so no lock is needed. stats() reports latencies over the
+    last LATENCY_WINDOW dispatches.
+    """
+
+    def __init__(self, handler: Callable[[Task], Awaitable], workers: int = 4,
+                 maxsize: int = 0, clock: Callable[[], float] = time.monotonic):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.handler = handler
+        self.num_workers = workers
+        self.maxsize = maxsize
+        self._clock = clock
+        self._heap = MaxHeap()
+        self._enqueued: dict = {}           # task_id -> submit time
+        self._getters: collections.deque = collections.deque()
+        self._putters: collections.deque = collections.deque()
+        self._workers: list = []
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self.submitted = self.completed = self.dropped = self.failed = self.cancelled = 0
+        # enqueue -> dispatch, seconds; bounded so a long-lived dispatcher does not grow
+        self.latencies: collections.deque = collections.deque(maxlen=LATENCY_WINDOW)
+
+    # ── lifecycle ────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the worker coroutines on the running loop."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.num_workers)]
+
+    async def join(self) -> None:
+        """Wait until every submitted task has been handled or dropped."""
+        await self._idle.wait()
+
+    async def close(self) -> None:
+        """Drain the queue, then stop the workers and fail waiting producers."""
+        await self.join()
+        self._closed = True
+        while self._getters:
+            self._wake(self._getters)
+        while self._putters:
+            self._wake(self._putters)
+        await asyncio.gather(*self._workers)
+        self._workers = []
+
+    async def __aenter__(self) -> "AsyncPriorityDispatcher":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # ── producer side ────────────────────────────────────────
+
+    def qsize(self) -> int:
+        return len(self._heap.heap)
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+
+    async def submit(self, task: Task) -> None:
+        """Queue a task, waiting while the queue is at `maxsize`."""
+        if self._closed:
+            raise RuntimeError("dispatcher is closed")
+        while self.full():
+            fut = asyncio.get_running_loop().create_future()
+            self._putters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                fut.cancel()
+                if not self.full():
+                    self._wake(self._putters)     # pass the slot on
+                raise
+            if self._closed:
+                raise RuntimeError("dispatcher is closed")
+        if task.task_id in self._enqueued:
+            raise ValueError(f"task {task.task_id} is already queued")
+        self._heap.insert(task)
+        self._enqueued[task.task_id] = self._clock()
+        self.submitted += 1
+        self._unfinished += 1
+        self._idle.clear()
+        self._wake(self._getters)
+
+    def increase_key(self, task_id: int, new_priority: int) -> bool:
+        """Change the priority of a queued task; False if it is not queued."""
+        return self._heap.increase_key(task_id, new_priority)
+
+    def cancel(self, task_id: int) -> bool:
+        """Remove a queued task; False if it is not queued."""
+        if not self._heap.remove(task_id):
+            return False
+        del self._enqueued[task_id]
+        self.cancelled += 1
+        self._wake(self._putters)
+        self._task_done()
+        return True
+
+    # ── worker side ──────────────────────────────────────────
+
+    @staticmethod
+    def _wake(waiters: collections.deque) -> None:
+        while waiters:
+            fut = waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+    def _task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            while self._heap.is_empty():
+                if self._closed:
+                    return
+                fut = loop.create_future()
+                self._getters.append(fut)
+                await fut
+            task = self._heap.extract_max()
+            now = self._clock()
+            self.latencies.append(now - self._enqueued.pop(task.task_id))
+            self._wake(self._putters)
+            try:
+                if task.deadline is not None and now > task.deadline:
+                    self.dropped += 1
+                else:
+                    try:
+                        await self.handler(task)
+                        self.completed += 1
+                    except Exception:
+                        self.failed += 1
+            finally:
+                # also when the handler or the worker is cancelled, or join() never returns
+                self._task_done()
+
+    def stats(self) -> dict:
+        lat = sorted(self.latencies)
+
+        def pct(q: float) -> float:
+            return lat[min(len(lat) - 1, int(q / 100 * len(lat)))] if lat else 0.0
+
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "p50_latency_ms": pct(50) * 1e3,
+            "p99_latency_ms": pct(99) * 1e3,
+            "max_latency_ms": (lat[-1] if lat else 0.0) * 1e3,
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Benchmark
+# ─────────────────────────────────────────────────────────────
+
+async def _stand_in_work(task: Task) -> None:
+    # a request that yields to the loop once, like a fast non-blocking I/O call
+    await asyncio.sleep(0)
+
+
+async def run_dispatch_benchmark(num_tasks: int = 100_000, workers: int = 8, maxsize: int = 1000,
+                                 bump_rate: float = 0.01, seed: int = 1) -> dict:
+    """Submit `num_tasks` tasks from as many concurrent producers, bump the
+    priority of a `bump_rate` fraction while they are queued, and report
+    throughput and queue latency (enqueue -> dispatch; time spent blocked
+    by backpressure is not included). One task in ten gets a deadline
+    within 0.5 s of the start, so those still queued by then are dropped."""
+    rng = random.Random(seed)
+    dispatcher = AsyncPriorityDispatcher(_stand_in_work, workers, maxsize)
+    t0 = time.monotonic()
+    tasks = [Task(i, rng.randint(1, 100),
+                  deadline=t0 + rng.uniform(0.0, 0.5) if rng.random() < 0.1 else None)
+             for i in range(num_tasks)]
+
+    async def bump() -> int:
+        bumped = 0
+        for _ in range(int(num_tasks * bump_rate)):
+            await asyncio.sleep(0)
+            bumped += dispatcher.increase_key(rng.randrange(num_tasks), 1000)
+        return bumped
+
+    start = time.perf_counter()
+    async with dispatcher:
+        producers = asyncio.gather(*(dispatcher.submit(t) for t in tasks))
+        bumped = await bump()
+        await producers
+    elapsed = time.perf_counter() - start
+    res = dispatcher.stats()
+    res.update(workers=workers, maxsize=maxsize, bumped=bumped,
+               elapsed_s=elapsed, throughput=num_tasks / elapsed)
+    return res
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    w = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    m = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    print(asyncio.run(run_dispatch_benchmark(n, w, m)))
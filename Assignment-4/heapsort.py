@@ -2,45 +2,158 @@
 
 Functions:
  - heapsort(iterable): returns a new list sorted in ascending order.
+ - heapsort_range(arr, lo, hi): sorts arr[lo:hi] in place (used by introsort).
+ - heapsort_bottom_up(iterable, key=None, reverse=False, d=2): iterative
+   d-ary heapsort with bottom-up sift-down and a sorted()-style interface.
 """
-from typing import List, Iterable
+from typing import Any, Callable, List, Iterable, Optional
 
+from vectorized import try_vectorized, vectorized_heapsort
 
-def _heapify(arr: List, n: int, i: int) -> None:
+
+def _heapify(arr: List, n: int, i: int, lo: int = 0) -> None:
+    # `lo` offsets the heap so a subrange arr[lo:lo + n] can be heapified.
     largest = i
     l = 2 * i + 1
     r = 2 * i + 2
 
-    if l < n and arr[l] > arr[largest]:
+    if l < n and arr[lo + l] > arr[lo + largest]:
         largest = l
-    if r < n and arr[r] > arr[largest]:
+    if r < n and arr[lo + r] > arr[lo + largest]:
         largest = r
     if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]
-        _heapify(arr, n, largest)
+        arr[lo + i], arr[lo + largest] = arr[lo + largest], arr[lo + i]
+        _heapify(arr, n, largest, lo)
 
 
-def _build_max_heap(arr: List) -> None:
-    n = len(arr)
+def _build_max_heap(arr: List, lo: int = 0, n: int = None) -> None:
+    if n is None:
+        n = len(arr) - lo
     for i in range(n // 2 - 1, -1, -1):
-        _heapify(arr, n, i)
+        _heapify(arr, n, i, lo)
+
+
+def heapsort_range(arr: List, lo: int = 0, hi: int = None) -> None:
+    """Sort arr[lo:hi] ascending in place.
+
+    Time: O(n log n) worst case. Space: O(1) besides the O(log n) heapify stack.
+    """
+    if hi is None:
+        hi = len(arr)
+    n = hi - lo
+    if n <= 1:
+        return
+    _build_max_heap(arr, lo, n)
+    for i in range(n - 1, 0, -1):
+        arr[lo], arr[lo + i] = arr[lo + i], arr[lo]
+        _heapify(arr, i, 0, lo)
+
+
+def _sift_bottom_up(a: List, start: int, x: Any, end: int, d: int) -> None:
+    # Place x in the hole at `start` of the heap a[:end]. Instead of
+    # comparing x at every level, walk the hole down to a leaf along the
+    # larger children (one comparison per level when d == 2), then move x
+    # back up: it usually belongs near the bottom, so the climb is short.
+    i = start
+    while True:
+        c = d * i + 1
+        if c >= end:
+            break
+        if d == 2:
+            if c + 1 < end and a[c + 1] > a[c]:
+                c += 1
+        else:
+            for j in range(c + 1, min(c + d, end)):
+                if a[j] > a[c]:
+                    c = j
+        a[i] = a[c]
+        i = c
+    while i > start:
+        p = (i - 1) // d
+        if not a[p] < x:
+            break
+        a[i] = a[p]
+        i = p
+    a[i] = x
+
+
+def _sift_bottom_up_keyed(keys: List, vals: List, start: int, kx: Any, vx: Any, end: int, d: int) -> None:
+    # _sift_bottom_up on keys, moving vals alongside
+    i = start
+    while True:
+        c = d * i + 1
+        if c >= end:
+            break
+        if d == 2:
+            if c + 1 < end and keys[c + 1] > keys[c]:
+                c += 1
+        else:
+            for j in range(c + 1, min(c + d, end)):
+                if keys[j] > keys[c]:
+                    c = j
+        keys[i] = keys[c]
+        vals[i] = vals[c]
+        i = c
+    while i > start:
+        p = (i - 1) // d
+        if not keys[p] < kx:
+            break
+        keys[i] = keys[p]
+        vals[i] = vals[p]
+        i = p
+    keys[i] = kx
+    vals[i] = vx
 
 
-def heapsort(iterable: Iterable) -> List:
+def heapsort_bottom_up(iterable: Iterable, key: Optional[Callable] = None,
+                       reverse: bool = False, d: int = 2) -> List:
+    """Return a new sorted list using a non-recursive d-ary heapsort.
+
+    Sift-down is bottom-up (Floyd's trick): about n log2 n comparisons
+    instead of 2 n log2 n for the binary layout, and every level is a
+    single move rather than a swap. Larger `d` gives a shallower heap at
+    d-1 comparisons per level. `key` and `reverse` behave as in sorted(),
+    except that the sort is not stable.
+    Time: O(n log n) worst case. Space: O(n) for the output (plus the keys).
+    """
+    if d < 2:
+        raise ValueError("d must be at least 2")
+    arr = list(iterable)
+    n = len(arr)
+    if key is None:
+        for i in range((n - 2) // d, -1, -1):
+            _sift_bottom_up(arr, i, arr[i], n, d)
+        for end in range(n - 1, 0, -1):
+            x = arr[end]
+            arr[end] = arr[0]
+            _sift_bottom_up(arr, 0, x, end, d)
+    else:
+        keys = [key(x) for x in arr]
+        for i in range((n - 2) // d, -1, -1):
+            _sift_bottom_up_keyed(keys, arr, i, keys[i], arr[i], n, d)
+        for end in range(n - 1, 0, -1):
+            kx, vx = keys[end], arr[end]
+            keys[end], arr[end] = keys[0], arr[0]
+            _sift_bottom_up_keyed(keys, arr, 0, kx, vx, end, d)
+    if reverse:
+        arr.reverse()
+    return arr
+
+
+def heapsort(iterable: Iterable, vectorize: bool = True) -> List:
     """Return a new list containing the elements of `iterable` sorted ascending.
 
     This implementation builds a max-heap then repeatedly extracts the max.
+    Homogeneous int/float input (ndarray, array.array or a large list) is
+    sorted by NumPy's heapsort instead, unless `vectorize` is False.
     Time: O(n log n) worst/average/best. Space: O(n) for the output copy.
     """
+    if vectorize:
+        result = try_vectorized(vectorized_heapsort, iterable)
+        if result is not None:
+            return result
     arr = list(iterable)
-    n = len(arr)
-    if n <= 1:
-        return arr[:]
-
-    _build_max_heap(arr)
-    for i in range(n - 1, 0, -1):
-        arr[0], arr[i] = arr[i], arr[0]
-        _heapify(arr, i, 0)
+    heapsort_range(arr, 0, len(arr))
     return arr
 
 
@@ -49,3 +162,4 @@ if __name__ == "__main__":
     data = [random.randint(0, 1000) for _ in range(20)]
     print("input:", data)
     print("heapsort:", heapsort(data))
+    print("bottom-up, 4-ary, reverse:", heapsort_bottom_up(data, reverse=True, d=4))
@@ -0,0 +1,130 @@
+"""Introsort engine shared by the quicksort entry points across the assignments.
+
+In-place quicksort driven by an explicit stack instead of recursion. Ranges
+shorter than INSERTION_CUTOFF are finished with insertion sort, and a range
+that is still being partitioned after 2 * floor(log2 n) levels is handed to
+heapsort (`heapsort_range` from heapsort.py), so the worst case stays
+O(n log n) and the stack stays O(log n) whatever the input looks like.
+
+Functions:
+ - introsort(arr, lo=0, hi=None, pivot="ninther", rng=None): sorts arr[lo:hi] in place.
+"""
+import random
+from typing import List, Optional
+
+from heapsort import heapsort_range
+
+INSERTION_CUTOFF = 16
+NINTHER_THRESHOLD = 128
+
+PIVOT_STRATEGIES = ("first", "middle", "random", "median3", "ninther")
+
+
+def _insertion_sort(arr: List, lo: int, hi: int) -> None:
+    for j in range(lo + 1, hi):
+        key = arr[j]
+        i = j - 1
+        while i >= lo and arr[i] > key:
+            arr[i + 1] = arr[i]
+            i -= 1
+        arr[i + 1] = key
+
+
+def _sort3(arr: List, a: int, b: int, c: int) -> None:
+    """Order arr[a] <= arr[b] <= arr[c] in place."""
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+    if arr[c] < arr[b]:
+        arr[b], arr[c] = arr[c], arr[b]
+        if arr[b] < arr[a]:
+            arr[a], arr[b] = arr[b], arr[a]
+
+
+def _choose_pivot(arr: List, lo: int, hi: int, pivot: str, rng: random.Random) -> int:
+    if pivot == "first":
+        return lo
+    if pivot == "random":
+        return rng.randrange(lo, hi)
+    mid = lo + (hi - lo) // 2
+    if pivot == "middle":
+        return mid
+    last = hi - 1
+    # The samples are sorted in place rather than just compared: this breaks up
+    # patterns (e.g. reversed input) that would otherwise feed bad pivots to the
+    # next level.
+    _sort3(arr, lo, mid, last)
+    if pivot == "ninther" and hi - lo >= NINTHER_THRESHOLD:
+        # Tukey's ninther: median of the medians of three triples.
+        _sort3(arr, lo + 1, mid - 1, last - 1)
+        _sort3(arr, lo + 2, mid + 1, last - 2)
+        _sort3(arr, mid - 1, mid, mid + 1)
+    return mid
+
+
+def _partition(arr: List, lo: int, hi: int, p: int) -> int:
+    """Partition arr[lo:hi] around arr[p] and return the pivot's final index.
+
+    Both scans stop on keys equal to the pivot, so runs of duplicates are
+    split evenly instead of degrading to O(n^2).
+    """
+    arr[lo], arr[p] = arr[p], arr[lo]
+    pivot = arr[lo]
+    i = lo
+    j = hi
+    while True:
+        i += 1
+        while i < hi and arr[i] < pivot:
+            i += 1
+        j -= 1
+        while arr[j] > pivot:
+            j -= 1
+        if i >= j:
+            break
+        arr[i], arr[j] = arr[j], arr[i]
+    arr[lo], arr[j] = arr[j], arr[lo]
+    return j
+
+
+def introsort(arr: List, lo: int = 0, hi: Optional[int] = None, pivot: str = "ninther",
+              rng: Optional[random.Random] = None) -> List:
+    """Sort arr[lo:hi] ascending in place and return `arr` for convenience.
+
+    `pivot` is one of PIVOT_STRATEGIES; "ninther" falls back to median-of-three
+    on ranges shorter than NINTHER_THRESHOLD. `rng` is only used by "random".
+    Time: O(n log n) worst case. Space: O(log n) explicit stack.
+    """
+    if pivot not in PIVOT_STRATEGIES:
+        raise ValueError(f"unknown pivot strategy: {pivot!r}")
+    if hi is None:
+        hi = len(arr)
+    if hi - lo <= 1:
+        return arr
+    if rng is None:
+        rng = random
+
+    stack = [(lo, hi, 2 * ((hi - lo).bit_length() - 1))]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > INSERTION_CUTOFF:
+            if depth == 0:
+                heapsort_range(arr, lo, hi)
+                break
+            depth -= 1
+            p = _partition(arr, lo, hi, _choose_pivot(arr, lo, hi, pivot, rng))
+            # Defer the larger side and keep working on the smaller one,
+            # which bounds the stack at O(log n) entries.
+            if p - lo < hi - p - 1:
+                stack.append((p + 1, hi, depth))
+                hi = p
+            else:
+                stack.append((lo, p, depth))
+                lo = p + 1
+        else:
+            _insertion_sort(arr, lo, hi)
+    return arr
+
+
+if __name__ == "__main__":
+    data = [random.randint(0, 1000) for _ in range(20)]
+    print("input:", data)
+    print("introsort:", introsort(list(data)))
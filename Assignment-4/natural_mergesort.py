@@ -0,0 +1,197 @@
+"""Bottom-up natural merge sort with a single reusable buffer.
+
+Natural runs are found first (strictly descending runs are reversed in place,
+short runs are extended to MIN_RUN with binary insertion sort), then adjacent
+runs are merged in place pass by pass: the shorter run of each pair is copied
+to one auxiliary list of n // 2 slots and merged back, front to back or back
+to front as in Timsort. Sorted and reverse-sorted inputs are a single run
+and finish in O(n) without allocating the buffer. When one run wins
+MIN_GALLOP comparisons in a row the merge gallops: it binary-searches how far
+that run stays ahead and copies the whole block at once.
+
+Functions:
+ - natural_merge_sort(arr): sorts the list `arr` in place (stable) and returns it.
+"""
+from bisect import bisect_left, bisect_right
+from typing import List
+
+MIN_RUN = 32
+MIN_GALLOP = 7
+# Block copies go through slices of at most this many items, so the only
+# O(n) allocation is the merge buffer itself.
+COPY_CHUNK = 1024
+
+
+def _count_run(arr: List, lo: int, n: int) -> int:
+    """Return the end of the natural run starting at `lo`, made ascending."""
+    hi = lo + 1
+    if hi == n:
+        return hi
+    if arr[hi] < arr[lo]:
+        # Only strictly descending runs are reversed, which keeps the sort stable.
+        while hi + 1 < n and arr[hi + 1] < arr[hi]:
+            hi += 1
+        hi += 1
+        i, j = lo, hi - 1
+        while i < j:
+            arr[i], arr[j] = arr[j], arr[i]
+            i += 1
+            j -= 1
+    else:
+        while hi + 1 < n and not arr[hi + 1] < arr[hi]:
+            hi += 1
+        hi += 1
+    return hi
+
+
+def _binary_insertion_sort(arr: List, lo: int, hi: int, start: int) -> None:
+    """Sort arr[lo:hi] given that arr[lo:start] is already sorted."""
+    for i in range(start, hi):
+        x = arr[i]
+        pos = bisect_right(arr, x, lo, i)
+        if pos < i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = x
+
+
+def _copy(src: List, i: int, dst: List, k: int, count: int) -> None:
+    """dst[k:k + count] = src[i:i + count] through bounded temporary slices.
+
+    Overlapping moves within one list are safe in either direction.
+    """
+    if src is dst and i < k < i + count:
+        # Shifting right: copy back to front so no chunk is overwritten before it is read
+        while count > COPY_CHUNK:
+            count -= COPY_CHUNK
+            dst[k + count:k + count + COPY_CHUNK] = src[i + count:i + count + COPY_CHUNK]
+        dst[k:k + count] = src[i:i + count]
+        return
+    while count > COPY_CHUNK:
+        dst[k:k + COPY_CHUNK] = src[i:i + COPY_CHUNK]
+        i += COPY_CHUNK
+        k += COPY_CHUNK
+        count -= COPY_CHUNK
+    dst[k:k + count] = src[i:i + count]
+
+
+def _merge_lo(arr: List, tmp: List, lo: int, mid: int, hi: int) -> None:
+    """Merge arr[lo:mid] and arr[mid:hi] in place, front to back, via a copy of the left run."""
+    n1 = mid - lo
+    _copy(arr, lo, tmp, 0, n1)
+    i, j, k = 0, mid, lo
+    left_wins = right_wins = 0
+    while i < n1 and j < hi:
+        if arr[j] < tmp[i]:
+            arr[k] = arr[j]
+            k += 1
+            j += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP and j < hi:
+                end = bisect_left(arr, tmp[i], j, hi)
+                _copy(arr, j, arr, k, end - j)
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            arr[k] = tmp[i]
+            k += 1
+            i += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP and i < n1:
+                end = bisect_right(tmp, arr[j], i, n1)
+                _copy(tmp, i, arr, k, end - i)
+                k += end - i
+                i = end
+                left_wins = 0
+    # A rest of the right run is already in place
+    _copy(tmp, i, arr, k, n1 - i)
+
+
+def _merge_hi(arr: List, tmp: List, lo: int, mid: int, hi: int) -> None:
+    """Merge arr[lo:mid] and arr[mid:hi] in place, back to front, via a copy of the right run."""
+    n2 = hi - mid
+    _copy(arr, mid, tmp, 0, n2)
+    i, j, k = mid - 1, n2 - 1, hi - 1
+    left_wins = right_wins = 0
+    while i >= lo and j >= 0:
+        if tmp[j] < arr[i]:
+            arr[k] = arr[i]
+            k -= 1
+            i -= 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP and i >= lo:
+                start = bisect_right(arr, tmp[j], lo, i + 1)
+                _copy(arr, start, arr, k - (i - start), i + 1 - start)
+                k -= i + 1 - start
+                i = start - 1
+                left_wins = 0
+        else:
+            arr[k] = tmp[j]
+            k -= 1
+            j -= 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP and j >= 0:
+                start = bisect_left(tmp, arr[i], 0, j + 1)
+                _copy(tmp, start, arr, k - (j - start), j + 1 - start)
+                k -= j + 1 - start
+                j = start - 1
+                right_wins = 0
+    # A rest of the left run is already in place
+    _copy(tmp, 0, arr, lo, j + 1)
+
+
+def _merge_runs(arr: List, tmp: List, lo: int, mid: int, hi: int) -> None:
+    """Stable in-place merge of arr[lo:mid] and arr[mid:hi], copying the shorter run to tmp."""
+    if not arr[mid] < arr[mid - 1]:
+        return
+    if mid - lo <= hi - mid:
+        _merge_lo(arr, tmp, lo, mid, hi)
+    else:
+        _merge_hi(arr, tmp, lo, mid, hi)
+
+
+def natural_merge_sort(arr: List) -> List:
+    """Sort `arr` ascending in place (stable) and return it for convenience.
+
+    Time: O(n log n) worst case, O(n) on inputs made of few runs.
+    Space: one auxiliary list of n // 2 slots, allocated only if merging is needed.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    bounds = [0]
+    lo = 0
+    while lo < n:
+        hi = _count_run(arr, lo, n)
+        if hi - lo < MIN_RUN:
+            forced = min(lo + MIN_RUN, n)
+            _binary_insertion_sort(arr, lo, forced, hi)
+            hi = forced
+        bounds.append(hi)
+        lo = hi
+    if len(bounds) == 2:
+        return arr
+
+    # The shorter of two adjacent runs never exceeds half the list
+    tmp = [None] * (n // 2)
+    while len(bounds) > 2:
+        merged = [0]
+        for k in range(0, len(bounds) - 2, 2):
+            _merge_runs(arr, tmp, bounds[k], bounds[k + 1], bounds[k + 2])
+            merged.append(bounds[k + 2])
+        if len(bounds) % 2 == 0:
+            merged.append(bounds[-1])   # odd number of runs: the last one waits a pass
+        bounds = merged
+    return arr
+
+
+if __name__ == "__main__":
+    import random
+    data = [random.randint(0, 1000) for _ in range(20)]
+    print("input:", data)
+    print("natural_merge_sort:", natural_merge_sort(list(data)))
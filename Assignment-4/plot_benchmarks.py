@@ -1,10 +1,18 @@
 """Plot benchmark results from sorting_benchmarks.csv and save PNGs.
 
-Usage: python plot_benchmarks.py
+Usage: python plot_benchmarks.py [--store]
+
+With --store the rows are read from the shared results store
+(results_store.py) instead of the CSV; nothing is re-run, and only cells
+measured with the current code of each series are plotted.
 """
 import csv
 import os
 import math
+import sys
+
+from benchmarks import sorting_code_hashes
+from results_store import DEFAULT_PATH, ResultsStore
 
 try:
     import matplotlib.pyplot as plt
@@ -14,6 +22,7 @@ except Exception:
 
 
 CSV_PATH = os.path.join(os.path.dirname(__file__), "sorting_benchmarks.csv")
+ALGOS = ("heapsort", "heapsort_bottom_up", "quicksort", "mergesort", "py_sorted")
 
 
 def read_rows(path):
@@ -25,12 +34,27 @@ def read_rows(path):
         for r in reader:
             # coerce types
             r2 = {"n": int(r["n"]), "kind": r["kind"], "trial": int(r["trial"])}
-            for algo in ("heapsort", "quicksort", "mergesort", "py_sorted"):
-                r2[algo] = float(r.get(algo, math.nan))
+            for algo in ALGOS:
+                r2[algo] = float(r.get(algo) or math.nan)
             rows.append(r2)
     return rows
 
 
+def read_store_rows(path=DEFAULT_PATH):
+    """Rows in the read_rows layout from the latest run_benchmarks cells of the current code."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Results store not found: {path}. Run benchmarks.py first.")
+    code = sorting_code_hashes()
+    cells = {}
+    with ResultsStore(path) as store:
+        for algo in ALGOS:
+            for params, t in store.query(algo, code=code[algo]):
+                key = (params["n"], params["kind"], params["trial"])
+                row = cells.setdefault(key, dict(zip(("n", "kind", "trial"), key), **{a: math.nan for a in ALGOS}))
+                row[algo] = t
+    return list(cells.values())
+
+
 def aggregate(rows):
     # structure: agg[kind][algo][n] = mean_time
     agg = {}
@@ -38,8 +62,9 @@ def aggregate(rows):
         kind = r["kind"]
         n = r["n"]
         agg.setdefault(kind, {})
-        for algo in ("heapsort", "quicksort", "mergesort", "py_sorted"):
-            agg[kind].setdefault(algo, {}).setdefault(n, []).append(r[algo])
+        for algo in ALGOS:
+            if not math.isnan(r[algo]):     # older CSVs lack newer series
+                agg[kind].setdefault(algo, {}).setdefault(n, []).append(r[algo])
 
     # compute means
     for kind in agg:
@@ -52,7 +77,7 @@ def aggregate(rows):
 
 def plot_agg(agg):
     out_dir = os.path.dirname(__file__)
-    algos = ["heapsort", "quicksort", "mergesort", "py_sorted"]
+    algos = ALGOS
     for kind, data in agg.items():
         plt.figure()
         for algo in algos:
@@ -74,7 +99,8 @@ def plot_agg(agg):
 
     # combined plot
     plt.figure()
-    colors = {"heapsort": "C0", "quicksort": "C1", "mergesort": "C2", "py_sorted": "C3"}
+    colors = {"heapsort": "C0", "quicksort": "C1", "mergesort": "C2", "py_sorted": "C3",
+              "heapsort_bottom_up": "C4"}
     for algo in algos:
         xs_all = []
         ys_all = []
@@ -102,7 +128,7 @@ def plot_agg(agg):
 
 
 def main():
-    rows = read_rows(CSV_PATH)
+    rows = read_store_rows() if "--store" in sys.argv else read_rows(CSV_PATH)
     agg = aggregate(rows)
     plot_agg(agg)
 
@@ -1,9 +1,14 @@
 """Max-heap based priority queue for Task objects.
 
-Provides: MaxHeap with insert, extract_max, increase_key, is_empty.
+Provides: MaxHeap with insert, extract_max, increase_key, remove, is_empty.
+DaryHeap is an indexed d-ary variant with the same API whose priorities and
+task ids live in parallel array('q') buffers. SlotTask is a __slots__ Task,
+and TaskStore keeps tasks as array columns that DaryHeap can index by row.
 """
+import math
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 
 
 @dataclass
@@ -18,10 +23,45 @@ class Task:
         return f"Task(id={self.task_id}, p={self.priority}, a={self.arrival}, d={self.deadline})"
 
 
+class SlotTask:
+    """Task with __slots__ instead of a per-instance __dict__.
+
+    Same fields, defaults and repr as Task, so the heaps and the scheduler
+    accept either. Saves the per-instance dict; most of the remaining cost
+    per queued task is the field objects and the heap's index.
+    """
+
+    __slots__ = ("task_id", "priority", "arrival", "deadline", "payload")
+
+    def __init__(self, task_id: int, priority: int, arrival: float = 0.0,
+                 deadline: Optional[float] = None, payload: Any = None):
+        self.task_id = task_id
+        self.priority = priority
+        self.arrival = arrival
+        self.deadline = deadline
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.task_id}, p={self.priority}, a={self.arrival}, d={self.deadline})"
+
+
 class MaxHeap:
-    def __init__(self):
+    """Binary max-heap of Tasks with a task_id -> index map.
+
+    With `lazy_delete=True`, remove() only tombstones the task id (O(1));
+    dead entries are skipped when they reach the top and the heap is
+    compacted once tombstones exceed `compact_ratio` of its entries.
+    """
+
+    def __init__(self, lazy_delete: bool = False, compact_ratio: float = 0.5):
         self.heap: List[Task] = []
         self.pos: dict[int, int] = {}  # task_id -> index in heap
+        self.lazy_delete = lazy_delete
+        self.compact_ratio = compact_ratio
+        self._dead: set = set()        # tombstoned task ids still in `heap`
+
+    def __len__(self) -> int:
+        return len(self.heap) - len(self._dead)
 
     def _parent(self, i: int) -> int:
         return (i - 1) // 2
@@ -33,6 +73,8 @@ class MaxHeap:
         return 2 * i + 2
 
     def insert(self, task: Task) -> None:
+        if task.task_id in self._dead:
+            self._compact()     # the old entry must go before the id is reused
         self.heap.append(task)
         idx = len(self.heap) - 1
         self.pos[task.task_id] = idx
@@ -48,6 +90,7 @@ class MaxHeap:
             i = p
 
     def extract_max(self) -> Optional[Task]:
+        self._drop_dead_top()
         if not self.heap:
             return None
         top = self.heap[0]
@@ -59,6 +102,44 @@ class MaxHeap:
             self._heapify(0)
         return top
 
+    def _drop_dead_top(self) -> None:
+        while self._dead and self.heap and self.heap[0].task_id in self._dead:
+            self._dead.discard(self.heap[0].task_id)
+            self._remove_at(0)
+
+    def _remove_at(self, idx: int) -> Task:
+        task = self.heap[idx]
+        last = self.heap.pop()
+        del self.pos[task.task_id]
+        if idx < len(self.heap):
+            self.heap[idx] = last
+            self.pos[last.task_id] = idx
+            if idx > 0 and self.heap[self._parent(idx)].priority < last.priority:
+                self._sift_up(idx)
+            else:
+                self._heapify(idx)
+        return task
+
+    def remove(self, task_id: int) -> bool:
+        """Cancel a task. O(log n), or O(1) amortized with lazy_delete."""
+        idx = self.pos.get(task_id)
+        if idx is None or task_id in self._dead:
+            return False
+        if not self.lazy_delete:
+            self._remove_at(idx)
+            return True
+        self._dead.add(task_id)
+        if len(self._dead) > self.compact_ratio * len(self.heap):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Drop every tombstoned entry and re-heapify in O(n)."""
+        self.heap = [t for t in self.heap if t.task_id not in self._dead]
+        self.pos = {t.task_id: i for i, t in enumerate(self.heap)}
+        self._dead.clear()
+        self._build()
+
     def _heapify(self, i: int) -> None:
         n = len(self.heap)
         while True:
@@ -79,7 +160,7 @@ class MaxHeap:
 
     def increase_key(self, task_id: int, new_priority: int) -> bool:
         idx = self.pos.get(task_id)
-        if idx is None:
+        if idx is None or task_id in self._dead:
             return False
         old = self.heap[idx].priority
         self.heap[idx].priority = new_priority
@@ -93,11 +174,358 @@ class MaxHeap:
         return self.increase_key(task_id, new_priority)
 
     def is_empty(self) -> bool:
-        return len(self.heap) == 0
+        return len(self.heap) == len(self._dead)
 
     def peek(self) -> Optional[Task]:
+        self._drop_dead_top()
         return self.heap[0] if self.heap else None
 
+    # ── batch operations ─────────────────────────────────────
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> "MaxHeap":
+        """Build a heap from `tasks` in O(n) with Floyd's bottom-up heapify."""
+        pq = cls()
+        pq.heap = list(tasks)
+        pq.pos = {t.task_id: i for i, t in enumerate(pq.heap)}
+        pq._build()
+        return pq
+
+    def _build(self) -> None:
+        for i in range(len(self.heap) // 2 - 1, -1, -1):
+            self._heapify(i)
+
+    def insert_many(self, tasks: Iterable[Task]) -> None:
+        """Insert a batch; re-heapifies once when that beats k sift-ups."""
+        tasks = list(tasks)
+        if any(t.task_id in self._dead for t in tasks):
+            self._compact()
+        if not _rebuild_cheaper(len(tasks), len(self.heap)):
+            for t in tasks:
+                self.insert(t)
+            return
+        start = len(self.heap)
+        self.heap.extend(tasks)
+        for i in range(start, len(self.heap)):
+            self.pos[self.heap[i].task_id] = i
+        self._build()
+
+    def extract_top_k(self, k: int) -> List[Task]:
+        """Remove and return the k highest-priority tasks, highest first."""
+        return [self.extract_max() for _ in range(min(k, len(self)))]
+
+    def update_priorities(self, mapping: Dict[int, int]) -> int:
+        """Apply task_id -> priority changes; returns how many ids were found.
+
+        Large batches overwrite the priorities and re-heapify once instead
+        of sifting each task.
+        """
+        if not _rebuild_cheaper(len(mapping), len(self.heap)):
+            return sum(self.increase_key(tid, p) for tid, p in mapping.items())
+        found = 0
+        for tid, p in mapping.items():
+            idx = self.pos.get(tid)
+            if idx is not None and tid not in self._dead:
+                self.heap[idx].priority = p
+                found += 1
+        self._build()
+        return found
+
+
+def _rebuild_cheaper(k: int, n: int) -> bool:
+    # k sift operations cost about k log2(n + k); one heapify costs about n + k
+    return k > 1 and k * (n + k).bit_length() > n + k
+
+
+class TaskStore:
+    """Struct-of-arrays task table: one array column per Task field.
+
+    A row costs 32 bytes (int64 id and priority, float64 arrival and
+    deadline; NaN means no deadline) instead of a Python object per task.
+    Released rows go on a free list and are reused, so the store only grows
+    to the peak number of live rows. Payloads are not stored.
+    """
+
+    def __init__(self):
+        self.task_id = array("q")
+        self.priority = array("q")
+        self.arrival = array("d")
+        self.deadline = array("d")
+        self._free = array("q")
+
+    def __len__(self) -> int:
+        return len(self.task_id) - len(self._free)
+
+    def append(self, task_id: int, priority: int, arrival: float = 0.0,
+               deadline: Optional[float] = None) -> int:
+        """Store one task and return its row."""
+        dl = math.nan if deadline is None else deadline
+        if self._free:
+            row = self._free.pop()
+            self.task_id[row] = task_id
+            self.priority[row] = priority
+            self.arrival[row] = arrival
+            self.deadline[row] = dl
+            return row
+        self.task_id.append(task_id)
+        self.priority.append(priority)
+        self.arrival.append(arrival)
+        self.deadline.append(dl)
+        return len(self.task_id) - 1
+
+    def add(self, task: Task) -> int:
+        return self.append(task.task_id, task.priority, task.arrival, task.deadline)
+
+    def release(self, row: int) -> None:
+        self._free.append(row)
+
+    def get_deadline(self, row: int) -> Optional[float]:
+        dl = self.deadline[row]
+        return None if dl != dl else dl
+
+    def task(self, row: int) -> "SlotTask":
+        """Materialize a row as a SlotTask."""
+        return SlotTask(self.task_id[row], self.priority[row], self.arrival[row], self.get_deadline(row))
+
+    def nbytes(self) -> int:
+        cols = (self.task_id, self.priority, self.arrival, self.deadline, self._free)
+        return sum(c.itemsize * c.buffer_info()[1] for c in cols)
+
+
+# Dense ids index `_pos`/`_tasks` directly; an id this far past the current
+# size switches the index to dicts rather than growing the arrays.
+_DENSE_SLACK = 1 << 16
+
+
+class DaryHeap:
+    """Indexed d-ary max-heap with the same API as MaxHeap.
+
+    Priorities and task ids are kept in parallel array('q') buffers, so
+    priorities must be integers. Sifting moves a hole instead of swapping:
+    each level costs one move and one position update, and the entry being
+    sifted is written once at the end. While task ids are small non-negative
+    integers the position index and task lookup are arrays indexed by id;
+    any other id converts them to dicts.
+
+    With a `store`, heap entries are TaskStore rows rather than objects:
+    insert() takes a row (or a Task, which is added to the store),
+    extract_max()/peek() return rows, and task_id arguments are rows. The
+    caller releases a row once it is done with it.
+
+    Time: insert/increase_key O(log_d n), extract_max O(d log_d n), peek O(1).
+    """
+
+    def __init__(self, d: int = 4, store: Optional[TaskStore] = None):
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.d = d
+        self._store = store
+        self._prio = array("q")
+        self._ids = array("q")
+        self._dense = True
+        self._pos = array("q")          # task_id -> index, -1 if absent
+        self._tasks: list = []          # task_id -> Task (unused with a store)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _index(self, task_id: int) -> Optional[int]:
+        if self._dense:
+            if 0 <= task_id < len(self._pos) and self._pos[task_id] >= 0:
+                return self._pos[task_id]
+            return None
+        return self._pos.get(task_id)
+
+    def _make_sparse(self) -> None:
+        self._pos = {tid: self._pos[tid] for tid in self._ids}
+        if self._store is None:
+            self._tasks = {tid: self._tasks[tid] for tid in self._ids}
+        self._dense = False
+
+    def _reserve(self, tid: int) -> None:
+        if self._dense and not 0 <= tid < len(self._pos):
+            if 0 <= tid < 2 * len(self._ids) + _DENSE_SLACK:
+                grow = max(tid + 1, 2 * len(self._pos)) - len(self._pos)
+                self._pos.extend(array("q", [-1]) * grow)
+                if self._store is None:
+                    self._tasks.extend([None] * grow)
+            else:
+                self._make_sparse()
+
+    def _register(self, task) -> Tuple[int, int]:
+        """Index a Task (or store row) and return its (heap id, priority)."""
+        if self._store is not None:
+            row = task if isinstance(task, int) else self._store.add(task)
+            self._reserve(row)
+            return row, self._store.priority[row]
+        tid = task.task_id
+        self._reserve(tid)
+        self._tasks[tid] = task
+        return tid, task.priority
+
+    def _task(self, tid: int):
+        return tid if self._store is not None else self._tasks[tid]
+
+    def _set_priority(self, tid: int, priority: int) -> None:
+        if self._store is not None:
+            self._store.priority[tid] = priority
+        else:
+            self._tasks[tid].priority = priority
+
+    def _release(self, task_id: int) -> None:
+        if self._dense:
+            self._pos[task_id] = -1
+            if self._store is None:
+                self._tasks[task_id] = None
+        else:
+            del self._pos[task_id]
+            if self._store is None:
+                del self._tasks[task_id]
+
+    def _sift_up(self, i: int, prio: int, tid: int) -> None:
+        prios, ids, pos, d = self._prio, self._ids, self._pos, self.d
+        while i > 0:
+            p = (i - 1) // d
+            if prios[p] >= prio:
+                break
+            prios[i] = prios[p]
+            moved = ids[i] = ids[p]
+            pos[moved] = i
+            i = p
+        prios[i] = prio
+        ids[i] = tid
+        pos[tid] = i
+
+    def _sift_down(self, i: int, prio: int, tid: int) -> None:
+        prios, ids, pos, d = self._prio, self._ids, self._pos, self.d
+        n = len(prios)
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best, best_prio = first, prios[first]
+            for c in range(first + 1, min(first + d, n)):
+                if prios[c] > best_prio:
+                    best, best_prio = c, prios[c]
+            if best_prio <= prio:
+                break
+            prios[i] = best_prio
+            moved = ids[i] = ids[best]
+            pos[moved] = i
+            i = best
+        prios[i] = prio
+        ids[i] = tid
+        pos[tid] = i
+
+    def insert(self, task: Task) -> None:
+        tid, prio = self._register(task)
+        self._prio.append(prio)
+        self._ids.append(tid)
+        self._sift_up(len(self._ids) - 1, prio, tid)
+
+    def extract_max(self) -> Optional[Task]:
+        if not self._ids:
+            return None
+        top_id = self._ids[0]
+        top = self._task(top_id)
+        last_prio = self._prio.pop()
+        last_id = self._ids.pop()
+        self._release(top_id)
+        if self._ids:
+            self._sift_down(0, last_prio, last_id)
+        return top
+
+    def increase_key(self, task_id: int, new_priority: int) -> bool:
+        idx = self._index(task_id)
+        if idx is None:
+            return False
+        old = self._prio[idx]
+        self._set_priority(task_id, new_priority)
+        if new_priority > old:
+            self._sift_up(idx, new_priority, task_id)
+        else:
+            self._sift_down(idx, new_priority, task_id)
+        return True
+
+    def decrease_key(self, task_id: int, new_priority: int) -> bool:
+        return self.increase_key(task_id, new_priority)
+
+    def remove(self, task_id: int) -> bool:
+        """Cancel a task in O(d log_d n)."""
+        idx = self._index(task_id)
+        if idx is None:
+            return False
+        last_prio = self._prio.pop()
+        last_id = self._ids.pop()
+        self._release(task_id)
+        if idx < len(self._ids):
+            if idx > 0 and self._prio[(idx - 1) // self.d] < last_prio:
+                self._sift_up(idx, last_prio, last_id)
+            else:
+                self._sift_down(idx, last_prio, last_id)
+        return True
+
+    def is_empty(self) -> bool:
+        return len(self._ids) == 0
+
+    def peek(self) -> Optional[Task]:
+        return self._task(self._ids[0]) if self._ids else None
+
+    # ── batch operations ─────────────────────────────────────
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task], d: int = 4,
+                   store: Optional[TaskStore] = None) -> "DaryHeap":
+        """Build a heap from `tasks` in O(n) with Floyd's bottom-up heapify."""
+        pq = cls(d, store)
+        pq._append_unordered(tasks)
+        pq._build()
+        return pq
+
+    def _append_unordered(self, tasks: Iterable[Task]) -> None:
+        for t in tasks:
+            tid, prio = self._register(t)
+            self._pos[tid] = len(self._ids)
+            self._prio.append(prio)
+            self._ids.append(tid)
+
+    def _build(self) -> None:
+        prios, ids = self._prio, self._ids
+        for i in range((len(ids) - 2) // self.d, -1, -1):
+            self._sift_down(i, prios[i], ids[i])
+
+    def insert_many(self, tasks: Iterable[Task]) -> None:
+        """Insert a batch; re-heapifies once when that beats k sift-ups."""
+        tasks = list(tasks)
+        if not _rebuild_cheaper(len(tasks), len(self._ids)):
+            for t in tasks:
+                self.insert(t)
+            return
+        self._append_unordered(tasks)
+        self._build()
+
+    def extract_top_k(self, k: int) -> List[Task]:
+        """Remove and return the k highest-priority tasks, highest first."""
+        return [self.extract_max() for _ in range(min(k, len(self._ids)))]
+
+    def update_priorities(self, mapping: Dict[int, int]) -> int:
+        """Apply task_id -> priority changes; returns how many ids were found.
+
+        Large batches overwrite the priorities and re-heapify once instead
+        of sifting each task.
+        """
+        if not _rebuild_cheaper(len(mapping), len(self._ids)):
+            return sum(self.increase_key(tid, p) for tid, p in mapping.items())
+        found = 0
+        for tid, p in mapping.items():
+            idx = self._index(tid)
+            if idx is not None:
+                self._prio[idx] = p
+                self._set_priority(tid, p)
+                found += 1
+        self._build()
+        return found
+
 
 if __name__ == "__main__":
     # quick manual check
@@ -107,3 +535,70 @@ if __name__ == "__main__":
         pq.insert(t)
     while not pq.is_empty():
         print(pq.extract_max())
+
+    # the d-ary heap must extract priorities in the same order
+    import random
+    for d in (2, 3, 4, 8):
+        ref, dh = MaxHeap(), DaryHeap(d)
+        ids = range(4000) if d % 2 == 0 else range(10**7)   # dense and sparse ids
+        for i in random.sample(ids, 2000):
+            ref.insert(Task(i, random.randint(0, 100)))
+            dh.insert(Task(i, ref.heap[ref.pos[i]].priority))
+        for tid in random.sample(list(ref.pos), 500):
+            p = random.randint(-50, 150)
+            ref.increase_key(tid, p)
+            dh.increase_key(tid, p)
+        got = [dh.extract_max().priority for _ in range(len(dh))]
+        assert got == [ref.extract_max().priority for _ in range(len(got))], d
+    print("DaryHeap matches MaxHeap for d = 2, 3, 4, 8")
+
+    # batch paths must agree with one-at-a-time inserts and updates
+    for cls in (MaxHeap, DaryHeap):
+        prios = [random.randint(0, 1000) for _ in range(3000)]
+        changes = {random.randrange(3000): random.randint(0, 1000) for _ in range(2000)}
+        expected = prios[:]
+        for tid, p in changes.items():
+            expected[tid] = p
+        expected.sort(reverse=True)
+        pq = cls.from_tasks(Task(i, p) for i, p in enumerate(prios[:1000]))
+        pq.insert_many(Task(i, prios[i]) for i in range(1000, 2990))
+        pq.insert_many(Task(i, prios[i]) for i in range(2990, 3000))
+        assert pq.update_priorities(changes) == len(changes)
+        got = [t.priority for t in pq.extract_top_k(10)]
+        got += [t.priority for t in pq.extract_top_k(5000)]
+        assert got == expected and pq.is_empty(), cls.__name__
+    print("from_tasks / insert_many / update_priorities / extract_top_k OK")
+
+    # cancelling half the tasks, eagerly or lazily, leaves the other half in order
+    for pq in (MaxHeap(), MaxHeap(lazy_delete=True), MaxHeap(lazy_delete=True, compact_ratio=2.0), DaryHeap()):
+        prios = [random.randint(0, 1000) for _ in range(2000)]
+        pq.insert_many(Task(i, p) for i, p in enumerate(prios))
+        cancelled = set(random.sample(range(2000), 1000))
+        assert all(pq.remove(tid) for tid in cancelled)
+        assert not pq.remove(next(iter(cancelled)))
+        pq.insert(Task(next(iter(cancelled)), 5000))     # reuse a cancelled id
+        expected = [5000] + sorted((p for i, p in enumerate(prios) if i not in cancelled), reverse=True)
+        got = []
+        while not pq.is_empty():
+            got.append(pq.extract_max().priority)
+        assert got == expected, pq
+    print("remove / lazy deletion OK")
+
+    # SlotTask works in both heaps; a TaskStore-backed heap yields rows
+    prios = [random.randint(0, 1000) for _ in range(3000)]
+    expected = sorted(prios, reverse=True)
+    for pq in (MaxHeap(), DaryHeap()):
+        pq.insert_many(SlotTask(i, p) for i, p in enumerate(prios))
+        assert [t.priority for t in pq.extract_top_k(3000)] == expected
+    store = TaskStore()
+    pq = DaryHeap(store=store)
+    pq.insert_many(Task(i, p) for i, p in enumerate(prios))
+    got = []
+    while not pq.is_empty():
+        row = pq.extract_max()
+        got.append(store.priority[row])
+        store.release(row)
+    assert got == expected and len(store) == 0
+    pq.insert(Task(7, 1, 2.0, 3.0))
+    assert store.task(pq.peek()).deadline == 3.0 and len(store.task_id) == 3000
+    print("SlotTask / TaskStore OK")
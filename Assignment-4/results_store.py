@@ -0,0 +1,184 @@
+"""Shared, resumable benchmark results store (SQLite, stdlib only).
+
+Every measurement is one row keyed by
+(algorithm, params, input hash, code hash, machine):
+
+- params: the cell's settings (size, distribution, trial, ...) as canonical
+  JSON, so key order never matters;
+- input hash: a digest of the exact input data (`input_hash`), so inputs
+  must be reproducible -- benchmark scripts seed their generators per cell;
+- code hash: a digest of the source of the measured code (`code_hash`), so
+  editing an algorithm invalidates only its own cells;
+- machine: host, CPU and interpreter (`machine_id`).
+
+`measure()` returns the stored result when the key exists and otherwise
+runs the measurement and commits it at once, so an interrupted sweep
+resumes where it stopped and a rerun with unchanged code reads every cell
+from the store. `query()` returns the latest result per params for plotting
+without running anything.
+
+The default database is `benchmark_results.sqlite` in the repository root
+(override with the BENCH_RESULTS environment variable).
+
+Usage: `python results_store.py [path]` prints the stored cells per
+algorithm and machine.
+"""
+import hashlib
+import inspect
+import json
+import os
+import platform
+import sqlite3
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_PATH = os.environ.get(
+    "BENCH_RESULTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmark_results.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    algorithm  TEXT NOT NULL,
+    params     TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    code_hash  TEXT NOT NULL,
+    machine    TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    created    REAL NOT NULL,
+    PRIMARY KEY (algorithm, params, input_hash, code_hash, machine)
+)
+"""
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def input_hash(data: Any) -> str:
+    """Digest of a benchmark input: raw bytes for buffers, repr() otherwise."""
+    if isinstance(data, array):
+        return _digest(data.typecode.encode() + data.tobytes())
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return _digest(bytes(data))
+    return _digest(repr(data).encode())
+
+
+def code_hash(*objs: Any) -> str:
+    """Digest of the source of the given functions, classes or modules.
+
+    A string names a module in sys.modules, so helper modules can be listed
+    as e.g. code_hash(quicksort, "introsort"). Objects without Python
+    source (builtins such as sorted) contribute their qualified name; the
+    interpreter version is part of machine_id().
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        if isinstance(obj, str):
+            obj = sys.modules[obj]
+        try:
+            src = inspect.getsource(obj)
+        except (TypeError, OSError):
+            src = f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+        h.update(src.encode())
+    return h.hexdigest()
+
+
+def machine_id() -> str:
+    return "|".join((platform.node(), platform.machine(), platform.processor() or "?",
+                     f"{os.cpu_count()}cpu",
+                     f"{platform.python_implementation()}-{platform.python_version()}"))
+
+
+def _params_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class ResultsStore:
+    """SQLite-backed cache of benchmark results.
+
+    Results are stored as JSON, so a measurement may return any JSON value
+    (a time, a list of per-trial times, a dict of counters, ...). Each put
+    is committed immediately.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, machine: Optional[str] = None):
+        self.path = path
+        self.machine = machine or machine_id()
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self.hits = self.misses = 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get(self, algorithm: str, params: Dict, inp: str, code: str) -> Optional[Any]:
+        """Stored result for the key on this machine, or None."""
+        row = self._conn.execute(
+            "SELECT result FROM results WHERE algorithm=? AND params=? AND input_hash=?"
+            " AND code_hash=? AND machine=?",
+            (algorithm, _params_key(params), inp, code, self.machine)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, algorithm: str, params: Dict, inp: str, code: str, result: Any) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (algorithm, _params_key(params), inp, code, self.machine,
+             json.dumps(result), time.time()))
+
+    def measure(self, algorithm: str, params: Dict, inp: str, code: str,
+                run: Callable[[], Any], force: bool = False) -> Any:
+        """Return the cached result for the key, or call run() and store it.
+
+        force=True re-measures and replaces the stored result.
+        """
+        if not force:
+            result = self.get(algorithm, params, inp, code)
+            if result is not None:
+                self.hits += 1
+                return result
+        self.misses += 1
+        result = run()
+        self.put(algorithm, params, inp, code, result)
+        return result
+
+    def query(self, algorithm: str, machine: Optional[str] = None,
+              code: Optional[str] = None) -> List[Tuple[Dict, Any]]:
+        """Latest (params, result) per params of `algorithm`, oldest first.
+
+        Defaults to this machine and any code version; pass `code` to keep
+        only results of one code hash.
+        """
+        sql = "SELECT params, result FROM results WHERE algorithm=? AND machine=?"
+        args = [algorithm, machine or self.machine]
+        if code is not None:
+            sql += " AND code_hash=?"
+            args.append(code)
+        latest = {}
+        for params, result in self._conn.execute(sql + " ORDER BY created", args):
+            latest[params] = result
+        return [(json.loads(p), json.loads(r)) for p, r in latest.items()]
+
+    def summary(self) -> List[Tuple[str, str, int]]:
+        """(algorithm, machine, number of cells) for every stored algorithm."""
+        return self._conn.execute(
+            "SELECT algorithm, machine, COUNT(*) FROM results"
+            " GROUP BY algorithm, machine ORDER BY algorithm, machine").fetchall()
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    if not os.path.exists(path):
+        sys.exit(f"no results store at {path}")
+    with ResultsStore(path) as store:
+        for algorithm, machine, cells in store.summary():
+            print(f"{algorithm:<32} {cells:>6} cells  {machine}")
@@ -1,56 +1,481 @@
 """Scheduler simulation using the MaxHeap priority queue.
 
-Usage: `python scheduler.py [num_tasks] [seed]`
+run_simulation is the original single-server model; simulate() is a
+discrete-event engine with N workers, service-time distributions and
+pluggable dispatch policies.
+
+Both consume arrivals lazily from any time-ordered iterable, including a
+CSV or binary trace replayed from disk with read_trace().
+
+Usage: `python scheduler.py [num_tasks] [seed] [--cancel-rate=R]`
+       `python scheduler.py [num_tasks] [seed] --engine [--workers=N] [--load=U]
+                            [--service=const|exp|lognormal] [--policy=NAME]`
+       `python scheduler.py [num_tasks] [seed] --write-trace=PATH`
+       `python scheduler.py --trace=PATH [--engine --workers=N ...]`
 """
+import csv
+import heapq
+import math
 import random
+import struct
 import sys
-from typing import List
-from priority_queue import Task, MaxHeap
+import time as _time
+from abc import ABC, abstractmethod
+from typing import Callable, Hashable, Iterable, Iterator, List, Optional
+from priority_queue import Task, MaxHeap, DaryHeap, TaskStore
 
 
-def run_simulation(num_tasks: int = 100, seed: int = 1) -> dict:
+def _random_arrivals(num_tasks: int, seed: int, task_cls=Task) -> Iterator[Task]:
+    """run_simulation's arrival process, drawn lazily in time order."""
     random.seed(seed)
-    tasks: List[Task] = []
     time = 0.0
     for i in range(num_tasks):
         inter = random.expovariate(1 / 5)
         time += inter
         priority = random.randint(1, 100)
         deadline = time + random.uniform(1, 20)
-        tasks.append(Task(i, priority=priority, arrival=time, deadline=deadline))
+        yield task_cls(i, priority=priority, arrival=time, deadline=deadline)
+
 
-    tasks.sort(key=lambda t: t.arrival)
+def run_simulation(num_tasks: int = 100, seed: int = 1, tasks: Optional[Iterable[Task]] = None,
+                   store: Optional[TaskStore] = None) -> dict:
+    """Single server, 1.0 service time, max-priority dispatch.
 
-    pq = MaxHeap()
+    `tasks` may be any iterable ordered by arrival (a generator, read_trace());
+    by default `num_tasks` random arrivals are generated. Arrivals are pulled
+    only as simulated time reaches them, so memory is bounded by the queue.
+    With a `store`, queued tasks are kept as TaskStore rows in a DaryHeap
+    instead of as objects in a MaxHeap.
+    """
+    arrivals = iter(tasks) if tasks is not None else _random_arrivals(num_tasks, seed)
+    nxt = next(arrivals, None)
+
+    pq = MaxHeap() if store is None else DaryHeap(store=store)
     now = 0.0
-    idx = 0
+    last_arrival = -math.inf
     served = 0
     total_wait = 0.0
     missed = 0
 
-    while idx < len(tasks) or not pq.is_empty():
-        if pq.is_empty() and idx < len(tasks):
-            now = max(now, tasks[idx].arrival)
+    while nxt is not None or not pq.is_empty():
+        if pq.is_empty():
+            now = max(now, nxt.arrival)
 
-        while idx < len(tasks) and tasks[idx].arrival <= now:
-            pq.insert(tasks[idx])
-            idx += 1
+        # everything that has arrived by `now` goes in as one batch
+        burst = []
+        while nxt is not None and nxt.arrival <= now:
+            if nxt.arrival < last_arrival:
+                raise ValueError("tasks must be ordered by arrival time")
+            last_arrival = nxt.arrival
+            burst.append(nxt)
+            nxt = next(arrivals, None)
+        if burst:
+            pq.insert_many(burst)
 
         job = pq.extract_max()
         if job is None:
             continue
-        wait = now - job.arrival
+        if store is None:
+            arrival, deadline = job.arrival, job.deadline
+        else:
+            arrival, deadline = store.arrival[job], store.get_deadline(job)
+            store.release(job)
+        wait = now - arrival
         total_wait += wait
         served += 1
         now += 1.0
-        if job.deadline is not None and now > job.deadline:
+        if deadline is not None and now > deadline:
             missed += 1
 
     return {"served": served, "avg_wait": (total_wait / served) if served else 0.0, "missed_deadlines": missed}
 
 
+# ─────────────────────────────────────────────────────────────
+# Arrival traces
+# ─────────────────────────────────────────────────────────────
+# A trace is a time-ordered record of arrivals, either CSV with a header
+# (task_id,priority,arrival,deadline; empty deadline = none) or packed
+# little-endian binary records (int64 id, int64 priority, float64 arrival,
+# float64 deadline; NaN deadline = none). Files ending in .csv are CSV.
+
+_TRACE_RECORD = struct.Struct("<qqdd")
+_TRACE_FIELDS = ["task_id", "priority", "arrival", "deadline"]
+
+
+def write_trace(path: str, tasks: Iterable[Task]) -> int:
+    """Stream `tasks` to a trace file; returns the number of records."""
+    count = 0
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(_TRACE_FIELDS)
+            for t in tasks:
+                writer.writerow([t.task_id, t.priority, repr(t.arrival),
+                                 "" if t.deadline is None else repr(t.deadline)])
+                count += 1
+    else:
+        pack = _TRACE_RECORD.pack
+        with open(path, "wb") as f:
+            for t in tasks:
+                f.write(pack(t.task_id, t.priority, t.arrival,
+                             math.nan if t.deadline is None else t.deadline))
+                count += 1
+    return count
+
+
+def read_trace(path: str, chunk_records: int = 65536, task_cls=Task) -> Iterator[Task]:
+    """Replay a trace file as a stream of `task_cls` (Task or SlotTask),
+    reading it in chunks."""
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)      # header
+            for task_id, priority, arrival, deadline in reader:
+                yield task_cls(int(task_id), int(priority), float(arrival),
+                           float(deadline) if deadline else None)
+        return
+    size = _TRACE_RECORD.size
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size * chunk_records)
+            if not chunk:
+                break
+            if len(chunk) % size:
+                raise ValueError(f"{path}: truncated trace record")
+            for task_id, priority, arrival, deadline in _TRACE_RECORD.iter_unpack(chunk):
+                yield task_cls(task_id, priority, arrival, None if deadline != deadline else deadline)
+
+
+# ─────────────────────────────────────────────────────────────
+# Discrete-event engine
+# ─────────────────────────────────────────────────────────────
+
+def generate_tasks(num_tasks: int, seed: int = 1, mean_interarrival: float = 5.0,
+                   max_slack: float = 20.0, task_cls=Task) -> Iterator[Task]:
+    """Yield Poisson arrivals in time order, drawn like run_simulation's:
+    priority uniform in 1..100, deadline 1..max_slack after arrival.
+    `task_cls` may be Task or SlotTask."""
+    rng = random.Random(seed)
+    expo, rand = rng.expovariate, rng.random
+    rate = 1.0 / mean_interarrival
+    t = 0.0
+    for i in range(num_tasks):
+        t += expo(rate)
+        yield task_cls(i, int(rand() * 100) + 1, t, t + 1.0 + rand() * (max_slack - 1.0))
+
+
+def constant_service(duration: float) -> Callable[[Task], float]:
+    return lambda task: duration
+
+
+def exponential_service(mean: float, seed: Optional[int] = None) -> Callable[[Task], float]:
+    expo, rate = random.Random(seed).expovariate, 1.0 / mean
+    return lambda task: expo(rate)
+
+
+def lognormal_service(mean: float, sigma: float = 1.0, seed: Optional[int] = None) -> Callable[[Task], float]:
+    # mu is chosen so the distribution's mean is `mean`
+    lognorm, mu = random.Random(seed).lognormvariate, math.log(mean) - sigma * sigma / 2
+    return lambda task: lognorm(mu, sigma)
+
+
+class Policy(ABC):
+    """Orders the ready queue: the task with the smallest key runs next.
+
+    key() is called once, when the task is queued, with its sampled service
+    time. Policies whose order changes with time must express it as a key
+    that is fixed at arrival (see AgingPolicy).
+    """
+
+    @abstractmethod
+    def key(self, task: Task, service: float) -> float:
+        ...
+
+    def on_dispatch(self, key: float) -> None:
+        pass
+
+
+class PriorityPolicy(Policy):
+    """Highest Task.priority first."""
+
+    def key(self, task: Task, service: float) -> float:
+        return -task.priority
+
+
+class EDFPolicy(Policy):
+    """Earliest deadline first; tasks without a deadline go last."""
+
+    def key(self, task: Task, service: float) -> float:
+        return task.deadline if task.deadline is not None else math.inf
+
+
+class AgingPolicy(Policy):
+    """Priority that grows by `rate` per time unit spent waiting.
+
+    priority + rate * (now - arrival) ranks tasks the same way as
+    priority - rate * arrival, since `now` is common to all of them, so
+    the key never has to be recomputed.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        self.rate = rate
+
+    def key(self, task: Task, service: float) -> float:
+        return self.rate * task.arrival - task.priority
+
+
+class WeightedFairPolicy(Policy):
+    """Self-clocked weighted fair queueing across flows.
+
+    Each task gets the virtual finish tag max(V, flow's last tag) +
+    service / weight, where V is the tag of the last dispatched task.
+    By default flows are priority levels weighted by the priority, so
+    every level gets a share of the workers in proportion to its priority.
+    """
+
+    def __init__(self, flow: Callable[[Task], Hashable] = lambda t: t.priority,
+                 weight: Callable[[Hashable], float] = float):
+        self.flow = flow
+        self.weight = weight
+        self._vtime = 0.0
+        self._last: dict = {}
+
+    def key(self, task: Task, service: float) -> float:
+        f = self.flow(task)
+        start = max(self._vtime, self._last.get(f, 0.0))
+        finish = self._last[f] = start + service / self.weight(f)
+        return finish
+
+    def on_dispatch(self, key: float) -> None:
+        self._vtime = key
+
+
+POLICIES = {
+    "priority": PriorityPolicy,
+    "edf": EDFPolicy,
+    "aging": AgingPolicy,
+    "wfq": WeightedFairPolicy,
+}
+
+
+class WaitHistogram:
+    """Log-bucketed histogram: O(1) add and memory independent of the
+    number of samples; percentiles are within `precision` (relative)."""
+
+    def __init__(self, precision: float = 0.01):
+        self._scale = 1.0 / math.log1p(precision)
+        self.counts: dict = {}
+        self.zeros = 0
+        self.total = 0
+
+    def add(self, x: float) -> None:
+        self.total += 1
+        if x <= 0.0:
+            self.zeros += 1
+        else:
+            b = math.floor(math.log(x) * self._scale)
+            self.counts[b] = self.counts.get(b, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        rank = q / 100.0 * self.total
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return math.exp((b + 0.5) / self._scale)
+        return 0.0
+
+
+def simulate(tasks: Iterable[Task], workers: int = 1, service=1.0,
+             policy: Optional[Policy] = None) -> dict:
+    """Discrete-event simulation of `workers` parallel servers.
+
+    `tasks` is any iterable ordered by arrival; it is consumed lazily, so
+    memory is bounded by the ready queue. `service` is a fixed duration or
+    a callable task -> duration (see *_service above). Worker completions
+    live in an event heap keyed on time and are merged with the arrival
+    stream; the ready queue is ordered by `policy` (PriorityPolicy by
+    default). Both queues use heapq so each event costs a C-level heap
+    operation.
+
+    Returns throughput, utilization, wait mean/percentiles/max and the
+    deadline-miss count and rate; an empty stream gives the same keys with
+    zero throughput and utilization and NaN waits and miss rate.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if not callable(service):
+        service = constant_service(float(service))
+    policy = policy or PriorityPolicy()
+    key_of, on_dispatch = policy.key, policy.on_dispatch
+    push, pop = heapq.heappush, heapq.heappop
+    hist = WaitHistogram()
+    add_wait = hist.add
+
+    ready: list = []    # (key, seq, task, service time)
+    busy: list = []     # completion events: finish time of each busy worker
+    idle = workers
+    seq = served = missed = 0
+    total_wait = max_wait = busy_time = 0.0
+    first_arrival = last_arrival = None
+
+    it = iter(tasks)
+    nxt = next(it, None)
+    if nxt is not None:
+        first_arrival = last_arrival = nxt.arrival
+    while nxt is not None or busy:
+        if nxt is not None and (not busy or nxt.arrival <= busy[0]):
+            now = nxt.arrival
+            if now < last_arrival:
+                raise ValueError("tasks must be ordered by arrival time")
+            last_arrival = now
+            s = service(nxt)
+            push(ready, (key_of(nxt, s), seq, nxt, s))
+            seq += 1
+            nxt = next(it, None)
+            if not idle:
+                continue
+            idle -= 1
+        else:
+            now = pop(busy)
+            if not ready:
+                idle += 1
+                continue
+
+        key, _, task, s = pop(ready)
+        on_dispatch(key)
+        wait = now - task.arrival
+        total_wait += wait
+        if wait > max_wait:
+            max_wait = wait
+        add_wait(wait)
+        finish = now + s
+        push(busy, finish)
+        busy_time += s
+        served += 1
+        if task.deadline is not None and finish > task.deadline:
+            missed += 1
+
+    if not served:
+        # empty stream: same keys, no rates to report
+        return {
+            "served": 0, "workers": workers, "policy": type(policy).__name__,
+            "throughput": 0.0, "utilization": 0.0, "avg_wait": math.nan,
+            "p50_wait": math.nan, "p90_wait": math.nan, "p99_wait": math.nan,
+            "max_wait": math.nan, "missed_deadlines": 0, "miss_rate": math.nan,
+        }
+    makespan = now - first_arrival      # `now` ends at the last completion
+    return {
+        "served": served,
+        "workers": workers,
+        "policy": type(policy).__name__,
+        "throughput": served / makespan if makespan > 0 else math.inf,
+        "utilization": busy_time / (workers * makespan) if makespan > 0 else 1.0,
+        "avg_wait": total_wait / served,
+        "p50_wait": hist.percentile(50),
+        "p90_wait": hist.percentile(90),
+        "p99_wait": hist.percentile(99),
+        "max_wait": max_wait,
+        "missed_deadlines": missed,
+        "miss_rate": missed / served,
+    }
+
+
+def run_policy_comparison(num_tasks: int = 1_000_000, workers: int = 4, utilization: float = 0.9,
+                          service: str = "exp", seed: int = 1, policies=tuple(POLICIES)) -> List[dict]:
+    """Run the same arrival stream through each policy at the given load
+    (mean service time 1.0, arrival rate = utilization * workers)."""
+    services = {"const": lambda: constant_service(1.0),
+                "exp": lambda: exponential_service(1.0, seed),
+                "lognormal": lambda: lognormal_service(1.0, 1.0, seed)}
+    rows = []
+    for name in policies:
+        tasks = generate_tasks(num_tasks, seed, mean_interarrival=1.0 / (utilization * workers))
+        start = _time.perf_counter()
+        res = simulate(tasks, workers, services[service](), POLICIES[name]())
+        res["elapsed"] = _time.perf_counter() - start
+        print(f"{name:<9} served={res['served']} thr={res['throughput']:.3f} util={res['utilization']:.3f} "
+              f"wait avg={res['avg_wait']:.2f} p50={res['p50_wait']:.2f} p90={res['p90_wait']:.2f} "
+              f"p99={res['p99_wait']:.2f} miss={res['miss_rate']:.3%} ({res['elapsed']:.1f}s)")
+        rows.append(res)
+    return rows
+
+
+def _drain_with_cancels(pq, ops: List[bool], victims: List[int], cancel) -> float:
+    """Run `ops` (True = cancel the next live victim, False = extract_max),
+    then drain the heap. `cancel(pq, task_id)` returns the heap to use next."""
+    alive = set(victims)
+    v = 0
+    start = _time.perf_counter()
+    for is_cancel in ops:
+        if is_cancel:
+            while v < len(victims) and victims[v] not in alive:
+                v += 1
+            if v < len(victims):
+                alive.discard(victims[v])
+                pq = cancel(pq, victims[v])
+        else:
+            job = pq.extract_max()
+            if job is not None:
+                alive.discard(job.task_id)
+    while not pq.is_empty():
+        pq.extract_max()
+    return _time.perf_counter() - start
+
+
+def _cancel_by_rebuild(pq: MaxHeap, task_id: int) -> MaxHeap:
+    return MaxHeap.from_tasks(t for t in pq.heap if t.task_id != task_id)
+
+
+def _cancel_by_remove(pq: MaxHeap, task_id: int) -> MaxHeap:
+    pq.remove(task_id)
+    return pq
+
+
+def run_cancel_benchmark(num_tasks: int = 5000, cancel_rate: float = 0.3, seed: int = 1) -> dict:
+    """Drain a heap of `num_tasks` tasks where each step cancels a random live
+    task with probability `cancel_rate` instead of serving one. Compares
+    rebuilding the heap per cancel, MaxHeap.remove and lazy deletion."""
+    rng = random.Random(seed)
+    prios = [rng.randint(1, 100) for _ in range(num_tasks)]
+    ops = [rng.random() < cancel_rate for _ in range(num_tasks)]
+    victims = list(range(num_tasks))
+    rng.shuffle(victims)
+
+    modes = {
+        "rebuild": (MaxHeap, _cancel_by_rebuild),
+        "remove": (MaxHeap, _cancel_by_remove),
+        "lazy": (lambda: MaxHeap(lazy_delete=True), _cancel_by_remove),
+    }
+    res = {"num_tasks": num_tasks, "cancel_rate": cancel_rate, "cancels": sum(ops)}
+    for name, (make, cancel) in modes.items():
+        pq = make()
+        pq.insert_many(Task(i, p) for i, p in enumerate(prios))
+        res[name] = _drain_with_cancels(pq, ops, victims, cancel)
+    return res
+
+
 if __name__ == "__main__":
-    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
-    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
-    res = run_simulation(n, seed)
-    print(res)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if len(args) > 0 else 200
+    seed = int(args[1]) if len(args) > 1 else 42
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    if "write-trace" in opts:
+        print(write_trace(opts["write-trace"], _random_arrivals(n, seed)), "records written")
+    elif "trace" in opts and "--engine" in sys.argv:
+        services = {"const": constant_service(1.0), "exp": exponential_service(1.0, seed),
+                    "lognormal": lognormal_service(1.0, 1.0, seed)}
+        print(simulate(read_trace(opts["trace"]), int(opts.get("workers", 1)),
+                       services[opts.get("service", "const")], POLICIES[opts.get("policy", "priority")]()))
+    elif "trace" in opts:
+        print(run_simulation(tasks=read_trace(opts["trace"])))
+    elif "--engine" in sys.argv:
+        run_policy_comparison(n, int(opts.get("workers", 4)), float(opts.get("load", 0.9)),
+                              opts.get("service", "exp"), seed,
+                              [opts["policy"]] if "policy" in opts else tuple(POLICIES))
+    elif "cancel-rate" in opts:
+        print(run_cancel_benchmark(n, float(opts["cancel-rate"]), seed))
+    else:
+        print(run_simulation(n, seed))
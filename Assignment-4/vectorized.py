@@ -0,0 +1,188 @@
+"""NumPy fast path for homogeneous integer/float inputs.
+
+The sort entry points (merge_sort, quick_sort, heapsort, randomized_quicksort,
+QuickSortAnalyzer) call `try_vectorized` first. It returns None whenever the
+input cannot be handled as one numeric dtype (NumPy missing, mixed or
+non-numeric types, ints beyond 64 bits, lists below VECTOR_MIN_SIZE), and the
+caller then falls back to its pure-Python path.
+
+Functions:
+ - try_vectorized(algorithm, data, min_size=VECTOR_MIN_SIZE, **kwargs): sorted copy or None.
+ - vectorized_quicksort(a, pivot="median3", rng=None): boolean-mask block partitioning.
+ - vectorized_merge_sort(a): bottom-up merge over blocks sorted by np.sort.
+ - merge_sorted_runs(a, bounds): bottom-up merge of sorted runs a[bounds[i]:bounds[i+1]].
+ - vectorized_heapsort(a): NumPy's heapsort kind.
+ - restore_list_type(values, original): a sorted list in the container type of `original`.
+"""
+import array
+import random
+from typing import Any, Callable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every caller has a pure-Python path
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Lists shorter than this are not worth the conversion cost.
+VECTOR_MIN_SIZE = 1024
+# Segments at or below this size are finished with np.sort.
+BLOCK_SIZE = 4096
+
+_ARRAY_TYPECODES = "bBhHiIlLqQfd"
+
+
+def as_numeric_array(data: Any, min_size: int = VECTOR_MIN_SIZE) -> Optional["np.ndarray"]:
+    """Return a fresh contiguous 1-D copy of `data` with one numeric dtype, or None."""
+    if np is None:
+        return None
+    if isinstance(data, np.ndarray):
+        if data.ndim != 1 or data.dtype.kind not in "iuf":
+            return None
+        return np.array(data, copy=True, order="C")
+    if isinstance(data, array.array):
+        if data.typecode not in _ARRAY_TYPECODES:
+            return None
+        return np.frombuffer(data, dtype=np.dtype(data.typecode)).copy()
+    if isinstance(data, list):
+        if len(data) < min_size:
+            return None
+        types = set(map(type, data))
+        if types == {int}:
+            dtype = np.int64
+        elif types == {float}:
+            dtype = np.float64
+        else:
+            return None
+        try:
+            return np.array(data, dtype=dtype)
+        except OverflowError:
+            return None
+    return None
+
+
+def restore_type(result: "np.ndarray", original: Any) -> Any:
+    """Convert a sorted ndarray back to the container type of `original`."""
+    if isinstance(original, np.ndarray):
+        return result
+    if isinstance(original, array.array):
+        out = array.array(original.typecode)
+        out.frombytes(result.tobytes())
+        return out
+    return result.tolist()
+
+
+def restore_list_type(values: List, original: Any) -> Any:
+    """Convert a sorted list from a pure-Python path back to the container type of `original`."""
+    if isinstance(original, array.array):
+        return array.array(original.typecode, values)
+    if np is not None and isinstance(original, np.ndarray):
+        return np.array(values, dtype=original.dtype)
+    return values
+
+
+def try_vectorized(algorithm: Callable, data: Any, min_size: int = VECTOR_MIN_SIZE, **kwargs) -> Any:
+    """Sort a copy of `data` with `algorithm` if it is homogeneous numeric data.
+
+    Returns the sorted copy in the same container type as `data` (list,
+    array.array or ndarray), or None if the caller should use its pure-Python
+    path. NaNs are moved to the end, matching np.sort.
+    """
+    a = as_numeric_array(data, min_size)
+    if a is None:
+        return None
+    if a.dtype.kind == "f":
+        nan = np.isnan(a)
+        if nan.any():
+            rest = a[~nan]
+            algorithm(rest, **kwargs)
+            return restore_type(np.concatenate((rest, a[nan])), data)
+    algorithm(a, **kwargs)
+    return restore_type(a, data)
+
+
+def vectorized_quicksort(a: "np.ndarray", pivot: str = "median3",
+                         rng: Optional[random.Random] = None, block: int = BLOCK_SIZE) -> "np.ndarray":
+    """Sort `a` in place with three-way quicksort whose partitions are boolean masks.
+
+    Each segment larger than `block` is split into < pivot, == pivot and
+    > pivot with one pass of vectorised comparisons; smaller segments are
+    finished with np.sort. `pivot` is "median3" or "random".
+    """
+    if rng is None:
+        rng = random
+    stack = [(0, len(a))]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo <= block:
+            a[lo:hi].sort()
+            continue
+        seg = a[lo:hi]
+        if pivot == "random":
+            p = seg[rng.randrange(hi - lo)]
+        else:
+            p = np.sort(seg[[0, (hi - lo) // 2, hi - lo - 1]])[1]
+        less = seg < p
+        greater = seg > p
+        equal = ~(less | greater)
+        n_less = int(np.count_nonzero(less))
+        n_greater = int(np.count_nonzero(greater))
+        seg[:] = np.concatenate((seg[less], seg[equal], seg[greater]))
+        stack.append((lo, lo + n_less))
+        stack.append((hi - n_greater, hi))
+    return a
+
+
+def _merge_into(left: "np.ndarray", right: "np.ndarray", out: "np.ndarray") -> None:
+    """Stable merge of two sorted arrays into `out` via searchsorted ranks."""
+    if len(right) == 0:
+        out[:] = left
+        return
+    out[np.arange(len(left)) + np.searchsorted(right, left, side="left")] = left
+    out[np.arange(len(right)) + np.searchsorted(left, right, side="right")] = right
+
+
+def merge_sorted_runs(a: "np.ndarray", bounds: List[int]) -> "np.ndarray":
+    """Merge the sorted runs a[bounds[i]:bounds[i + 1]] in place, pairwise and bottom-up.
+
+    `bounds` starts at 0 and ends at len(a). Merging ping-pongs between `a`
+    and one auxiliary buffer of the same size.
+    """
+    src = a
+    dst = None
+    while len(bounds) > 2:
+        if dst is None:
+            dst = np.empty_like(a)
+        merged = [0]
+        for k in range(0, len(bounds) - 1, 2):
+            lo = bounds[k]
+            if k + 2 < len(bounds):
+                hi = bounds[k + 2]
+                _merge_into(src[lo:bounds[k + 1]], src[bounds[k + 1]:hi], dst[lo:hi])
+            else:
+                hi = bounds[k + 1]
+                dst[lo:hi] = src[lo:hi]
+            merged.append(hi)
+        bounds = merged
+        src, dst = dst, src
+    if src is not a:
+        a[:] = src
+    return a
+
+
+def vectorized_merge_sort(a: "np.ndarray", block: int = BLOCK_SIZE) -> "np.ndarray":
+    """Sort `a` in place: np.sort each block, then merge runs bottom-up."""
+    n = len(a)
+    full = n - n % block
+    if full:
+        a[:full].reshape(-1, block).sort(axis=1, kind="stable")
+    if full < n:
+        a[full:].sort(kind="stable")
+    return merge_sorted_runs(a, list(range(0, n, block)) + [n])
+
+
+def vectorized_heapsort(a: "np.ndarray") -> "np.ndarray":
+    """Sort `a` in place with NumPy's heapsort kind."""
+    a.sort(kind="heapsort")
+    return a
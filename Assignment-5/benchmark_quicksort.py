@@ -11,20 +11,51 @@ import time
 import random
 import csv
 import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Dict, Tuple
-from quicksort import QuickSortAnalyzer
+from quicksort import QuickSortAnalyzer, PIVOT_POLICIES
 import matplotlib.pyplot as plt
 import numpy as np
 
+# The shared benchmark results store lives in Assignment-4.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Assignment-4'))
+from results_store import ResultsStore, code_hash, input_hash
+
 
 class QuickSortBenchmark:
     """
     A class to benchmark and compare Quicksort implementations.
     """
     
-    def __init__(self):
-        """Initialize the benchmark suite."""
-        self.analyzer = QuickSortAnalyzer()
+    # Extra partition-scheme series: (result key, analyzer method, scheme, CSV prefix)
+    PARTITION_SERIES = [
+        ('deterministic_three_way', 'quicksort_deterministic', 'three_way', 'Det3W'),
+        ('randomized_three_way', 'quicksort_randomized', 'three_way', 'Rand3W'),
+        ('deterministic_dual_pivot', 'quicksort_deterministic', 'dual_pivot', 'DetDP'),
+        ('randomized_dual_pivot', 'quicksort_randomized', 'dual_pivot', 'RandDP'),
+    ]
+    
+    DISTRIBUTIONS = ('random', 'sorted', 'reverse_sorted', 'nearly_sorted', 'duplicates')
+    
+    def __init__(self, store: ResultsStore = None):
+        """
+        Initialize the benchmark suite.
+        
+        Args:
+            store: Optional ResultsStore; cells already measured with the same
+                input and code are read from it instead of being re-run
+        """
+        # Timings come from the uninstrumented build, counts from the counting one
+        self.analyzer = QuickSortAnalyzer(instrument=False)
+        self.counting_analyzer = QuickSortAnalyzer()
+        self.store = store
+        self.code = code_hash(QuickSortAnalyzer.__module__, 'selection_alogorthims',
+                              QuickSortBenchmark._measure_once, _run_cell)
         self.results = []
     
     # ==================== INPUT GENERATION ====================
@@ -110,29 +141,76 @@ class QuickSortBenchmark:
             random.seed(seed)
         return [random.randint(1, num_unique) for _ in range(n)]
     
+    @classmethod
+    def generate_input(cls, dist_name: str, size: int) -> List:
+        """
+        Generate the benchmark input for one (distribution, size) cell.
+        
+        Args:
+            dist_name: One of DISTRIBUTIONS
+            size: Size of the array
+            
+        Returns:
+            The same list for the same arguments (seeded where random)
+        """
+        if dist_name == 'random':
+            return cls.generate_random_array(size, seed=42)
+        if dist_name == 'sorted':
+            return cls.generate_sorted_array(size)
+        if dist_name == 'reverse_sorted':
+            return cls.generate_reverse_sorted_array(size)
+        if dist_name == 'nearly_sorted':
+            return cls.generate_nearly_sorted_array(size, percent_unsorted=0.1, seed=42)
+        if dist_name == 'duplicates':
+            return cls.generate_duplicates_array(size, num_unique=10, seed=42)
+        raise ValueError(f"Unknown distribution: {dist_name}")
+    
     # ==================== BENCHMARKING METHODS ====================
     
-    def benchmark_implementation(self, sort_func, arr: List, name: str) -> Tuple[float, int, int]:
+    def benchmark_implementation(self, method_name: str, arr: List, name: str,
+                                 partition_scheme: str = "two_way",
+                                 pivot_policy: str = None) -> Tuple[float, int, int]:
         """
         Benchmark a single sort implementation.
         
+        The array is sorted twice: once by the uninstrumented build, which is
+        timed, and once by the counting build, which supplies the comparison
+        and swap counts. The randomized method draws its own pivots in each
+        run, so its counts describe a run of the same input, not the timed one.
+        
         Args:
-            sort_func: The sorting function to benchmark
+            method_name: Name of the QuickSortAnalyzer sort method
             arr: Array to sort (will be copied)
             name: Name of the implementation
+            partition_scheme: One of PARTITION_SCHEMES
+            pivot_policy: PIVOT_POLICIES name, for quicksort_iterative only
             
         Returns:
             Tuple of (execution_time, comparisons, swaps)
         """
+        kwargs = {'partition_scheme': partition_scheme}
+        if pivot_policy is not None:
+            kwargs['pivot_policy'] = pivot_policy
+        if self.store is not None:
+            params = dict(kwargs, n=len(arr), runner='single')
+            return tuple(self.store.measure(
+                method_name, params, input_hash(arr), self.code,
+                lambda: self._measure_once(method_name, arr, kwargs)))
+        return self._measure_once(method_name, arr, kwargs)
+    
+    def _measure_once(self, method_name: str, arr: List, kwargs: Dict) -> Tuple[float, int, int]:
+        sort_func = getattr(self.analyzer, method_name)
         test_arr = arr.copy()
-        self.analyzer.reset_counters()
         
         start_time = time.perf_counter()
-        sort_func(test_arr)
+        sort_func(test_arr, **kwargs)
         end_time = time.perf_counter()
         
         execution_time = end_time - start_time
-        comparisons, swaps = self.analyzer.get_statistics()
+        
+        self.counting_analyzer.reset_counters()
+        getattr(self.counting_analyzer, method_name)(arr.copy(), **kwargs)
+        comparisons, swaps = self.counting_analyzer.get_statistics()
         
         return execution_time, comparisons, swaps
     
@@ -149,17 +227,9 @@ class QuickSortBenchmark:
         if sizes is None:
             sizes = [100, 500, 1000, 5000, 10000]
         
-        distributions = {
-            'random': self.generate_random_array,
-            'sorted': self.generate_sorted_array,
-            'reverse_sorted': self.generate_reverse_sorted_array,
-            'nearly_sorted': self.generate_nearly_sorted_array,
-            'duplicates': self.generate_duplicates_array,
-        }
-        
         all_results = {}
         
-        for dist_name, dist_func in distributions.items():
+        for dist_name in self.DISTRIBUTIONS:
             print(f"\n{'='*60}")
             print(f"Testing distribution: {dist_name.upper()}")
             print(f"{'='*60}")
@@ -170,25 +240,18 @@ class QuickSortBenchmark:
                 print(f"\nArray size: {size}")
                 
                 # Generate test array
-                if dist_name == 'nearly_sorted':
-                    test_arr = dist_func(size, percent_unsorted=0.1, seed=42)
-                elif dist_name == 'duplicates':
-                    test_arr = dist_func(size, num_unique=10, seed=42)
-                elif dist_name == 'random':
-                    test_arr = dist_func(size, seed=42)
-                else:
-                    test_arr = dist_func(size)
+                test_arr = self.generate_input(dist_name, size)
                 
                 # Benchmark deterministic quicksort
                 time_det, comp_det, swap_det = self.benchmark_implementation(
-                    self.analyzer.quicksort_deterministic,
+                    'quicksort_deterministic',
                     test_arr,
                     "Deterministic"
                 )
                 
                 # Benchmark randomized quicksort
                 time_rand, comp_rand, swap_rand = self.benchmark_implementation(
-                    self.analyzer.quicksort_randomized,
+                    'quicksort_randomized',
                     test_arr,
                     "Randomized"
                 )
@@ -209,15 +272,205 @@ class QuickSortBenchmark:
                     'speedup': time_det / time_rand if time_rand > 0 else 0
                 }
                 
+                # Benchmark the three-way and dual-pivot partition schemes
+                for key, method_name, scheme, _ in self.PARTITION_SERIES:
+                    t, comp, swaps = self.benchmark_implementation(method_name, test_arr, key, scheme)
+                    result[key] = {'time': t, 'comparisons': comp, 'swaps': swaps}
+                
                 all_results[dist_name][size] = result
                 
                 # Print results
                 print(f"  Deterministic: Time={time_det:.6f}s, Comparisons={comp_det}, Swaps={swap_det}")
                 print(f"  Randomized:    Time={time_rand:.6f}s, Comparisons={comp_rand}, Swaps={swap_rand}")
+                for key, _, _, _ in self.PARTITION_SERIES:
+                    r = result[key]
+                    print(f"  {key}: Time={r['time']:.6f}s, Comparisons={r['comparisons']}, Swaps={r['swaps']}")
                 print(f"  Speedup: {result['speedup']:.2f}x")
         
         return all_results
     
+    def run_parallel_benchmark(self, sizes: List[int] = None, workers: int = None,
+                               warmup: int = 2, min_reps: int = 5, max_reps: int = 50,
+                               rel_ci: float = 0.05, time_budget: float = 30.0,
+                               pin_cpus: bool = True) -> Dict:
+        """
+        Run the comprehensive benchmark as independent jobs on a process pool.
+        
+        Each (series, distribution, size) cell is one job: after `warmup`
+        untimed runs it repeats the timed run until the 95% confidence interval
+        of the median is within `rel_ci` of the median (at least `min_reps`,
+        at most `max_reps` runs or `time_budget` seconds). Workers are pinned
+        to one CPU each where the OS allows it.
+        
+        The result has the layout of run_comprehensive_benchmark, with 'time'
+        set to the median and 'median', 'q1', 'q3', 'iqr', 'ci_low', 'ci_high'
+        and 'reps' added, so save_results_to_json/csv accept it unchanged.
+        With a store, cells already measured under the same repetition policy
+        are read from it and only the missing ones are submitted, so an
+        interrupted sweep resumes where it stopped.
+        
+        Args:
+            sizes: List of array sizes to test
+            workers: Pool size (default: number of usable CPUs)
+            warmup, min_reps, max_reps, rel_ci, time_budget: Repetition policy
+            pin_cpus: Pin each worker process to its own CPU
+            
+        Returns:
+            Dictionary containing all benchmark results
+        """
+        if sizes is None:
+            sizes = [100, 500, 1000, 5000, 10000]
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+        workers = workers or len(cpus)
+        
+        series = [('deterministic', 'quicksort_deterministic', 'two_way'),
+                  ('randomized', 'quicksort_randomized', 'two_way')]
+        series += [(key, method, scheme) for key, method, scheme, _ in self.PARTITION_SERIES]
+        
+        cpu_queue = multiprocessing.Queue()
+        for i in range(workers):
+            cpu_queue.put(cpus[i % len(cpus)] if pin_cpus else None)
+        
+        all_results = {d: {size: {'size': size, 'distribution': d} for size in sizes}
+                       for d in self.DISTRIBUTIONS}
+        policy = (warmup, min_reps, max_reps, rel_ci, time_budget)
+        params = dict(zip(('warmup', 'min_reps', 'max_reps', 'rel_ci', 'time_budget'), policy),
+                      runner='parallel')
+        total = len(series) * len(sizes) * len(self.DISTRIBUTIONS)
+        cells = []
+        # Largest inputs first so the long jobs do not end up last
+        for size in sorted(sizes, reverse=True):
+            for d in self.DISTRIBUTIONS:
+                inp = input_hash(self.generate_input(d, size)) if self.store is not None else None
+                for key, method, scheme in series:
+                    cell_params = dict(params, n=size, partition_scheme=scheme)
+                    cached = (self.store.get(method, cell_params, inp, self.code)
+                              if self.store is not None else None)
+                    if cached is not None:
+                        all_results[d][size][key] = cached
+                    else:
+                        cells.append((key, method, scheme, d, size, cell_params, inp))
+        if len(cells) < total:
+            print(f"{total - len(cells)} of {total} cells read from the results store")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_pin_worker,
+                                 initargs=(cpu_queue,)) as pool:
+            futures = {
+                pool.submit(_run_cell, method, scheme, d, size, *policy): (key, method, d, size, cell_params, inp)
+                for key, method, scheme, d, size, cell_params, inp in cells
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                key, method, d, size, cell_params, inp = futures[future]
+                r = future.result()
+                if self.store is not None:
+                    self.store.put(method, cell_params, inp, self.code, r)
+                all_results[d][size][key] = r
+                print(f"[{done}/{len(futures)}] {d:<15} n={size:<7} {key:<26} "
+                      f"median={r['median']:.6f}s IQR={r['iqr']:.6f}s "
+                      f"CI=[{r['ci_low']:.6f}, {r['ci_high']:.6f}] reps={r['reps']}")
+        
+        for size_results in all_results.values():
+            for result in size_results.values():
+                t_rand = result['randomized']['time']
+                result['speedup'] = result['deterministic']['time'] / t_rand if t_rand > 0 else 0
+        return all_results
+    
+    def run_vectorized_benchmark(self, sizes: List[int] = None) -> Dict:
+        """
+        Compare the pure-Python and NumPy paths of both quicksort methods on
+        random integer data, given as a list and as a NumPy int64 array.
+        
+        Args:
+            sizes: List of array sizes to test
+            
+        Returns:
+            Dictionary mapping size -> {series name: time in seconds}
+        """
+        if sizes is None:
+            sizes = [10000, 100000, 1000000]
+        
+        pure = QuickSortAnalyzer()
+        vectorized = QuickSortAnalyzer(vectorize=True)
+        all_results = {}
+        
+        for size in sizes:
+            test_arr = self.generate_random_array(size, seed=42)
+            result = {}
+            for method_name in ('quicksort_deterministic', 'quicksort_randomized'):
+                label = method_name.replace('quicksort_', '')
+                for path, analyzer, data in (
+                    ('python', pure, test_arr),
+                    ('numpy_list', vectorized, test_arr),
+                    ('numpy_array', vectorized, np.array(test_arr, dtype=np.int64)),
+                ):
+                    sort_func = getattr(analyzer, method_name)
+                    start_time = time.perf_counter()
+                    sort_func(data.copy())
+                    result[f'{label}_{path}'] = time.perf_counter() - start_time
+            
+            all_results[size] = result
+            print(f"\nArray size: {size}")
+            for name, t in result.items():
+                print(f"  {name:<26} Time={t:.6f}s")
+        
+        return all_results
+    
+    def run_pivot_policy_benchmark(self, sizes: List[int] = None,
+                                   partition_scheme: str = "two_way") -> Dict:
+        """
+        Sweep every pivot policy of quicksort_iterative across the distributions.
+        
+        Args:
+            sizes: List of array sizes to test
+            partition_scheme: "two_way" or "three_way" (dual-pivot ignores the policy)
+            
+        Returns:
+            Dictionary results[distribution][size][policy] =
+            {'time', 'comparisons', 'swaps'}
+        """
+        if sizes is None:
+            sizes = [100, 500, 1000, 5000, 10000]
+        
+        all_results = {}
+        for dist_name in self.DISTRIBUTIONS:
+            print(f"\n{'='*60}")
+            print(f"Pivot policies: {dist_name.upper()}")
+            print(f"{'='*60}")
+            all_results[dist_name] = {}
+            for size in sizes:
+                print(f"\nArray size: {size}")
+                test_arr = self.generate_input(dist_name, size)
+                result = {}
+                for policy in PIVOT_POLICIES:
+                    t, comp, swaps = self.benchmark_implementation(
+                        'quicksort_iterative', test_arr, policy, partition_scheme, pivot_policy=policy)
+                    result[policy] = {'time': t, 'comparisons': comp, 'swaps': swaps}
+                    print(f"  {policy:<18} Time={t:.6f}s, Comparisons={comp}, Swaps={swaps}")
+                all_results[dist_name][size] = result
+        
+        return all_results
+    
+    def save_pivot_policy_results_to_csv(self, results: Dict,
+                                         filename: str = 'quicksort_pivot_policies.csv'):
+        """
+        Save run_pivot_policy_benchmark results to a CSV file, one row per cell.
+        
+        Args:
+            results: Dictionary of pivot-policy benchmark results
+            filename: Output CSV filename
+        """
+        with open(filename, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['Distribution', 'Size', 'Policy',
+                                                         'Time', 'Comp', 'Swaps'])
+            writer.writeheader()
+            for dist_name, size_results in results.items():
+                for size, result in size_results.items():
+                    for policy, r in result.items():
+                        writer.writerow({'Distribution': dist_name, 'Size': size, 'Policy': policy,
+                                         'Time': r['time'], 'Comp': r['comparisons'], 'Swaps': r['swaps']})
+        
+        print(f"\nResults saved to {filename}")
+    
     def save_results_to_csv(self, results: Dict, filename: str = 'quicksort_benchmarks.csv'):
         """
         Save benchmark results to a CSV file.
@@ -231,12 +484,14 @@ class QuickSortBenchmark:
                 'Distribution', 'Size', 'Det_Time', 'Det_Comp', 'Det_Swaps',
                 'Rand_Time', 'Rand_Comp', 'Rand_Swaps', 'Speedup'
             ]
+            for _, _, _, prefix in self.PARTITION_SERIES:
+                fieldnames += [f'{prefix}_Time', f'{prefix}_Comp', f'{prefix}_Swaps']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
             
             for dist_name, size_results in results.items():
                 for size, result in size_results.items():
-                    writer.writerow({
+                    row = {
                         'Distribution': dist_name,
                         'Size': size,
                         'Det_Time': result['deterministic']['time'],
@@ -246,7 +501,13 @@ class QuickSortBenchmark:
                         'Rand_Comp': result['randomized']['comparisons'],
                         'Rand_Swaps': result['randomized']['swaps'],
                         'Speedup': result['speedup']
-                    })
+                    }
+                    for key, _, _, prefix in self.PARTITION_SERIES:
+                        if key in result:
+                            row[f'{prefix}_Time'] = result[key]['time']
+                            row[f'{prefix}_Comp'] = result[key]['comparisons']
+                            row[f'{prefix}_Swaps'] = result[key]['swaps']
+                    writer.writerow(row)
         
         print(f"\nResults saved to {filename}")
     
@@ -264,6 +525,69 @@ class QuickSortBenchmark:
         print(f"Results saved to {filename}")
 
 
+# ==================== PARALLEL RUNNER JOBS ====================
+
+def _pin_worker(cpu_queue):
+    """Process-pool initializer: pin this worker to the next CPU in the queue."""
+    cpu = cpu_queue.get()
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+
+
+def _median_ci(samples: List[float], z: float = 1.96) -> Tuple[float, float]:
+    """
+    Distribution-free confidence interval for the median, from the order
+    statistics whose ranks are n/2 -/+ z*sqrt(n)/2.
+    """
+    s = sorted(samples)
+    n = len(s)
+    half = z * math.sqrt(n) / 2
+    lo = max(0, math.floor(n / 2 - half) - 1)
+    hi = min(n - 1, math.ceil(n / 2 + half))
+    return s[lo], s[hi]
+
+
+def _run_cell(method_name: str, scheme: str, dist_name: str, size: int,
+              warmup: int, min_reps: int, max_reps: int, rel_ci: float,
+              time_budget: float) -> Dict:
+    """Time one (series, distribution, size) cell; runs in a worker process."""
+    arr = QuickSortBenchmark.generate_input(dist_name, size)
+    sort_func = getattr(QuickSortAnalyzer(instrument=False), method_name)
+    for _ in range(warmup):
+        sort_func(arr.copy(), partition_scheme=scheme)
+    
+    times = []
+    deadline = time.perf_counter() + time_budget
+    while len(times) < max_reps:
+        test_arr = arr.copy()
+        start_time = time.perf_counter()
+        sort_func(test_arr, partition_scheme=scheme)
+        times.append(time.perf_counter() - start_time)
+        if len(times) >= min_reps:
+            ci_low, ci_high = _median_ci(times)
+            if ci_high - ci_low <= rel_ci * statistics.median(times) or time.perf_counter() > deadline:
+                break
+    
+    counting = QuickSortAnalyzer()
+    getattr(counting, method_name)(arr.copy(), partition_scheme=scheme)
+    
+    median = statistics.median(times)
+    q1, _, q3 = statistics.quantiles(times, n=4) if len(times) > 1 else (median, median, median)
+    ci_low, ci_high = _median_ci(times)
+    return {
+        'time': median,
+        'comparisons': counting.comparisons,
+        'swaps': counting.swaps,
+        'median': median,
+        'q1': q1,
+        'q3': q3,
+        'iqr': q3 - q1,
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'reps': len(times),
+    }
+
+
 def plot_results(results: Dict):
     """
     Create visualizations of the benchmark results.
@@ -287,6 +611,11 @@ def plot_results(results: Dict):
         ax = axes[idx]
         ax.plot(sizes, det_times, 'o-', label='Deterministic', linewidth=2, markersize=6)
         ax.plot(sizes, rand_times, 's-', label='Randomized', linewidth=2, markersize=6)
+        for key, _, _, _ in QuickSortBenchmark.PARTITION_SERIES:
+            if key not in size_results[sizes[0]]:
+                continue
+            times = [size_results[s][key]['time'] for s in sizes]
+            ax.plot(sizes, times, '.--', label=key.replace('_', ' ').title(), linewidth=1.5)
         ax.set_xlabel('Array Size', fontsize=11)
         ax.set_ylabel('Time (seconds)', fontsize=11)
         ax.set_title(f'Quicksort Performance on {dist_name.replace("_", " ").title()} Arrays', 
@@ -306,15 +635,26 @@ def main():
     print("QUICKSORT EMPIRICAL ANALYSIS".center(70))
     print("=" * 70)
     
-    benchmark = QuickSortBenchmark()
-    
-    # Run comprehensive benchmarks
-    sizes = [100, 500, 1000, 5000, 10000]
-    results = benchmark.run_comprehensive_benchmark(sizes)
-    
-    # Save results
-    benchmark.save_results_to_csv(results, 'quicksort_benchmarks.csv')
-    benchmark.save_results_to_json(results, 'quicksort_benchmarks.json')
+    with ResultsStore() as store:
+        benchmark = QuickSortBenchmark(store)
+        
+        # `--pivot-policies` sweeps the PivotPolicy variants of quicksort_iterative instead
+        if "--pivot-policies" in sys.argv:
+            results = benchmark.run_pivot_policy_benchmark()
+            benchmark.save_pivot_policy_results_to_csv(results)
+            return
+        
+        # Run comprehensive benchmarks (`--parallel` uses the process-pool runner);
+        # cells already in the shared results store are not re-run
+        sizes = [100, 500, 1000, 5000, 10000]
+        if "--parallel" in sys.argv:
+            results = benchmark.run_parallel_benchmark(sizes)
+        else:
+            results = benchmark.run_comprehensive_benchmark(sizes)
+        
+        # Save results
+        benchmark.save_results_to_csv(results, 'quicksort_benchmarks.csv')
+        benchmark.save_results_to_json(results, 'quicksort_benchmarks.json')
     
     # Create visualizations
     plot_results(results)
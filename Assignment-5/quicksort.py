@@ -6,23 +6,335 @@ Author: MSCS532 Student
 Date: 2026
 """
 
+import ast
+import inspect
+import math
+import os
 import random
 import sys
+import textwrap
+import types
+from abc import ABC, abstractmethod
 from typing import List, Tuple
 
 # Increase recursion limit for large arrays
 sys.setrecursionlimit(100000)
 
+# The NumPy fast path is shared with the other assignments (Assignment-4/vectorized.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Assignment-4"))
+from vectorized import HAVE_NUMPY, try_vectorized, vectorized_quicksort
+
+# Median-of-medians selection is shared with Assignment 6
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Assignment-6"))
+from selection_alogorthims import _mom_select
+
+# Supported partition schemes for both quicksort variants
+PARTITION_SCHEMES = ("two_way", "three_way", "dual_pivot")
+
+# Ranges below this size use median-of-three instead of the ninther
+NINTHER_THRESHOLD = 40
+
+
+# ==================== PIVOT POLICIES ====================
+
+def _median_of_three(arr: List, a: int, b: int, c: int) -> Tuple[int, int]:
+    """Return the index of the median of arr[a], arr[b], arr[c] and the comparisons made."""
+    x, y, z = arr[a], arr[b], arr[c]
+    if x < y:
+        if y < z:
+            return b, 2
+        return (c if x < z else a), 3
+    if x < z:
+        return a, 2
+    return (c if y < z else b), 3
+
+
+def _index(arr, value, start: int, stop: int) -> int:
+    """arr.index(value, start, stop), also for NumPy arrays, which have no index()."""
+    if hasattr(arr, "index"):
+        return arr.index(value, start, stop)
+    return next(i for i in range(start, stop) if arr[i] == value)
+
+
+class _Counted:
+    """Wraps a key and counts every comparison made on it (class-wide)."""
+    
+    __slots__ = ("value",)
+    count = 0
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def __lt__(self, other):
+        _Counted.count += 1
+        return self.value < other.value
+    
+    def __gt__(self, other):
+        _Counted.count += 1
+        return self.value > other.value
+    
+    def __eq__(self, other):
+        _Counted.count += 1
+        return self.value == other.value
+    
+    __hash__ = None
+
+
+class PivotPolicy(ABC):
+    """
+    Chooses the pivot of each partition step of quicksort_iterative.
+    
+    choose() returns the pivot index in arr[start..end] together with the
+    number of element comparisons it made, which the analyzer adds to its
+    counter. three_way() tells whether that range must be partitioned into
+    <, == and > the pivot whatever the partition scheme. observe() is called
+    after every partition with the final bounds arr[lt..gt] of the pivot;
+    adaptive policies use it to react to bad splits and may reorder
+    elements, returning the number of swaps they made.
+    
+    A policy may keep state for the duration of one sort, so each sort needs
+    its own instance (quicksort_iterative creates one when given a name).
+    With count=False, bookkeeping that only feeds the counters is skipped.
+    """
+    
+    name = None
+    
+    def __init__(self, count: bool = True):
+        self.count = count
+    
+    @abstractmethod
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        ...
+    
+    def three_way(self, start: int, end: int) -> bool:
+        return False
+    
+    def observe(self, arr: List, start: int, end: int, lt: int, gt: int) -> int:
+        return 0
+
+
+class FirstPivot(PivotPolicy):
+    """First element, as in quicksort_deterministic."""
+    
+    name = "first"
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        return start, 0
+
+
+class RandomPivot(PivotPolicy):
+    """Uniformly random element, as in quicksort_randomized."""
+    
+    name = "random"
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        return random.randint(start, end), 0
+
+
+class MedianOfThreePivot(PivotPolicy):
+    """
+    Median of the first, middle and last elements. Under quicksort_iterative's
+    pivot-to-front partition it degrades to O(n^2) on reverse-sorted input.
+    """
+    
+    name = "median3"
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        if end - start < 2:
+            return start, 0
+        return _median_of_three(arr, start, (start + end) // 2, end)
+
+
+class NintherPivot(PivotPolicy):
+    """
+    Tukey's ninther: the median of the medians of three evenly spaced
+    triples (at most 12 comparisons); median-of-three below NINTHER_THRESHOLD.
+    """
+    
+    name = "ninther"
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        n = end - start + 1
+        if n < 3:
+            return start, 0
+        mid = (start + end) // 2
+        if n < NINTHER_THRESHOLD:
+            return _median_of_three(arr, start, mid, end)
+        step = n // 8
+        a, c1 = _median_of_three(arr, start, start + step, start + 2 * step)
+        b, c2 = _median_of_three(arr, mid - step, mid, mid + step)
+        c, c3 = _median_of_three(arr, end - 2 * step, end - step, end)
+        m, c4 = _median_of_three(arr, a, b, c)
+        return m, c1 + c2 + c3 + c4
+
+
+class SampledMedianPivot(PivotPolicy):
+    """
+    Median of about sqrt(n) evenly spaced elements, found by binary insertion
+    into a sorted sample (O(sqrt(n) log n) comparisons).
+    """
+    
+    name = "sampled_median"
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        n = end - start + 1
+        size = math.isqrt(n) | 1
+        if size < 3:
+            return (start, 0) if n < 3 else _median_of_three(arr, start, (start + end) // 2, end)
+        step = n // size
+        values = []
+        positions = []
+        comparisons = 0
+        for i in range(start + step // 2, start + size * step, step):
+            v = arr[i]
+            lo, hi = 0, len(values)
+            while lo < hi:
+                m = (lo + hi) // 2
+                comparisons += 1
+                if v < values[m]:
+                    hi = m
+                else:
+                    lo = m + 1
+            values.insert(lo, v)
+            positions.insert(lo, i)
+        return positions[size // 2], comparisons
+
+
+class MedianOfMediansPivot(PivotPolicy):
+    """
+    Exact median by median-of-medians selection (_mom_select, Assignment 6):
+    every split is even, at the cost of an O(n) selection per partition step.
+    Comparisons are counted by wrapping the keys, which is skipped when
+    count=False.
+    
+    With distinct keys neither side of a two-way partition exceeds half the
+    range. A larger side means runs of keys equal to the median, so that
+    range's sub-ranges are partitioned three-way, which keeps every side
+    at most half its range.
+    """
+    
+    name = "median_of_medians"
+    
+    def __init__(self, count: bool = True):
+        super().__init__(count)
+        self._three_way = set()     # (start, end) of pending ranges to partition three-way
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        k = (end - start + 2) // 2
+        values = arr[start:end + 1]
+        if not isinstance(values, list):
+            values = values.tolist()    # NumPy slices are views, which _mom_select would reorder
+        if not self.count:
+            return _index(arr, _mom_select(values, k), start, end + 1), 0
+        _Counted.count = 0
+        value = _mom_select([_Counted(x) for x in values], k).value
+        index = _index(arr, value, start, end + 1)
+        return index, _Counted.count + index - start + 1
+    
+    def three_way(self, start: int, end: int) -> bool:
+        return (start, end) in self._three_way
+    
+    def observe(self, arr: List, start: int, end: int, lt: int, gt: int) -> int:
+        inherited = (start, end) in self._three_way
+        self._three_way.discard((start, end))
+        if inherited or max(lt - start, end - gt) > (end - start + 1) // 2:
+            for lo, hi in ((start, lt - 1), (gt + 1, end)):
+                if lo < hi:
+                    self._three_way.add((lo, hi))
+        return 0
+
+
+class AdaptivePivot(PivotPolicy):
+    """
+    pdqsort-style adaptive policy.
+    
+    Pivots are ninthers (median-of-three on small ranges). A partition whose
+    larger side holds more than 7/8 of the range is a bad split: both sides
+    then get elements a quarter of the way in swapped with their ends, which
+    breaks up the pattern that fooled the sampling. As in pdqsort, each
+    range may see log2(n) bad splits among its ancestors; past that it is
+    partitioned three-way around its exact median (median-of-medians). No
+    side then exceeds half the range, even with runs of equal keys, which
+    bounds the remaining work at O(n log n).
+    """
+    
+    name = "adaptive"
+    
+    BAD_SPLIT = 8
+    
+    def __init__(self, count: bool = True):
+        super().__init__(count)
+        self._budget = {}       # (start, end) of a pending range -> bad splits left
+        self._current = 0
+        self._ninther = NintherPivot(count)
+        self._mom = MedianOfMediansPivot(count)
+    
+    def choose(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        self._current = self._budget.pop((start, end), None)
+        if self._current is None:
+            self._current = (end - start + 1).bit_length()
+        if self._current <= 0:
+            return self._mom.choose(arr, start, end)
+        return self._ninther.choose(arr, start, end)
+    
+    def three_way(self, start: int, end: int) -> bool:
+        return self._current <= 0
+    
+    def observe(self, arr: List, start: int, end: int, lt: int, gt: int) -> int:
+        n = end - start + 1
+        budget = self._current
+        swaps = 0
+        if budget > 0 and max(lt - start, end - gt) > n - n // self.BAD_SPLIT:
+            budget -= 1
+            for lo, hi in ((start, lt - 1), (gt + 1, end)):
+                q = (hi - lo + 1) // 4
+                if q:
+                    arr[lo], arr[lo + q] = arr[lo + q], arr[lo]
+                    arr[hi], arr[hi - q] = arr[hi - q], arr[hi]
+                    swaps += 2
+        for lo, hi in ((start, lt - 1), (gt + 1, end)):
+            if lo < hi:
+                self._budget[(lo, hi)] = budget
+        return swaps
+
+
+PIVOT_POLICIES = {
+    "first": FirstPivot,
+    "random": RandomPivot,
+    "median3": MedianOfThreePivot,
+    "ninther": NintherPivot,
+    "sampled_median": SampledMedianPivot,
+    "median_of_medians": MedianOfMediansPivot,
+    "adaptive": AdaptivePivot,
+}
+
 
 class QuickSortAnalyzer:
     """
     A class to implement and analyze both deterministic and randomized Quicksort algorithms.
     """
     
-    def __init__(self):
-        """Initialize the analyzer with counters for comparisons and swaps."""
+    def __init__(self, vectorize: bool = False, instrument: bool = True):
+        """
+        Initialize the analyzer with counters for comparisons and swaps.
+        
+        NumPy arrays and array.array inputs are sorted on the vectorized path
+        unless a non-default partition scheme or pivot policy is requested;
+        set vectorize=True to also send homogeneous int/float lists there.
+        The vectorized path does not update the comparison and swap counters.
+        
+        With instrument=False the sort and partition methods are replaced, for
+        this instance, by copies generated from the same source with every
+        counter update removed (see _build_uninstrumented), so timings do not
+        include the attribute writes. The counters then stay at zero.
+        """
         self.comparisons = 0
         self.swaps = 0
+        self.vectorize = vectorize
+        self.instrument = instrument
+        if not instrument:
+            for name, func in _UNINSTRUMENTED.items():
+                setattr(self, name, types.MethodType(func, self))
     
     def reset_counters(self):
         """Reset comparison and swap counters."""
@@ -31,10 +343,16 @@ class QuickSortAnalyzer:
     
     # ==================== DETERMINISTIC QUICKSORT ====================
     
-    def quicksort_deterministic(self, arr: List, start: int = 0, end: int = None) -> List:
+    def quicksort_deterministic(self, arr: List, start: int = 0, end: int = None,
+                                partition_scheme: str = "two_way") -> List:
         """
         Deterministic Quicksort implementation using first element as pivot.
         
+        With partition_scheme="three_way" the range is split into <, == and > the
+        pivot in one pass, so runs of equal keys are never recursed into again.
+        With partition_scheme="dual_pivot" the first and last elements are used as
+        two pivots (Yaroslavskiy) and the range is split into three parts.
+        
         Time Complexity:
             - Best case: O(n log n) - when pivot divides array evenly
             - Average case: O(n log n) - random distribution
@@ -46,20 +364,38 @@ class QuickSortAnalyzer:
             arr: List to be sorted
             start: Starting index of the subarray
             end: Ending index of the subarray
+            partition_scheme: One of PARTITION_SCHEMES
             
         Returns:
             The sorted list (sorted in-place, also returned for convenience)
         """
+        if partition_scheme not in PARTITION_SCHEMES:
+            raise ValueError(f"Unknown partition scheme: {partition_scheme}")
+        
         if end is None:
+            if self._sort_vectorized(arr, "median3", partition_scheme):
+                return arr
             end = len(arr) - 1
         
         if start < end:
-            # Partition the array and get the pivot position
-            pivot_index = self._partition_deterministic(arr, start, end)
-            
-            # Recursively sort the left and right subarrays
-            self.quicksort_deterministic(arr, start, pivot_index - 1)
-            self.quicksort_deterministic(arr, pivot_index + 1, end)
+            if partition_scheme == "three_way":
+                lt, gt = self._partition_three_way(arr, start, end)
+                self.quicksort_deterministic(arr, start, lt - 1, partition_scheme)
+                self.quicksort_deterministic(arr, gt + 1, end, partition_scheme)
+            elif partition_scheme == "dual_pivot":
+                lp, rp = self._partition_dual_pivot(arr, start, end)
+                self.quicksort_deterministic(arr, start, lp - 1, partition_scheme)
+                # Equal pivots mean everything between them equals the pivot too
+                if arr[lp] != arr[rp]:
+                    self.quicksort_deterministic(arr, lp + 1, rp - 1, partition_scheme)
+                self.quicksort_deterministic(arr, rp + 1, end, partition_scheme)
+            else:
+                # Partition the array and get the pivot position
+                pivot_index = self._partition_deterministic(arr, start, end)
+                
+                # Recursively sort the left and right subarrays
+                self.quicksort_deterministic(arr, start, pivot_index - 1)
+                self.quicksort_deterministic(arr, pivot_index + 1, end)
         
         return arr
     
@@ -107,12 +443,15 @@ class QuickSortAnalyzer:
     
     # ==================== RANDOMIZED QUICKSORT ====================
     
-    def quicksort_randomized(self, arr: List, start: int = 0, end: int = None) -> List:
+    def quicksort_randomized(self, arr: List, start: int = 0, end: int = None,
+                             partition_scheme: str = "two_way") -> List:
         """
         Randomized Quicksort implementation with random pivot selection.
         
         This version randomly selects a pivot, which significantly reduces the probability
         of encountering worst-case scenarios on sorted or reverse-sorted arrays.
+        The "three_way" and "dual_pivot" schemes behave as in quicksort_deterministic,
+        with the pivot(s) drawn at random before partitioning.
         
         Time Complexity:
             - Best case: O(n log n) - lucky pivot choices
@@ -125,20 +464,49 @@ class QuickSortAnalyzer:
             arr: List to be sorted
             start: Starting index of the subarray
             end: Ending index of the subarray
+            partition_scheme: One of PARTITION_SCHEMES
             
         Returns:
             The sorted list (sorted in-place, also returned for convenience)
         """
+        if partition_scheme not in PARTITION_SCHEMES:
+            raise ValueError(f"Unknown partition scheme: {partition_scheme}")
+        
         if end is None:
+            if self._sort_vectorized(arr, "random", partition_scheme):
+                return arr
             end = len(arr) - 1
         
         if start < end:
-            # Partition the array with random pivot and get the pivot position
-            pivot_index = self._partition_randomized(arr, start, end)
-            
-            # Recursively sort the left and right subarrays
-            self.quicksort_randomized(arr, start, pivot_index - 1)
-            self.quicksort_randomized(arr, pivot_index + 1, end)
+            if partition_scheme == "three_way":
+                # Move a random pivot to the front, then partition as usual
+                random_pivot_index = random.randint(start, end)
+                arr[start], arr[random_pivot_index] = arr[random_pivot_index], arr[start]
+                self.swaps += 1
+                lt, gt = self._partition_three_way(arr, start, end)
+                self.quicksort_randomized(arr, start, lt - 1, partition_scheme)
+                self.quicksort_randomized(arr, gt + 1, end, partition_scheme)
+            elif partition_scheme == "dual_pivot":
+                # Move two distinct random pivots to the ends
+                i, j = random.sample(range(start, end + 1), 2)
+                arr[start], arr[i] = arr[i], arr[start]
+                if j == start:
+                    j = i
+                arr[end], arr[j] = arr[j], arr[end]
+                self.swaps += 2
+                lp, rp = self._partition_dual_pivot(arr, start, end)
+                self.quicksort_randomized(arr, start, lp - 1, partition_scheme)
+                # Equal pivots mean everything between them equals the pivot too
+                if arr[lp] != arr[rp]:
+                    self.quicksort_randomized(arr, lp + 1, rp - 1, partition_scheme)
+                self.quicksort_randomized(arr, rp + 1, end, partition_scheme)
+            else:
+                # Partition the array with random pivot and get the pivot position
+                pivot_index = self._partition_randomized(arr, start, end)
+                
+                # Recursively sort the left and right subarrays
+                self.quicksort_randomized(arr, start, pivot_index - 1)
+                self.quicksort_randomized(arr, pivot_index + 1, end)
         
         return arr
     
@@ -191,6 +559,240 @@ class QuickSortAnalyzer:
         
         return right
     
+    # ==================== ITERATIVE QUICKSORT ====================
+    
+    def quicksort_iterative(self, arr: List, start: int = 0, end: int = None,
+                            partition_scheme: str = "two_way", pivot_policy=None) -> List:
+        """
+        Deterministic Quicksort with an O(log n) stack.
+        
+        After each partition only the smaller part is sorted by a recursive
+        call; the larger part is handled by the next iteration of the loop, so
+        every call works on at most half of its caller's range and the depth
+        stays below log2(n) + 1 for any input. No recursion-limit increase is
+        needed.
+        
+        The pivot is chosen by pivot_policy (a PIVOT_POLICIES name or a
+        PivotPolicy instance) and moved to the front before the usual
+        partition. The default, Tukey's ninther, splits sorted, reverse-sorted
+        and organ-pipe input evenly. Plain median-of-three ("median3") does
+        not: the element swapped out of the front leaves the largest key of
+        each left part first, so reverse-sorted input takes O(n^2). "dual_pivot" ignores the policy and moves the elements at one
+        and two thirds of the range to the ends. Counters and partition
+        schemes are as in quicksort_deterministic; comparisons made by the
+        policy are counted too.
+        
+        Time Complexity:
+            - Best/Average case: O(n log n), including sorted and reverse-sorted
+              input with the default pivot
+            - Worst case: O(n^2) for ninther and median-of-three ("median_of_medians" and
+              "adaptive" guarantee O(n log n): PivotPolicy.three_way() switches
+              their exact-median ranges to the three-way partition, so runs
+              of equal keys cannot unbalance the split)
+        
+        Space Complexity: O(log n) - guaranteed by recursing on the smaller part
+        
+        Args:
+            arr: List to be sorted
+            start: Starting index of the subarray
+            end: Ending index of the subarray
+            partition_scheme: One of PARTITION_SCHEMES
+            pivot_policy: Name in PIVOT_POLICIES or PivotPolicy instance
+                (default "ninther")
+            
+        Returns:
+            The sorted list (sorted in-place, also returned for convenience)
+        """
+        if partition_scheme not in PARTITION_SCHEMES:
+            raise ValueError(f"Unknown partition scheme: {partition_scheme}")
+        if end is None:
+            if self._sort_vectorized(arr, "median3", partition_scheme, pivot_policy):
+                return arr
+            end = len(arr) - 1
+        if not isinstance(pivot_policy, PivotPolicy):
+            pivot_policy = pivot_policy or "ninther"
+            if pivot_policy not in PIVOT_POLICIES:
+                raise ValueError(f"Unknown pivot policy: {pivot_policy}")
+            pivot_policy = PIVOT_POLICIES[pivot_policy](count=self.instrument)
+        
+        while start < end:
+            if partition_scheme == "dual_pivot":
+                third = (end - start) // 3
+                arr[start], arr[start + third] = arr[start + third], arr[start]
+                arr[end], arr[end - third] = arr[end - third], arr[end]
+                self.swaps += 2
+                lp, rp = self._partition_dual_pivot(arr, start, end)
+                parts = [(start, lp - 1), (rp + 1, end)]
+                # Equal pivots mean everything between them equals the pivot too
+                if arr[lp] != arr[rp]:
+                    parts.append((lp + 1, rp - 1))
+                parts.sort(key=lambda part: part[1] - part[0])
+                # Neither of the two smaller parts can exceed half the range
+                for lo, hi in parts[:-1]:
+                    self.quicksort_iterative(arr, lo, hi, partition_scheme, pivot_policy)
+                start, end = parts[-1]
+                continue
+            
+            pivot_index, comparisons = pivot_policy.choose(arr, start, end)
+            self.comparisons += comparisons
+            if pivot_index != start:
+                arr[start], arr[pivot_index] = arr[pivot_index], arr[start]
+                self.swaps += 1
+            if partition_scheme == "three_way" or pivot_policy.three_way(start, end):
+                lt, gt = self._partition_three_way(arr, start, end)
+            else:
+                lt = gt = self._partition_deterministic(arr, start, end)
+            # Counter updates take plain names only (see _StripCounters)
+            swaps = pivot_policy.observe(arr, start, end, lt, gt)
+            self.swaps += swaps
+            
+            # Recurse into the smaller side, loop on the larger one
+            if lt - start < end - gt:
+                self.quicksort_iterative(arr, start, lt - 1, partition_scheme, pivot_policy)
+                start = gt + 1
+            else:
+                self.quicksort_iterative(arr, gt + 1, end, partition_scheme, pivot_policy)
+                end = lt - 1
+        
+        return arr
+    
+    # ==================== MULTI-WAY PARTITIONING ====================
+    
+    def _partition_three_way(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        """
+        Three-way (Dutch national flag) partition around arr[start].
+        
+        After one pass the subarray is arranged as < pivot, == pivot, > pivot, so
+        every key equal to the pivot reaches its final position at once.
+        
+        Args:
+            arr: The array to partition
+            start: Starting index (holds the pivot)
+            end: Ending index
+            
+        Returns:
+            Tuple (lt, gt) such that arr[lt..gt] are all equal to the pivot
+        """
+        pivot = arr[start]
+        lt = start
+        i = start + 1
+        gt = end
+        
+        while i <= gt:
+            self.comparisons += 1
+            if arr[i] < pivot:
+                arr[lt], arr[i] = arr[i], arr[lt]
+                self.swaps += 1
+                lt += 1
+                i += 1
+                continue
+            self.comparisons += 1
+            if arr[i] > pivot:
+                arr[i], arr[gt] = arr[gt], arr[i]
+                self.swaps += 1
+                gt -= 1
+            else:
+                i += 1
+        
+        return lt, gt
+    
+    def _partition_dual_pivot(self, arr: List, start: int, end: int) -> Tuple[int, int]:
+        """
+        Dual-pivot (Yaroslavskiy) partition using arr[start] and arr[end] as pivots.
+        
+        The subarray is split into <= p, p < x < q and >= q. Keys equal to a pivot
+        go to the outer parts, so a part made only of copies of one key hits the
+        p == q case at the next level, where the three-way partition collapses it
+        in one pass.
+        
+        Args:
+            arr: The array to partition
+            start: Starting index (holds one pivot)
+            end: Ending index (holds the other pivot)
+            
+        Returns:
+            Tuple (lp, rp) with the final positions of the two pivots; if the
+            pivots are equal, arr[lp..rp] is the collapsed run of equal keys
+        """
+        self.comparisons += 1
+        if arr[start] > arr[end]:
+            arr[start], arr[end] = arr[end], arr[start]
+            self.swaps += 1
+        
+        p = arr[start]
+        q = arr[end]
+        self.comparisons += 1
+        if p == q:
+            return self._partition_three_way(arr, start, end)
+        
+        lt = start + 1
+        gt = end - 1
+        k = lt
+        
+        while k <= gt:
+            self.comparisons += 1
+            if arr[k] <= p:
+                arr[k], arr[lt] = arr[lt], arr[k]
+                self.swaps += 1
+                lt += 1
+            else:
+                self.comparisons += 1
+                if arr[k] >= q:
+                    # Skip elements on the right that already belong there
+                    while k < gt and arr[gt] >= q:
+                        self.comparisons += 1
+                        gt -= 1
+                    arr[k], arr[gt] = arr[gt], arr[k]
+                    self.swaps += 1
+                    gt -= 1
+                    self.comparisons += 1
+                    if arr[k] <= p:
+                        arr[k], arr[lt] = arr[lt], arr[k]
+                        self.swaps += 1
+                        lt += 1
+            k += 1
+        
+        # Move the pivots into their final positions
+        lt -= 1
+        gt += 1
+        arr[start], arr[lt] = arr[lt], arr[start]
+        arr[end], arr[gt] = arr[gt], arr[end]
+        self.swaps += 2
+        
+        return lt, gt
+    
+    # ==================== VECTORIZED FAST PATH ====================
+    
+    def _sort_vectorized(self, arr, pivot: str, partition_scheme: str = "two_way",
+                         pivot_policy=None) -> bool:
+        """
+        Sort arr in place on the NumPy path if it applies to this input.
+        
+        The deterministic method uses a median-of-three pivot here rather than
+        the first element, since one O(n) mask pass per level would make sorted
+        input quadratic. The NumPy path implements neither the other partition
+        schemes nor pivot policies, so asking for one keeps the pure-Python
+        path and a benchmark sweeping them times the code it names.
+        
+        Args:
+            arr: The array to sort (list, array.array or NumPy array)
+            pivot: "median3" or "random"
+            partition_scheme: The scheme requested by the caller
+            pivot_policy: The pivot policy requested by the caller, if any
+            
+        Returns:
+            True if arr was sorted, False if the pure-Python path should run
+        """
+        if not HAVE_NUMPY or partition_scheme != "two_way" or pivot_policy is not None:
+            return False
+        if isinstance(arr, list) and not self.vectorize:
+            return False
+        result = try_vectorized(vectorized_quicksort, arr, pivot=pivot)
+        if result is None:
+            return False
+        arr[:] = result
+        return True
+    
     # ==================== UTILITY METHODS ====================
     
     def get_statistics(self) -> Tuple[int, int]:
@@ -211,6 +813,67 @@ class QuickSortAnalyzer:
         return self.swaps
 
 
+class _StripCounters(ast.NodeTransformer):
+    """
+    Removes `self.comparisons += x` and `self.swaps += x` statements.
+    
+    Only a constant or a plain name is allowed as x: anything else could have
+    side effects that would vanish from the uninstrumented build, so it is
+    rejected with a SyntaxError at import time. Compute the value into a
+    local first.
+    """
+    
+    COUNTERS = ("comparisons", "swaps")
+    
+    def __init__(self):
+        self.changed = False
+    
+    def visit_AugAssign(self, node):
+        target = node.target
+        if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                and target.value.id == "self" and target.attr in self.COUNTERS):
+            if not isinstance(node.value, (ast.Constant, ast.Name)):
+                raise SyntaxError(
+                    f"counter update `{ast.unparse(node)}` (line {node.lineno}) must add a "
+                    f"constant or a local name so it can be stripped without side effects")
+            self.changed = True
+            return None
+        return node
+    
+    def generic_visit(self, node):
+        node = super().generic_visit(node)
+        # A loop or branch whose only statement was a counter update
+        if getattr(node, "body", None) == []:
+            node.body = [ast.Pass()]
+        return node
+
+
+def _build_uninstrumented() -> dict:
+    """
+    Compile counter-free copies of the QuickSortAnalyzer methods that update
+    the counters, from the class's own source, so the timed and the counting
+    builds can never drift apart.
+    
+    Returns:
+        Dictionary mapping method name -> plain function
+    """
+    tree = ast.parse(textwrap.dedent(inspect.getsource(QuickSortAnalyzer)))
+    methods = []
+    for node in tree.body[0].body:
+        if isinstance(node, ast.FunctionDef) and node.name != "__init__":
+            stripper = _StripCounters()
+            node = stripper.visit(node)
+            if stripper.changed:
+                methods.append(node)
+    module = ast.fix_missing_locations(ast.Module(body=methods, type_ignores=[]))
+    namespace = {}
+    exec(compile(module, __file__, "exec"), globals(), namespace)
+    return namespace
+
+
+_UNINSTRUMENTED = _build_uninstrumented()
+
+
 def test_quicksort():
     """Basic test cases for Quicksort implementations."""
     analyzer = QuickSortAnalyzer()
@@ -261,6 +924,63 @@ def test_quicksort():
     print(f"  Output: {result5}")
     print(f"  Expected: {sorted([5, 2, 8, 2, 9, 1, 5, 5])}")
     print(f"  Correct: {result5 == sorted([5, 2, 8, 2, 9, 1, 5, 5])}\n")
+    
+    # Test 6: Three-way and dual-pivot partitioning on heavy duplicates
+    print("Test 6: Three-way / dual-pivot partitioning with duplicates")
+    arr6 = [3, 1, 3, 2, 1, 3, 2, 2, 1, 3, 3, 1]
+    for scheme in ("three_way", "dual_pivot"):
+        analyzer.reset_counters()
+        det6 = analyzer.quicksort_deterministic(arr6.copy(), partition_scheme=scheme)
+        rand6 = analyzer.quicksort_randomized(arr6.copy(), partition_scheme=scheme)
+        print(f"  {scheme}: Output: {det6}")
+        print(f"  {scheme}: Correct: {det6 == sorted(arr6) and rand6 == sorted(arr6)}")
+    print()
+    
+    # Test 7: Uninstrumented build sorts the same and leaves the counters alone
+    print("Test 7: Uninstrumented build")
+    fast = QuickSortAnalyzer(instrument=False)
+    arr7 = [random.randint(0, 50) for _ in range(500)]
+    results7 = [fast.quicksort_deterministic(arr7.copy(), partition_scheme=scheme) for scheme in PARTITION_SCHEMES]
+    results7 += [fast.quicksort_randomized(arr7.copy(), partition_scheme=scheme) for scheme in PARTITION_SCHEMES]
+    print(f"  Methods rebuilt: {sorted(_UNINSTRUMENTED)}")
+    print(f"  Correct: {all(r == sorted(arr7) for r in results7) and fast.get_statistics() == (0, 0)}\n")
+    
+    # Test 8: Iterative variant sorts 10M sorted and reverse-sorted elements under the
+    # default recursion limit, in O(n log n) comparisons
+    print("Test 8: Iterative quicksort, 10,000,000 sorted / reverse-sorted elements, recursion limit 1000")
+    results8 = [analyzer.quicksort_iterative(arr7.copy(), partition_scheme=scheme) for scheme in PARTITION_SCHEMES]
+    ok8 = all(r == sorted(arr7) for r in results8)
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000)
+    try:
+        for label, arr8 in (("sorted", list(range(10_000_000))), ("reverse-sorted", list(range(10_000_000, 0, -1)))):
+            analyzer.reset_counters()
+            analyzer.quicksort_iterative(arr8)
+            ok8 = (ok8 and arr8 == list(range(arr8[0], arr8[0] + len(arr8)))
+                   and analyzer.comparisons <= 2 * len(arr8) * math.log2(len(arr8)))
+            print(f"  {label}: Comparisons: {analyzer.comparisons}, Swaps: {analyzer.swaps}")
+    finally:
+        sys.setrecursionlimit(old_limit)
+    print(f"  Correct: {ok8}\n")
+    
+    # Test 9: Every pivot policy, on every partition scheme and a few patterns
+    print("Test 9: Pivot policies")
+    arrays9 = [arr7, list(range(1000)), list(range(1000, 0, -1)),
+               list(range(500)) + list(range(500, 0, -1)), [i % 7 for i in range(1000)]]
+    for name in PIVOT_POLICIES:
+        ok = all(analyzer.quicksort_iterative(a.copy(), partition_scheme=scheme, pivot_policy=name) == sorted(a)
+                 and fast.quicksort_iterative(a.copy(), partition_scheme=scheme, pivot_policy=name) == sorted(a)
+                 for a in arrays9 for scheme in PARTITION_SCHEMES)
+        print(f"  {name}: Correct: {ok}")
+    # Runs of equal keys must not break the O(n log n) bound of the exact-median policies
+    n9 = 20_000
+    for name in ("median_of_medians", "adaptive"):
+        for label, a in (("all equal", [7] * n9), ("4 distinct keys", [i % 4 for i in range(n9)])):
+            analyzer.reset_counters()
+            ok = analyzer.quicksort_iterative(a.copy(), pivot_policy=name) == sorted(a)
+            ratio = analyzer.comparisons / (n9 * math.log2(n9))
+            print(f"  {name}, {label}: {ratio:.2f} n log2 n comparisons, Correct: {ok and ratio <= 4}")
+    print()
 
 
 if __name__ == "__main__":
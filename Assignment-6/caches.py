@@ -0,0 +1,399 @@
+"""
+Assignment 6 – Bounded caches on the project's own data structures
+===================================================================
+Implements two caches with O(1) get / put / eviction:
+  1. LRUCache – evicts the least recently used entry
+  2. LFUCache – evicts the least frequently used entry (LRU among ties)
+
+Both index their entries with HashTable (Assignment-3/hashing.py) and
+order them with DoublyLinkedList / _DNode (data_structures.py). Entries can
+expire after a TTL (checked lazily on access) and every cache counts hits,
+misses, evictions and expirations.
+
+memoize_selection() wraps median_of_medians / randomized_select so repeated
+(array, k) queries on an unchanged array are answered from a cache.
+"""
+
+import bisect
+import os
+import random
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional
+
+from data_structures import DoublyLinkedList, _DNode
+from selection_alogorthims import median_of_medians, randomized_select
+
+# HashTable lives with the other hashing code in Assignment-3
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Assignment-3"))
+from hashing import HashTable
+
+
+# ─────────────────────────────────────────────────────────────
+# 1.  SHARED BASE
+# ─────────────────────────────────────────────────────────────
+
+class _BoundedCache(ABC):
+    """
+    Capacity, TTL, key index and counters shared by LRUCache and LFUCache.
+
+    The HashTable maps key → _DNode. Subclasses keep the nodes in their own
+    eviction order and define _touch (record an access), _drop (unlink a
+    node and forget its key), put and __len__.
+    """
+
+    def __init__(self, capacity: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.ttl      = ttl
+        self._clock   = clock
+        # sized up front so the table never resizes while the cache is full
+        self._table   = HashTable(size=int(capacity / 0.75) + 1)
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return None if ttl is None else self._clock() + ttl
+
+    @abstractmethod
+    def _touch(self, node: _DNode):
+        ...
+
+    @abstractmethod
+    def _drop(self, node: _DNode):
+        ...
+
+    def get(self, key: Any, default: Any = None) -> Any:    # O(1)
+        node = self._table.search(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if node.expires is not None and node.expires <= self._clock():
+            self._drop(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._touch(node)
+        self.hits += 1
+        return node.value
+
+    def __contains__(self, key: Any) -> bool:
+        node = self._table.search(key)
+        return node is not None and (node.expires is None or node.expires > self._clock())
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(capacity={self.capacity}, size={len(self)})"
+
+
+# ─────────────────────────────────────────────────────────────
+# 2.  LRU CACHE
+# ─────────────────────────────────────────────────────────────
+
+class LRUCache(_BoundedCache):
+    """
+    Least-recently-used cache of at most `capacity` entries.
+
+    The HashTable maps key → _DNode; the list keeps nodes from most to
+    least recently used, so the eviction victim is always at the back.
+    `ttl` (seconds, None = never) is the default lifetime of an entry.
+
+    Complexities
+    ────────────
+    get   : O(1) expected
+    put   : O(1) expected (including eviction)
+    space : O(capacity)
+    """
+
+    def __init__(self, capacity: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(capacity, ttl, clock)
+        self._order = DoublyLinkedList()
+
+    def _touch(self, node: _DNode):
+        self._order.move_to_front(node)
+
+    def _drop(self, node: _DNode):
+        self._order.remove(node)
+        self._table.delete(node.key)
+
+    def put(self, key: Any, value: Any, ttl: Optional[float] = None):  # O(1)
+        node = self._table.search(key)
+        if node is not None:
+            node.value   = value
+            node.expires = self._expiry(ttl)
+            self._order.move_to_front(node)
+            return
+        if len(self._order) >= self.capacity:
+            self._drop(self._order.back())
+            self.evictions += 1
+        node = _DNode(key, value, self._expiry(ttl))
+        self._table.insert(key, node)
+        self._order.push_front(node)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+# ─────────────────────────────────────────────────────────────
+# 3.  LFU CACHE
+# ─────────────────────────────────────────────────────────────
+
+class LFUCache(_BoundedCache):
+    """
+    Least-frequently-used cache of at most `capacity` entries.
+
+    Besides key → _DNode, a second HashTable maps each access count to a
+    DoublyLinkedList of the nodes with that count (most recent first), and
+    `_min_freq` tracks the smallest non-empty count, so the victim (least
+    frequent, least recent among ties) is found in O(1).
+
+    Complexities
+    ────────────
+    get   : O(1) expected
+    put   : O(1) expected (including eviction)
+    space : O(capacity)
+    """
+
+    def __init__(self, capacity: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(capacity, ttl, clock)
+        self._freqs    = HashTable()
+        self._min_freq = 0
+        self._size     = 0
+
+    def _freq_list(self, freq: int) -> DoublyLinkedList:
+        lst = self._freqs.search(freq)
+        if lst is None:
+            lst = DoublyLinkedList()
+            self._freqs.insert(freq, lst)
+        return lst
+
+    def _unlink(self, node: _DNode):
+        lst = self._freqs.search(node.freq)
+        lst.remove(node)
+        if len(lst) == 0:
+            self._freqs.delete(node.freq)
+            if self._min_freq == node.freq:
+                self._min_freq += 1
+
+    def _drop(self, node: _DNode):
+        self._unlink(node)
+        self._table.delete(node.key)
+        self._size -= 1
+
+    def _touch(self, node: _DNode):
+        self._unlink(node)
+        node.freq += 1
+        self._freq_list(node.freq).push_front(node)
+
+    def put(self, key: Any, value: Any, ttl: Optional[float] = None):  # O(1)
+        node = self._table.search(key)
+        if node is not None:
+            node.value   = value
+            node.expires = self._expiry(ttl)
+            self._touch(node)
+            return
+        if self._size >= self.capacity:
+            self._drop(self._freqs.search(self._min_freq).back())
+            self.evictions += 1
+        node = _DNode(key, value, self._expiry(ttl))
+        self._table.insert(key, node)
+        self._freq_list(1).push_front(node)
+        self._min_freq = 1
+        self._size    += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# ─────────────────────────────────────────────────────────────
+# 4.  MEMOIZED SELECTION
+# ─────────────────────────────────────────────────────────────
+
+_MISSING = object()
+
+
+def memoize_selection(select: Callable[[list, int], Any], cache: _BoundedCache) -> Callable[[list, int], Any]:
+    """
+    Wrap a selection function so repeated (arr, k) queries hit `cache`.
+
+    The key holds a tuple snapshot of `arr`, so a query only hits when the
+    array contents are unchanged; building and hashing the snapshot is a
+    single C-level pass, far cheaper than re-running the selection.
+    """
+    def cached(arr: list, k: int) -> Any:
+        key   = (select.__name__, tuple(arr), k)
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = select(arr, k)
+            cache.put(key, value)
+        return value
+
+    cached.__name__ = f"cached_{select.__name__}"
+    cached.cache    = cache
+    return cached
+
+
+# ─────────────────────────────────────────────────────────────
+# 5.  ZIPFIAN BENCHMARK
+# ─────────────────────────────────────────────────────────────
+
+def zipf_stream(n_keys: int, n_ops: int, s: float = 1.1,
+                rng: Optional[random.Random] = None) -> List[int]:
+    """Return n_ops keys in [0, n_keys) where key i has probability ∝ 1/(i+1)^s."""
+    rng = rng or random.Random()
+    cum, total = [], 0.0
+    for i in range(n_keys):
+        total += 1.0 / (i + 1) ** s
+        cum.append(total)
+    return [bisect.bisect_left(cum, rng.random() * total) for _ in range(n_ops)]
+
+
+def run_cache_benchmark(n_keys: int = 100_000, n_ops: int = 200_000,
+                        capacities=(100, 1_000, 10_000), skews=(0.8, 1.1)):
+    """
+    Replay Zipfian read-through streams against both caches: every miss
+    puts the key, as a memoizing caller would. Reports hit ratio and ops/s.
+    """
+    header = f"{'Cache':<10} {'s':>4} {'Capacity':>9}  {'Hit ratio':>9}  {'Evictions':>9}  {'ops/s':>10}"
+    print(header)
+    print("─" * len(header))
+    results = []
+    for s in skews:
+        stream = zipf_stream(n_keys, n_ops, s, random.Random(42))
+        for capacity in capacities:
+            for cls in (LRUCache, LFUCache):
+                cache = cls(capacity)
+                t0 = time.perf_counter()
+                for key in stream:
+                    if cache.get(key) is None:
+                        cache.put(key, key)
+                elapsed = time.perf_counter() - t0
+                st = cache.stats()
+                results.append({"cache": cls.__name__, "s": s, "capacity": capacity,
+                                "ops_per_sec": n_ops / elapsed, **st})
+                print(f"{cls.__name__:<10} {s:>4} {capacity:>9}  {st['hit_ratio']:>9.3f}  "
+                      f"{st['evictions']:>9}  {n_ops / elapsed:>10.0f}")
+        print()
+    return results
+
+
+def run_selection_memo_benchmark(n_arrays: int = 20, size: int = 10_000,
+                                 n_queries: int = 300, capacity: int = 64):
+    """
+    Zipfian (array, k) queries over a fixed pool of unchanged arrays:
+    plain selection vs the memoized wrapper.
+    """
+    rng    = random.Random(7)
+    arrays = [[rng.randint(0, size) for _ in range(size)] for _ in range(n_arrays)]
+    ks     = [1, size // 4, size // 2, 3 * size // 4, size]
+    picks  = zipf_stream(n_arrays * len(ks), n_queries, 1.1, rng)
+    queries = [(arrays[p // len(ks)], ks[p % len(ks)]) for p in picks]
+
+    print(f"{'Function':<26} {'Time (s)':>10}  {'Hit ratio':>9}")
+    print("─" * 49)
+    for select in (median_of_medians, randomized_select):
+        t0 = time.perf_counter()
+        expected = [select(arr, k) for arr, k in queries]
+        t_plain = time.perf_counter() - t0
+
+        cached = memoize_selection(select, LRUCache(capacity))
+        t0 = time.perf_counter()
+        got = [cached(arr, k) for arr, k in queries]
+        t_cached = time.perf_counter() - t0
+        assert got == expected
+
+        print(f"{select.__name__:<26} {t_plain:>10.4f}")
+        print(f"{cached.__name__:<26} {t_cached:>10.4f}  {cached.cache.stats()['hit_ratio']:>9.3f}")
+
+
+# ─────────────────────────────────────────────────────────────
+# 6.  CORRECTNESS TESTS
+# ─────────────────────────────────────────────────────────────
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_correctness_tests():
+    print("Correctness Tests")
+    print("─" * 55)
+    checks = []
+
+    lru = LRUCache(2)
+    lru.put("a", 1); lru.put("b", 2)
+    lru.get("a")                 # b is now least recently used
+    lru.put("c", 3)
+    checks.append(("LRU evicts least recent", "b" not in lru and lru.get("a") == 1 and lru.get("c") == 3))
+
+    lfu = LFUCache(2)
+    lfu.put("a", 1); lfu.put("b", 2)
+    lfu.get("a"); lfu.get("a"); lfu.get("b")
+    lfu.put("c", 3)              # b has the lower count
+    checks.append(("LFU evicts least frequent", "b" not in lfu and lfu.get("a") == 1))
+    lfu.put("d", 4)              # c (count 1) goes before a (count 3)
+    checks.append(("LFU breaks ties by recency", "c" not in lfu and len(lfu) == 2))
+
+    clock = _FakeClock()
+    ttl = LRUCache(4, ttl=10, clock=clock)
+    ttl.put("x", 1); ttl.put("y", 2, ttl=100)
+    clock.now = 50
+    checks.append(("TTL expiry", ttl.get("x") is None and ttl.get("y") == 2 and ttl.expirations == 1))
+    checks.append(("Counters", lru.stats()["evictions"] == 1 and lfu.stats()["evictions"] == 2))
+
+    arr = [random.randint(0, 100) for _ in range(500)]
+    mom = memoize_selection(median_of_medians, LRUCache(8))
+    first, second = mom(arr, 250), mom(arr, 250)
+    checks.append(("Memoized selection", first == second == sorted(arr)[249]))
+    arr[0] = -1                  # a changed array is a different key
+    third = mom(arr, 1)
+    checks.append(("Memo hit / changed-array miss",
+                   mom.cache.hits == 1 and mom.cache.misses == 2 and third == -1))
+
+    all_passed = True
+    for name, ok in checks:
+        all_passed &= bool(ok)
+        print(f"  {name:<32} {'✓' if ok else '✗'}")
+    print()
+    print("All tests passed!" if all_passed else "SOME TESTS FAILED.")
+    print()
+
+
+# ─────────────────────────────────────────────────────────────
+# 7.  ENTRY POINT
+# ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    sys.setrecursionlimit(200_000)
+
+    print("=" * 65)
+    print("  Assignment 6 – LRU / LFU Caches")
+    print("=" * 65)
+    print()
+
+    run_correctness_tests()
+
+    print("Zipfian Cache Benchmark")
+    print("─" * 65)
+    run_cache_benchmark()
+
+    print("Memoized Selection")
+    print("─" * 65)
+    run_selection_memo_benchmark()
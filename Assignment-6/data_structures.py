@@ -7,6 +7,7 @@ Implements the following data structures from scratch:
   3. Stack          – LIFO via array
   4. Queue          – FIFO via circular array
   5. SinglyLinkedList
+     DoublyLinkedList – O(1) unlink of any node (backs caches.py)
   6. RootedTree     – general rooted tree via linked nodes (optional)
 
 Every operation documents its time and space complexity.
@@ -425,6 +426,83 @@ class SinglyLinkedList:
         return " → ".join(str(x) for x in self.to_list()) + " → None"
 
 
+class _DNode:
+    """Doubly linked node; `key`, `expires` and `freq` are used by the caches."""
+
+    __slots__ = ("key", "value", "prev", "next", "expires", "freq")
+
+    def __init__(self, key: Any, value: Any, expires: Optional[float] = None):
+        self.key:     Any              = key
+        self.value:   Any              = value
+        self.prev:    Optional[_DNode] = None
+        self.next:    Optional[_DNode] = None
+        self.expires: Optional[float]  = expires
+        self.freq:    int              = 1
+
+
+class DoublyLinkedList:
+    """
+    Doubly linked list of _DNode with a circular sentinel, so every
+    operation that is handed a node is O(1) with no edge cases.
+
+    Complexities
+    ────────────
+    push_front      : O(1)
+    remove(node)    : O(1)
+    move_to_front   : O(1)
+    pop_back        : O(1)
+    traverse        : O(n)
+    """
+
+    def __init__(self):
+        self._sentinel      = _DNode(None, None)
+        self._sentinel.prev = self._sentinel
+        self._sentinel.next = self._sentinel
+        self._size: int     = 0
+
+    def push_front(self, node: _DNode):       # O(1)
+        first          = self._sentinel.next
+        node.prev      = self._sentinel
+        node.next      = first
+        first.prev     = node
+        self._sentinel.next = node
+        self._size    += 1
+
+    def remove(self, node: _DNode):           # O(1)
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        self._size    -= 1
+
+    def move_to_front(self, node: _DNode):    # O(1)
+        self.remove(node)
+        self.push_front(node)
+
+    def back(self) -> Optional[_DNode]:       # O(1)
+        return None if self._size == 0 else self._sentinel.prev
+
+    def pop_back(self) -> _DNode:             # O(1)
+        if self._size == 0:
+            raise IndexError("Pop from empty list")
+        node = self._sentinel.prev
+        self.remove(node)
+        return node
+
+    def to_list(self) -> List[Any]:           # O(n)
+        result = []
+        curr   = self._sentinel.next
+        while curr is not self._sentinel:
+            result.append((curr.key, curr.value))
+            curr = curr.next
+        return result
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return " ⇄ ".join(f"{k}:{v}" for k, v in self.to_list())
+
+
 # ─────────────────────────────────────────────────────────────
 # 6.  ROOTED TREE  (optional)
 # ─────────────────────────────────────────────────────────────
@@ -574,6 +652,19 @@ def demo_linked_list():
     print("Search 4 → index:", ll.search(4))
 
 
+def demo_doubly_linked_list():
+    _separator("DoublyLinkedList")
+    dl    = DoublyLinkedList()
+    nodes = [_DNode(k, v) for k, v in [("a", 1), ("b", 2), ("c", 3)]]
+    for node in nodes:
+        dl.push_front(node)
+    print("List:", dl)
+    dl.move_to_front(nodes[0])
+    print("After move_to_front(a):", dl)
+    print("pop_back →", dl.pop_back().key)
+    print("List:", dl)
+
+
 def demo_rooted_tree():
     _separator("RootedTree")
     t = RootedTree(1)
@@ -601,4 +692,5 @@ if __name__ == "__main__":
     demo_stack()
     demo_queue()
     demo_linked_list()
+    demo_doubly_linked_list()
     demo_rooted_tree()
\ No newline at end of file